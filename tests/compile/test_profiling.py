@@ -4,10 +4,12 @@
 from io import StringIO
 
 import numpy as np
+import pytest
 
 import theano
 import theano.tensor as tt
 from theano.ifelse import ifelse
+from theano.scan.op import Scan
 
 
 class TestProfiling:
@@ -105,3 +107,36 @@ class TestProfiling:
         finally:
             theano.config.profile = config1
             theano.config.profile_memory = config2
+
+    @pytest.mark.parametrize("linker", ["py", "cvm"])
+    def test_scan_steps(self, linker):
+        x = tt.vector("x")
+        W = tt.matrix("W")
+        out, _ = theano.scan(
+            lambda h, W: tt.tanh(tt.dot(W, h)),
+            outputs_info=x,
+            non_sequences=W,
+            n_steps=7,
+            profile="scan_steps",
+        )
+        with theano.config.change_flags(profiling__scan_steps=True):
+            f = theano.function([x, W], out, mode=theano.Mode(linker=linker))
+        (scan_node,) = [
+            node for node in f.maker.fgraph.toposort() if isinstance(node.op, Scan)
+        ]
+        f(np.ones(3, dtype=x.dtype), np.eye(3, dtype=W.dtype))
+
+        profile = scan_node.op.fn.maker.profile
+        assert sum(profile.step_time_hist.values()) == 7
+        assert 0 <= profile.copy_time <= profile.call_time
+        assert profile.step_time_min <= profile.step_time_max
+
+        buf = StringIO()
+        profile.summary(buf)
+        assert "Time per iteration (7 iterations)" in buf.getvalue()
+
+        stats = profile.as_dict()
+        assert stats["nbsteps"] == 7
+        assert sum(stats["step_time_hist"].values()) == 7
+        assert stats["nodes"]
+        assert all(node["callcount"] == 7 for node in stats["nodes"])
@@ -4,6 +4,7 @@ import pytest
 import theano
 import theano.tensor as tt
 from theano.compile.mode import Mode
+from theano.graph.basic import Apply
 from theano.graph.fg import FunctionGraph
 from theano.graph.optdb import Query
 from theano.link.jax import JAXLinker
@@ -13,7 +14,7 @@ jax = pytest.importorskip("jax")
 
 from functools import partial  # noqa: E402
 
-from theano.graph.op import get_test_value  # noqa: E402
+from theano.graph.op import Op, get_test_value  # noqa: E402
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -885,6 +886,87 @@ def test_shared():
     np.testing.assert_allclose(jax_res, new_a_value * 2)
 
 
+def test_shared_updates():
+    a = theano.shared(np.array([1, 2, 3], dtype=theano.config.floatX))
+    x = tt.vector("x")
+
+    theano_jax_fn = theano.function([x], a * x, updates={a: a + x}, mode="JAX")
+    for i in range(3):
+        x_val = np.full(3, i, dtype=theano.config.floatX)
+        a_val = a.get_value()
+        jax_res = theano_jax_fn(x_val)
+        np.testing.assert_allclose(jax_res, a_val * x_val)
+        np.testing.assert_allclose(a.get_value(), a_val + x_val)
+
+
+def test_single_jit():
+    x = tt.vector("x")
+    y = tt.exp(x).sum()
+    outs = [y * 2, y + x, tt.sin(x)]
+
+    opts = Query(include=[None], exclude=["cxx_only", "BlasOpt"])
+    theano_jax_fn = theano.function([x], outs, mode=Mode(JAXLinker(), opts))
+    (thunk,) = theano_jax_fn.fn.thunks
+    assert len(thunk.outputs) == len(outs)
+
+    x_val = np.linspace(-1, 1, 4).astype(theano.config.floatX)
+    jax_res = theano_jax_fn(x_val)
+    y_val = np.exp(x_val).sum()
+    for res, expected in zip(jax_res, [y_val * 2, y_val + x_val, np.sin(x_val)]):
+        np.testing.assert_allclose(res, expected, rtol=1e-5)
+
+
+class PythonOnlyDouble(Op):
+    """An `Op` without JAX conversion, which only accepts NumPy arrays."""
+
+    __props__ = ()
+
+    def make_node(self, x):
+        x = tt.as_tensor_variable(x)
+        return Apply(self, [x], [x.type()])
+
+    def perform(self, node, inputs, outputs):
+        (x,) = inputs
+        assert isinstance(x, np.ndarray)
+        outputs[0][0] = x * 2
+
+
+def test_partitioned_graph():
+    x = tt.dvector("x")
+    y = tt.exp(x)
+    z = PythonOnlyDouble()(y)
+    outs = [z.sum() + y.sum(), tt.sin(z)]
+
+    opts = Query(include=[None], exclude=["cxx_only", "BlasOpt"])
+    linker = JAXLinker()
+    linker.allow_non_jax = True
+    with pytest.warns(UserWarning, match="PythonOnlyDouble"):
+        theano_jax_fn = theano.function([x], outs, mode=Mode(linker, opts))
+
+    # `exp` and the first `sum`, then the Python `Op`, then the rest
+    assert len(theano_jax_fn.fn.thunks) == 3
+    assert isinstance(theano_jax_fn.fn.nodes[1].op, PythonOnlyDouble)
+
+    x_val = np.linspace(-1, 1, 5)
+    jax_res = theano_jax_fn(x_val)
+    z_val = np.exp(x_val) * 2
+    np.testing.assert_allclose(jax_res[0], z_val.sum() + np.exp(x_val).sum())
+    np.testing.assert_allclose(jax_res[1], np.sin(z_val))
+
+    with pytest.raises(NotImplementedError):
+        theano.function([x], outs, mode=Mode(JAXLinker(), opts))
+
+
+def test_compilation_cache():
+    from theano.link.jax import jax_linker
+
+    with theano.config.change_flags(jax__compilation_cache=True):
+        x = tt.vector("x")
+        theano_jax_fn = theano.function([x], tt.exp(x), mode="JAX")
+        theano_jax_fn(np.ones(3, dtype=theano.config.floatX))
+    assert jax_linker._compilation_cache_dir.startswith(theano.config.compiledir)
+
+
 def test_extra_ops():
     a = tt.matrix("a")
     a.tag.test_value = np.arange(6, dtype=theano.config.floatX).reshape((3, 2))
@@ -213,3 +213,27 @@ def test_container_deepcopy():
         assert isinstance(d.storage[0], np.ndarray), (d.storage[0], type(d.storage[0]))
         assert d.storage[0].dtype == v.dtype, (d.storage[0].dtype, v.dtype)
         assert d.storage[0].dtype == c.type.dtype, (d.storage[0].dtype, c.type.dtype)
+
+
+def test_partition_nodes_destroy_orderings():
+    # The inplace `add` must run after the region that reads `x`
+    from theano import tensor as tt
+    from theano.graph.destroyhandler import DestroyHandler
+    from theano.link.utils import partition_nodes
+    from theano.tensor.inplace import add_inplace
+
+    x = tt.vector("x")
+    y = tt.vector("y")
+    a = x + tt.log(y)
+    b = add_inplace(x, tt.constant(np.array([1.0], dtype=x.dtype)))
+    fgraph = fg.FunctionGraph([x, y], [a, b], clone=False)
+    fgraph.attach_feature(DestroyHandler())
+    nodes = fgraph.toposort()
+
+    def is_compiled(node):
+        return node is a.owner
+
+    regions = partition_nodes(nodes, is_compiled, fgraph.orderings())
+    order = [node for _, region in regions for node in region]
+    assert order.index(a.owner) < order.index(b.owner)
+    assert [compiled for compiled, _ in regions] == [False, True, False]
@@ -0,0 +1,198 @@
+import numpy as np
+import pytest
+
+import theano
+import theano.tensor as tt
+from theano.compile.mode import Mode
+from theano.graph.basic import Apply
+from theano.graph.fg import FunctionGraph
+from theano.graph.op import Op
+from theano.graph.optdb import Query
+from theano.link.numba import NumbaLinker
+
+
+numba = pytest.importorskip("numba")
+
+from theano.link.numba.numba_dispatch import (  # noqa: E402
+    fgraph_to_numba_function,
+    graph_key,
+)
+from theano.scan.utils import until  # noqa: E402
+from theano.tensor.elemwise import CAReduce  # noqa: E402
+
+
+opts = Query(include=[None], exclude=["cxx_only", "BlasOpt"])
+numba_mode = Mode(NumbaLinker(), opts)
+py_mode = Mode("py", opts)
+
+
+def compare_numba_and_py(fgraph, inputs, assert_fn=None):
+    """Compile `fgraph` with Numba and with Python, and compare the results."""
+    if assert_fn is None:
+
+        def assert_fn(x, y):
+            np.testing.assert_allclose(x, y, rtol=1e-4)
+            assert np.asarray(x).dtype == np.asarray(y).dtype
+
+    numba_fn = theano.function(fgraph.inputs, fgraph.outputs, mode=numba_mode)
+    numba_res = numba_fn(*inputs)
+    py_fn = theano.function(fgraph.inputs, fgraph.outputs, mode=py_mode)
+    py_res = py_fn(*inputs)
+
+    for n, p in zip(numba_res, py_res):
+        assert_fn(n, p)
+    return numba_res
+
+
+def test_Elemwise_and_Composite():
+    x = tt.matrix("x")
+    y = tt.vector("y")
+    out = tt.exp(x) * y + tt.sin(y) - 2
+    outs = [out, tt.cast(x > 0, "int8"), tt.switch(x > 0, x, y)]
+    fgraph = FunctionGraph([x, y], outs)
+
+    rng = np.random.RandomState(1)
+    compare_numba_and_py(
+        fgraph,
+        [
+            rng.normal(size=(3, 4)).astype(theano.config.floatX),
+            rng.normal(size=4).astype(theano.config.floatX),
+        ],
+    )
+
+
+@pytest.mark.parametrize("axis", [None, 0, 1, (0, 2)])
+def test_CAReduce(axis):
+    x = tt.tensor3("x")
+    x_max = CAReduce(theano.scalar.scalar_maximum, axis=axis)(x)
+    outs = [x.sum(axis=axis), x.prod(axis=axis), x_max]
+    fgraph = FunctionGraph([x], outs)
+
+    x_val = np.arange(24).reshape((2, 3, 4)).astype(theano.config.floatX) / 10
+    compare_numba_and_py(fgraph, [x_val])
+
+
+def test_shape_ops():
+    x = tt.matrix("x")
+    i = tt.lscalar("i")
+    outs = [
+        x.dimshuffle(1, "x", 0),
+        x[1:, i],
+        x[::-1],
+        tt.set_subtensor(x[i, :2], 1.0),
+        tt.inc_subtensor(x[:, i], 2.0),
+        x.reshape((2, -1)),
+        x.shape,
+        tt.join(0, x, x),
+        tt.alloc(x[0], 2, *x.shape),
+        tt.dot(x, x.T),
+    ]
+    fgraph = FunctionGraph([x, i], outs)
+
+    x_val = np.arange(12).reshape((3, 4)).astype(theano.config.floatX)
+    compare_numba_and_py(fgraph, [x_val, np.array(1, dtype="int64")])
+
+
+def test_misc_ops():
+    x = tt.matrix("x")
+    i = tt.lscalar("i")
+    outs = [
+        x[[0, 2, 2]],
+        tt.arange(i, 5),
+        tt.clip(x, 1.0, 8.0),
+        tt.stack([i, i + 1]),
+        tt.tensor_copy(x),
+        tt.specify_shape(x, (3, 4)),
+        tt.patternbroadcast(x[:1], (True, False)),
+        tt.scalar_from_tensor(i) + 1,
+        tt.second(x, 3.0),
+        tt.AllocEmpty(theano.config.floatX)(2, i).shape,
+    ]
+    fgraph = FunctionGraph([x, i], outs)
+
+    x_val = np.arange(12).reshape((3, 4)).astype(theano.config.floatX)
+    compare_numba_and_py(fgraph, [x_val, np.array(2, dtype="int64")])
+
+
+def test_Scan():
+    x = tt.matrix("x")
+    y0 = tt.vector("y0")
+
+    def step(x_t, y_tm2, y_tm1):
+        y_t = y_tm2 * 0.5 + tt.tanh(y_tm1 + x_t)
+        return y_t, y_t.sum()
+
+    (ys, sums), _ = theano.scan(
+        step,
+        sequences=x,
+        outputs_info=[dict(initial=tt.stack([y0, y0]), taps=[-2, -1]), None],
+    )
+    fgraph = FunctionGraph([x, y0], [ys, sums, ys[-1]])
+
+    rng = np.random.RandomState(2)
+    compare_numba_and_py(
+        fgraph,
+        [
+            rng.normal(size=(6, 3)).astype(theano.config.floatX),
+            rng.normal(size=3).astype(theano.config.floatX),
+        ],
+    )
+
+
+def test_Scan_until():
+    a = tt.scalar("a")
+    powers, _ = theano.scan(
+        lambda p_tm1, a: (p_tm1 * 2, until(p_tm1 * 2 > a)),
+        outputs_info=tt.ones_like(a),
+        non_sequences=a,
+        n_steps=20,
+    )
+    fgraph = FunctionGraph([a], [powers])
+
+    for a_val in (0.5, 45.0, 1e9):
+        compare_numba_and_py(fgraph, [np.array(a_val, dtype=theano.config.floatX)])
+
+
+class PythonOnlyDouble(Op):
+    """An `Op` without Numba conversion."""
+
+    __props__ = ()
+
+    def make_node(self, x):
+        x = tt.as_tensor_variable(x)
+        return Apply(self, [x], [x.type()])
+
+    def perform(self, node, inputs, outputs):
+        (x,) = inputs
+        outputs[0][0] = x * 2
+
+
+def test_fallback():
+    x = tt.dvector("x")
+    y = tt.exp(x)
+    out = PythonOnlyDouble()(y).sum() + y.sum()
+
+    with pytest.raises(NotImplementedError):
+        theano.function([x], out, mode=numba_mode)
+
+    linker = NumbaLinker()
+    linker.allow_fallback = True
+    with pytest.warns(UserWarning, match="PythonOnlyDouble"):
+        fn = theano.function([x], out, mode=Mode(linker, opts))
+    assert len(fn.fn.thunks) == 3
+
+    x_val = np.linspace(-1, 1, 5)
+    np.testing.assert_allclose(fn(x_val), np.exp(x_val).sum() * 3)
+
+
+def test_cache():
+    x = tt.vector("x")
+    fgraph = FunctionGraph([x], [tt.exp(x) * 2])
+    assert graph_key(fgraph) is not None
+    assert graph_key(fgraph) == graph_key(FunctionGraph([x], [tt.exp(x) * 2]))
+    assert graph_key(fgraph) != graph_key(FunctionGraph([x], [tt.exp(x) * 3]))
+
+    with theano.config.change_flags(numba__cache=True):
+        fn = fgraph_to_numba_function(fgraph, cache=True)
+    x_val = np.ones(3, dtype=theano.config.floatX)
+    np.testing.assert_allclose(fn(x_val)[0], np.exp(x_val) * 2, rtol=1e-5)
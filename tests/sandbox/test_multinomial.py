@@ -1,7 +1,9 @@
 import numpy as np
+import pytest
 
 import tests.unittest_tools as utt
 from theano import function, tensor
+from theano.compile.mode import Mode
 from theano.configdefaults import config
 from theano.sandbox import multinomial
 
@@ -116,3 +118,34 @@ def test_multinomial_dtypes():
     u = tensor.fvector()
     m = multinomial.MultinomialFromUniform("float64")(p, u)
     assert m.dtype == "float64", m.dtype
+
+
+@pytest.mark.skipif(not config.cxx, reason="No C compiler")
+@pytest.mark.parametrize(
+    "op",
+    [
+        multinomial.MultinomialFromUniform("auto"),
+        multinomial.ChoiceFromUniform("auto", replace=False),
+        multinomial.ChoiceFromUniform("auto", replace=True),
+    ],
+)
+def test_openmp_and_perform(op):
+    # The rows are sampled in parallel in C and all at once in Python
+    p = tensor.dmatrix()
+    u = tensor.dvector()
+    n = tensor.iscalar()
+
+    rng = np.random.RandomState(utt.fetch_seed())
+    pval = rng.rand(300, 7)
+    pval /= pval.sum(axis=1)[:, None]
+    uval = rng.rand(300 * 3)
+
+    results = []
+    for linker, openmp in (("py", False), ("c", False), ("c", True)):
+        new_op = type(op)(**dict(op._props_dict(), openmp=openmp))
+        with config.change_flags(openmp_elemwise_minsize=1):
+            f = function([p, u, n], new_op(p, u, n), mode=Mode(linker, optimizer=None))
+        results.append(f(pval, uval, 3))
+
+    for res in results[1:]:
+        utt.assert_allclose(res, results[0])
@@ -172,6 +172,28 @@ def test_consistency_cpu_parallel():
     assert np.allclose(samples, java_samples)
 
 
+@pytest.mark.skipif(not config.cxx, reason="No C compiler")
+def test_consistency_openmp():
+    # The streams are split between the threads, and the Python code draws
+    # one sample per stream at once, which must not change the samples
+    rstate_val = MRG_RandomStream(234).get_substream_rstates(50, "float64")
+    results = []
+    for linker, openmp in (("py", False), ("c", False), ("c", True)):
+        rstate = theano.shared(rstate_val.copy())
+        op = rng_mrg.mrg_uniform(tensor.dmatrix().type, openmp=openmp)
+        new_rstate, sample = op(rstate, (37, 11))
+        rstate.default_update = new_rstate
+        with config.change_flags(openmp_elemwise_minsize=1):
+            f = theano.function(
+                [], sample, mode=theano.compile.mode.Mode(linker, optimizer=None)
+            )
+        results.append([f(), f(), rstate.get_value()])
+
+    for res in results[1:]:
+        for val, ref in zip(res, results[0]):
+            np.testing.assert_array_equal(val, ref)
+
+
 def check_basics(
     f,
     steps,
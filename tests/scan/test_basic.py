@@ -2596,8 +2596,12 @@ class TestScan:
         sy, upy = scan(sum, sequences=[2 * y + 2], n_steps=4, name="Y")
         sz, upz = scan(sum, sequences=[sx], n_steps=4, name="Z")
 
+        # Z iterates over the output of X, exclude scan_fusion so that they
+        # are not fused.
         f = theano.function(
-            [x, y], [sy, sz], mode=mode_with_opt.excluding("scanOp_pushout_seqs_ops")
+            [x, y],
+            [sy, sz],
+            mode=mode_with_opt.excluding("scanOp_pushout_seqs_ops", "scan_fusion"),
         )
         topo = f.maker.fgraph.toposort()
         scans = [n for n in topo if isinstance(n.op, Scan)]
@@ -5030,3 +5034,84 @@ def test_mintap_onestep():
     _sum = f(_seq)
     print("sum %f" % _sum)
     assert _sum == 2
+
+
+@pytest.mark.parametrize("linker", ["py", "cvm"])
+@pytest.mark.parametrize("prealloc", [True, False])
+@pytest.mark.parametrize("keep_all", [True, False])
+def test_ring_buffer_outputs(prealloc, keep_all, linker):
+    # The Python and Cython implementations write the step outputs directly
+    # in the output buffers, including scalar outputs and the first step.
+    x0 = tensor.vector("x0")
+    h0 = tensor.vector("h0")
+    W = tensor.matrix("W")
+
+    def step(f_tm2, f_tm1, h_tm1, W):
+        f_t = f_tm2 + f_tm1
+        h_t = tensor.tanh(tensor.dot(h_tm1, W))
+        return f_t, h_t, f_t * 2
+
+    (fib, h, doubled), _ = scan(
+        step,
+        outputs_info=[dict(initial=x0, taps=[-2, -1]), h0, None],
+        non_sequences=W,
+        n_steps=10,
+    )
+    outputs = [fib, h, doubled] if keep_all else [fib[-1], h[-1], doubled[-1]]
+    with config.change_flags(scan__allow_output_prealloc=prealloc):
+        f = theano.function([x0, h0, W], outputs, mode=theano.Mode(linker=linker))
+
+    rng = np.random.RandomState(utt.fetch_seed())
+    h_val = rng.rand(3).astype(config.floatX)
+    W_val = rng.rand(3, 3).astype(config.floatX)
+    fib_ref = [1.0, 1.0]
+    h_ref = [h_val]
+    for _ in range(10):
+        fib_ref.append(fib_ref[-2] + fib_ref[-1])
+        h_ref.append(np.tanh(np.dot(h_ref[-1], W_val)))
+    fib_ref = np.asarray(fib_ref[2:])
+    h_ref = np.asarray(h_ref[1:])
+    expected = [fib_ref, h_ref, fib_ref * 2]
+    if not keep_all:
+        expected = [e[-1] for e in expected]
+
+    # Call twice, as the second call reuses the output buffers
+    for _ in range(2):
+        for out, exp in zip(f(np.ones(2, dtype=config.floatX), h_val, W_val), expected):
+            utt.assert_allclose(out, exp)
+
+
+@pytest.mark.parametrize("n_steps", [1000, 40, 16])
+@pytest.mark.parametrize("linker", ["py", "cvm"])
+def test_while_growth(n_steps, linker):
+    x0 = tensor.vector("x0")
+    h0 = tensor.vector("h0")
+    threshold = tensor.scalar("threshold")
+
+    def step(f_tm2, f_tm1, h_tm1, threshold):
+        f_t = f_tm2 + f_tm1
+        h_t = h_tm1 + 1
+        return (f_t, h_t, h_t * 2), until(h_t[0] > threshold)
+
+    outputs, _ = scan(
+        step,
+        outputs_info=[dict(initial=x0, taps=[-2, -1]), h0, None],
+        non_sequences=threshold,
+        n_steps=n_steps,
+    )
+    f_ref = theano.function([x0, h0, threshold], outputs)
+    with config.change_flags(scan__while_growth=True):
+        f = theano.function(
+            [x0, h0, threshold], outputs, mode=theano.Mode(linker=linker)
+        )
+
+    x_val = np.ones(2, dtype=config.floatX)
+    h_val = np.zeros(3, dtype=config.floatX)
+    for threshold_val in (0, 39, 5000):
+        values = f(x_val, h_val, threshold_val)
+        n_done = min(n_steps, threshold_val + 1)
+        assert values[2].shape[0] == n_done
+        for out, out_ref in zip(values, f_ref(x_val, h_val, threshold_val)):
+            utt.assert_allclose(out, out_ref)
+        # The buffers hold at most twice the steps that were done
+        assert values[2].base.shape[0] <= max(2 * n_done, 16)
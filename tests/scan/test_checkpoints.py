@@ -3,8 +3,13 @@ import pytest
 
 import theano
 import theano.tensor as tt
+from tests import unittest_tools as utt
 from theano.scan.basic import scan
-from theano.scan.checkpoints import scan_checkpoints
+from theano.scan.checkpoints import (
+    checkpoint_intervals,
+    scan_checkpoints,
+    scan_recompute,
+)
 
 
 class TestScanCheckpoint:
@@ -46,6 +51,205 @@ class TestScanCheckpoint:
         assert np.allclose(out, out_check)
 
     def test_taps_error(self):
-        # Test that an error rises if we use taps in outputs_info.
+        # Test that an error rises if we use taps in sequences.
         with pytest.raises(RuntimeError):
-            scan_checkpoints(lambda: None, [], {"initial": self.A, "taps": [-2]})
+            scan_checkpoints(lambda: None, {"input": self.A, "taps": [-2]}, [])
+
+    @pytest.mark.parametrize("memory_budget", [16, 30])
+    def test_memory_budget(self, memory_budget):
+        # 101 steps need 2 levels of checkpoints with a budget of 16 states,
+        # and 1 with a budget of 30.
+        k = 101
+        result_check, _ = scan_checkpoints(
+            fn=lambda prior_result, A: prior_result * A,
+            outputs_info=tt.ones_like(self.A),
+            non_sequences=self.A,
+            n_steps=k,
+            memory_budget=memory_budget,
+        )
+        grad_A_check = tt.grad(result_check[-1].sum(), self.A)
+        f = theano.function(
+            inputs=[self.A, self.k],
+            outputs=[self.result, result_check[-1], self.grad_A, grad_A_check],
+        )
+        A = np.linspace(0.5, 1.02, 10).astype(theano.config.floatX)
+        out, out_check, grad, grad_check = f(A, k)
+        utt.assert_allclose(out, out_check)
+        utt.assert_allclose(grad, grad_check)
+
+    @pytest.mark.parametrize("memory_budget", [16, 200])
+    def test_memory_budget_outputs(self, memory_budget):
+        # Only the last step is returned, whether the steps fit in the budget
+        # or not.
+        result_check, _ = scan_checkpoints(
+            fn=lambda prior_result, A: prior_result * A,
+            outputs_info=tt.ones_like(self.A),
+            non_sequences=self.A,
+            n_steps=101,
+            memory_budget=memory_budget,
+        )
+        f = theano.function([self.A, self.k], [self.result, result_check])
+        A = np.linspace(0.5, 1.02, 10).astype(theano.config.floatX)
+        out, out_check = f(A, 101)
+        assert out_check.shape == (1, 10)
+        utt.assert_allclose(out, out_check[0])
+
+    def test_memory_budget_symbolic_steps(self):
+        result_check, _ = scan_checkpoints(
+            fn=lambda prior_result, A: prior_result * A,
+            outputs_info=tt.ones_like(self.A),
+            non_sequences=self.A,
+            n_steps=self.k,
+            memory_budget=10,
+        )
+        grad_A_check = tt.grad(result_check[-1].sum(), self.A)
+        f = theano.function(
+            inputs=[self.A, self.k], outputs=[self.grad_A, grad_A_check]
+        )
+        A = np.linspace(0.5, 1.02, 10).astype(theano.config.floatX)
+        for k in (1, 17, 50):
+            out, out_check = f(A, k)
+            utt.assert_allclose(out, out_check)
+
+
+def test_checkpoint_intervals():
+    assert checkpoint_intervals(50, 100) == []
+    assert checkpoint_intervals(100, 20) == [10]
+    assert checkpoint_intervals(10000, 100) == [455, 21]
+    assert checkpoint_intervals(1000, 30) == [100, 10]
+    with pytest.raises(ValueError):
+        checkpoint_intervals(100, 1)
+
+
+def test_sequences_and_nit_sot():
+    # The number of steps is not a multiple of save_every_N, and a
+    # non-recurrent output comes before the recurrent one.
+    x = tt.matrix("x")
+    h0 = tt.vector("h0")
+
+    def step(x_t, h_tm1):
+        return 2 * x_t, tt.tanh(x_t + h_tm1)
+
+    result, _ = scan(step, sequences=x, outputs_info=[None, h0])
+    result_check, _ = scan_checkpoints(
+        step, sequences=x, outputs_info=[None, h0], save_every_N=4
+    )
+    out = [r[-1] for r in result]
+    out_check = [r[-1] for r in result_check]
+    grads = tt.grad(out[1].sum(), [x, h0])
+    grads_check = tt.grad(out_check[1].sum(), [x, h0])
+    f = theano.function([x, h0], out + out_check + grads + grads_check)
+
+    rng = np.random.RandomState(utt.fetch_seed())
+    x_val = rng.uniform(-1, 1, (10, 3)).astype(theano.config.floatX)
+    h0_val = rng.uniform(-1, 1, 3).astype(theano.config.floatX)
+    values = f(x_val, h0_val)
+    for v, v_check in zip(values[:2] + values[4:6], values[2:4] + values[6:]):
+        utt.assert_allclose(v, v_check)
+
+
+class TestScanRecompute:
+    def setup_method(self):
+        self.x = tt.matrix("x")
+        self.h0 = tt.vector("h0")
+        self.W = tt.matrix("W")
+        self.b = tt.vector("b")
+        rng = np.random.RandomState(utt.fetch_seed())
+        self.values = [
+            rng.uniform(-1, 1, (11, 3)).astype(theano.config.floatX),
+            rng.uniform(-1, 1, 3).astype(theano.config.floatX),
+            rng.uniform(-1, 1, (3, 3)).astype(theano.config.floatX),
+            rng.uniform(-1, 1, 3).astype(theano.config.floatX),
+        ]
+
+    def step(self, x_t, h_tm1, W):
+        # `b` is used without being passed as a non-sequence
+        return h_tm1 + tt.tanh(tt.dot(x_t + h_tm1, W) + self.b)
+
+    def inverse_step(self, x_t, h_t, W):
+        # Fixed-point iterations, exact enough for small weights
+        h = h_t
+        for _ in range(30):
+            h = h_t - tt.tanh(tt.dot(x_t + h, W) + self.b)
+        return h
+
+    def check(self, **kwargs):
+        inputs = [self.x, self.h0, self.W, self.b]
+        result, _ = scan(
+            self.step, sequences=self.x, outputs_info=self.h0, non_sequences=self.W
+        )
+        result_check, _ = scan_recompute(
+            self.step,
+            sequences=self.x,
+            outputs_info=self.h0,
+            non_sequences=self.W,
+            **kwargs,
+        )
+        grads = tt.grad(result[-1].sum(), inputs)
+        grads_check = tt.grad(result_check.sum(), inputs)
+        f = theano.function(inputs, [result[-1], result_check] + grads + grads_check)
+        values = f(*self.values)
+        for v, v_check in zip(values[:1] + values[2:6], values[1:2] + values[6:]):
+            utt.assert_allclose(v, v_check)
+
+    @pytest.mark.parametrize("save_every_N", [None, 4])
+    def test_checkpoints(self, save_every_N):
+        self.check(save_every_N=save_every_N)
+
+    def test_inverse(self):
+        self.values[2] *= 0.1
+        self.check(inverse_fn=self.inverse_step)
+
+    def test_non_recurrent_error(self):
+        with pytest.raises(RuntimeError):
+            scan_recompute(lambda x_t: x_t, sequences=self.x, outputs_info=[None])
+
+
+@pytest.mark.parametrize("save_every_N", [3, 4])
+def test_mit_sot(save_every_N):
+    # Outputs with several taps, mixed with sit-sot and nit-sot ones. Their
+    # last steps are carried from one segment to the next.
+    x = tt.matrix("x")
+    h0 = tt.matrix("h0")
+    g0 = tt.vector("g0")
+
+    def step(x_t, h_tm3, h_tm1, g_tm1):
+        h_t = tt.tanh(x_t + h_tm1 - 0.5 * h_tm3)
+        return h_t, g_tm1 * h_t, h_t.sum()
+
+    outputs_info = [{"initial": h0, "taps": [-3, -1]}, g0, None]
+    result, _ = scan(step, sequences=x, outputs_info=outputs_info)
+    result_check, _ = scan_checkpoints(
+        step, sequences=x, outputs_info=outputs_info, save_every_N=save_every_N
+    )
+    nested_check, _ = scan_checkpoints(
+        step, sequences=x, outputs_info=outputs_info, n_steps=10, memory_budget=4
+    )
+    out = [r[-1] for r in result]
+    out_check = [r[-1] for r in result_check]
+    out_nested = [r[-1] for r in nested_check]
+    cost = out[0].sum() + out[1].sum()
+    cost_check = out_check[0].sum() + out_check[1].sum()
+    cost_nested = out_nested[0].sum() + out_nested[1].sum()
+    wrt = [x, h0, g0]
+    f = theano.function(
+        [x, h0, g0],
+        out
+        + out_check
+        + out_nested
+        + tt.grad(cost, wrt)
+        + tt.grad(cost_check, wrt)
+        + tt.grad(cost_nested, wrt),
+    )
+
+    rng = np.random.RandomState(utt.fetch_seed())
+    x_val = rng.uniform(-1, 1, (10, 3)).astype(theano.config.floatX)
+    h0_val = rng.uniform(-1, 1, (3, 3)).astype(theano.config.floatX)
+    g0_val = rng.uniform(-1, 1, 3).astype(theano.config.floatX)
+    values = f(x_val, h0_val, g0_val)
+    outs, grads = values[:9], values[9:]
+    for i in range(3):
+        utt.assert_allclose(outs[i], outs[3 + i])
+        utt.assert_allclose(outs[i], outs[6 + i])
+        utt.assert_allclose(grads[i], grads[3 + i])
+        utt.assert_allclose(grads[i], grads[6 + i])
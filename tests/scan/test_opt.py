@@ -423,3 +423,172 @@ class TestPushOutSumOfDot:
         output_no_opt = f_no_opt(input1_value, input2_value, input3_value)
 
         utt.assert_allclose(output_opt, output_no_opt)
+
+
+class TestScanVectorizeMap:
+    vectorize_mode = mode.including("scan_vectorize_map")
+
+    def _check(self, inputs, outputs, values, vectorized=True):
+        f_vec = theano.function(inputs, outputs, mode=self.vectorize_mode)
+        f_ref = theano.function(inputs, outputs, mode=mode)
+        scans = [
+            node for node in f_vec.maker.fgraph.toposort() if isinstance(node.op, Scan)
+        ]
+        assert len(scans) == (0 if vectorized else 1)
+        for out_vec, out_ref in zip(f_vec(*values), f_ref(*values)):
+            utt.assert_allclose(out_vec, out_ref)
+
+    def test_elemwise_reduce_dot(self):
+        X = tt.matrix("X")
+        W = tt.matrix("W")
+        b = tt.vector("b")
+
+        def step(x, W, b):
+            h = tt.tanh(tt.dot(W, x) + b)
+            return h.sum(), tt.dot(x, W.T), x[1:] * 2
+
+        outputs, _ = theano.map(step, sequences=X, non_sequences=[W, b])
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(6, 4).astype(config.floatX),
+            rng.rand(5, 4).astype(config.floatX),
+            rng.rand(5).astype(config.floatX),
+        ]
+        self._check([X, W, b], outputs, values)
+
+    def test_batched_dot(self):
+        A = tt.tensor3("A")
+        B = tt.tensor3("B")
+        out, _ = theano.map(lambda a, b: tt.dot(a, b).T, sequences=[A, B])
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(6, 2, 3).astype(config.floatX),
+            rng.rand(6, 3, 4).astype(config.floatX),
+        ]
+        self._check([A, B], [out], values)
+
+    def test_unbatched_output_and_n_steps(self):
+        X = tt.matrix("X")
+        w = tt.vector("w")
+        outputs, _ = theano.scan(
+            lambda x, w: [x * w, w.sum() + x.shape[0]],
+            sequences=X,
+            non_sequences=w,
+            n_steps=3,
+        )
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(5, 4).astype(config.floatX),
+            rng.rand(4).astype(config.floatX),
+        ]
+        self._check([X, w], outputs, values)
+
+    def test_unsupported(self):
+        X = tt.matrix("X")
+        out, _ = theano.map(lambda x: tt.sort(x), sequences=X)
+        values = [np.random.rand(5, 4).astype(config.floatX)]
+        self._check([X], [out], values, vectorized=False)
+
+    def test_loop_carried_dependency(self):
+        X = tt.matrix("X")
+        out, _ = theano.scan(
+            lambda x, acc: acc + x, sequences=X, outputs_info=tt.zeros_like(X[0])
+        )
+        values = [np.random.rand(5, 4).astype(config.floatX)]
+        self._check([X], [out], values, vectorized=False)
+
+
+class TestScanFusion:
+    def _scans(self, f):
+        return [node for node in f.maker.fgraph.toposort() if isinstance(node.op, Scan)]
+
+    def _check(self, inputs, outputs, values, n_scans):
+        f = theano.function(inputs, outputs, mode=mode)
+        f_ref = theano.function(inputs, outputs, mode=mode.excluding("scan_fusion"))
+        assert len(self._scans(f)) == n_scans
+        for out, out_ref in zip(f(*values), f_ref(*values)):
+            utt.assert_allclose(out, out_ref)
+
+    def test_stacked_maps(self):
+        X = tt.matrix("X")
+        W = tt.matrix("W")
+        H, _ = theano.map(
+            lambda x, W: tt.tanh(tt.dot(W, x)), sequences=X, non_sequences=W
+        )
+        Y, _ = theano.map(lambda h: tt.nnet.sigmoid(h) * 2, sequences=H)
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(6, 4).astype(config.floatX),
+            rng.rand(4, 4).astype(config.floatX),
+        ]
+        self._check([X, W], Y, values, n_scans=1)
+
+    def test_stacked_recurrences(self):
+        X = tt.matrix("X")
+        W = tt.matrix("W")
+        h0 = tt.vector("h0")
+
+        def layer(seq):
+            H, _ = theano.scan(
+                lambda x, h, W: tt.tanh(x + tt.dot(h, W)),
+                sequences=seq,
+                outputs_info=h0,
+                non_sequences=W,
+            )
+            return H
+
+        Y = layer(layer(X))
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(6, 4).astype(config.floatX),
+            rng.rand(4, 4).astype(config.floatX),
+            rng.rand(4).astype(config.floatX),
+        ]
+        self._check([X, W, h0], Y, values, n_scans=1)
+
+    def test_other_input_depends_on_producer(self):
+        X = tt.matrix("X")
+        h0 = tt.vector("h0")
+        H, _ = theano.scan(lambda x, h: h + x, sequences=X, outputs_info=h0)
+        Y, _ = theano.scan(
+            lambda h, y, s: y * 0.5 + h * s,
+            sequences=H,
+            outputs_info=h0,
+            non_sequences=H.sum(),
+        )
+        rng = np.random.RandomState(utt.fetch_seed())
+        values = [
+            rng.rand(5, 3).astype(config.floatX),
+            rng.rand(3).astype(config.floatX),
+        ]
+        self._check([X, h0], Y, values, n_scans=2)
+
+    def _inner_elemwise(self, f):
+        (scan_node,) = self._scans(f)
+        inner_nodes = theano.graph.basic.applys_between(
+            scan_node.op.inputs, scan_node.op.outputs
+        )
+        return [n for n in inner_nodes if isinstance(n.op, tt.Elemwise)]
+
+    def test_group_loop_invariants(self):
+        h0 = tt.vector("h0")
+        W = tt.vector("W")
+        V = tt.vector("V")
+        Y, _ = theano.scan(
+            lambda h, W, V: h * W * V, outputs_info=h0, non_sequences=[W, V], n_steps=4
+        )
+        # The terms are only regrouped on demand, as it reassociates the
+        # floating point operations.
+        f = theano.function([h0, W, V], Y, mode=mode)
+        assert len(self._inner_elemwise(f)) == 2
+        with config.change_flags(scan__group_loop_invariants=True):
+            f = theano.function([h0, W, V], Y, mode=mode)
+        (inner_node,) = self._inner_elemwise(f)
+        assert len(inner_node.inputs) == 2
+
+        rng = np.random.RandomState(utt.fetch_seed())
+        h = rng.rand(3).astype(config.floatX)
+        w = rng.rand(3).astype(config.floatX)
+        v = rng.rand(3).astype(config.floatX)
+        expected = np.array([h * (w * v) ** k for k in range(1, 5)])
+        utt.assert_allclose(f(h, w, v), expected)
@@ -12,7 +12,7 @@ from theano import sparse, tensor
 from theano.compile.function import function
 from theano.configdefaults import config
 from theano.gradient import GradientError
-from theano.graph.basic import Apply, Constant
+from theano.graph.basic import Apply, Constant, ancestors
 from theano.graph.op import Op
 from theano.misc.safe_asarray import _asarray
 from theano.sparse import (
@@ -83,7 +83,13 @@ from theano.sparse.basic import (
     _is_sparse_variable,
     _mtypes,
 )
-from theano.sparse.opt import CSMGradC, StructuredDotCSC, UsmmCscDense
+from theano.sparse.opt import (
+    CSMGradC,
+    DotCSxDense,
+    StructuredDotCSC,
+    UsmmCscDense,
+    UsmmCSxDense,
+)
 
 
 sp = pytest.importorskip("scipy", minversion="0.7.0")
@@ -462,6 +468,7 @@ class TestSparseInferShape(utt.InferShapeTester):
                 sp.sparse.csr_matrix(random_lil((10, 40), config.floatX, 3)),
             ],
             AddSS,
+            excluding=["local_elemwise_s_s_csx"],
         )
 
     def test_add_sd(self):
@@ -488,6 +495,7 @@ class TestSparseInferShape(utt.InferShapeTester):
             ]
             * 2,
             MulSS,
+            excluding=["local_elemwise_s_s_csx"],
         )
 
     def test_mul_sd(self):
@@ -511,6 +519,7 @@ class TestSparseInferShape(utt.InferShapeTester):
             [Remove0()(x)],
             [sp.sparse.csr_matrix(random_lil((10, 40), config.floatX, 3))],
             Remove0,
+            excluding=["local_remove0_csx"],
         )
 
     def test_dot(self):
@@ -680,6 +689,70 @@ class TestConstructSparseFromList:
                 theano.grad(sub.sum(), t)
 
 
+class TestSparseGradTerms:
+    @pytest.mark.parametrize("format", ["csc", "csr"])
+    def test_dot_grad(self, format):
+        # The grad of `dot` is regular, so it is dense even for sparse inputs
+        x = SparseType(format, config.floatX)("x")
+        y = tensor.matrix("y")
+        g = theano.grad(sparse.dot(x, y).sum(), x)
+        assert isinstance(g.type, tensor.TensorType)
+
+        sp_types = {"csc": sp.sparse.csc_matrix, "csr": sp.sparse.csr_matrix}
+        x_val = sp_types[format](random_lil((3, 4), config.floatX, 5))
+        y_val = np.random.rand(4, 2).astype(config.floatX)
+        g_val = theano.function([x, y], g)(x_val, y_val)
+        utt.assert_allclose(g_val, np.ones((3, 2)).dot(y_val.T))
+
+    def test_shared_update(self):
+        # The structured grad of `structured_dot` is sparse, so it can be used
+        # in the update of a sparse shared variable
+        p_val = sp.sparse.csr_matrix(random_lil((3, 4), config.floatX, 5))
+        p = sparse.shared(p_val)
+        y = tensor.matrix("y")
+        g = theano.grad(sparse.structured_dot(p, y).sum(), p)
+        assert g.type == p.type
+        f = theano.function([y], [], updates=[(p, p - 0.5 * g)])
+
+        y_val = np.random.rand(4, 2).astype(config.floatX)
+        f(y_val)
+        new_val = p.get_value()
+        assert new_val.format == "csr"
+        g_val = (p_val.toarray() != 0) * np.ones((3, 2)).dot(y_val.T)
+        utt.assert_allclose(new_val.toarray(), p_val.toarray() - 0.5 * g_val)
+
+    def test_stack_grads(self):
+        a = sparse.csr_matrix("a")
+        b = sparse.csr_matrix("b")
+        for stack in (sparse.hstack, sparse.vstack):
+            h = stack([a, b], format="csr")
+            grads = theano.grad(sparse.sp_sum(h * h, sparse_grad=True), [a, b])
+            assert not any(
+                isinstance(v.owner.op, (DenseFromSparse, SparseFromDense))
+                for v in ancestors(grads)
+                if v.owner
+            )
+
+            a_val = sp.sparse.csr_matrix(random_lil((3, 3), config.floatX, 4))
+            b_val = sp.sparse.csr_matrix(random_lil((3, 3), config.floatX, 4))
+            ga, gb = theano.function([a, b], grads)(a_val, b_val)
+            utt.assert_allclose(ga.toarray(), 2 * a_val.toarray())
+            utt.assert_allclose(gb.toarray(), 2 * b_val.toarray())
+
+    def test_sparse_grad_of_output(self):
+        # The sparse grad of `w * 2` is made dense for the grad of the `mul`
+        w = tensor.matrix("w")
+        v = tensor.ivector("v")
+        g = theano.grad(theano.sparse_grad((w * 2)[v]).sum(), w)
+
+        w_val = np.random.rand(5, 4).astype(config.floatX)
+        g_val = theano.function([w, v], g)(w_val, [0, 2, 2])
+        expected = np.zeros((5, 4))
+        expected[0] = 2
+        expected[2] = 4
+        utt.assert_allclose(g_val, expected)
+
+
 class TestAddMul:
     def test_AddSS(self):
         self._testSS(add)
@@ -1493,7 +1566,10 @@ class TestDots(utt.InferShapeTester):
 
             # Test infer_shape
             self._compile_and_check(
-                [x, y], [theano.sparse.dot(x, y)], [x_v, y_v], (Dot, Usmm, UsmmCscDense)
+                [x, y],
+                [theano.sparse.dot(x, y)],
+                [x_v, y_v],
+                (Dot, Usmm, UsmmCscDense, DotCSxDense),
             )
 
     def test_csc_dense(self):
@@ -1516,7 +1592,10 @@ class TestDots(utt.InferShapeTester):
 
             # Test infer_shape
             self._compile_and_check(
-                [x, y], [theano.sparse.dot(x, y)], [x_v, y_v], (Dot, Usmm, UsmmCscDense)
+                [x, y],
+                [theano.sparse.dot(x, y)],
+                [x_v, y_v],
+                (Dot, Usmm, UsmmCscDense, DotCSxDense),
             )
 
     def test_sparse_sparse(self):
@@ -1707,16 +1786,26 @@ class TestUsmm:
 
             fast_compile = theano.config.mode == "FAST_COMPILE"
 
+            multithreaded = (
+                not fast_compile
+                and theano.config.cxx
+                and "dense" in (format1, format2)
+                and "complex64" not in (dtype1, dtype2, dtype3, dtype4)
+            )
+
             if not theano.config.blas__ldflags:
                 # Usmm should not be inserted, because it relies on BLAS
-                assert len(topo) == 4, topo
-                assert isinstance(topo[0].op, theano.sparse.Dot)
-                assert isinstance(topo[1].op, theano.tensor.DimShuffle)
-                assert isinstance(topo[2].op, theano.tensor.Elemwise) and isinstance(
-                    topo[2].op.scalar_op, theano.scalar.Mul
+                assert not any(
+                    isinstance(node.op, (Usmm, UsmmCscDense, UsmmCSxDense))
+                    for node in topo
+                )
+                dot_op = DotCSxDense if multithreaded else theano.sparse.Dot
+                assert sum(isinstance(node.op, dot_op) for node in topo) == 1
+                assert isinstance(topo[-2].op, theano.tensor.Elemwise) and isinstance(
+                    topo[-2].op.scalar_op, theano.scalar.Mul
                 )
-                assert isinstance(topo[3].op, theano.tensor.Elemwise) and isinstance(
-                    topo[3].op.scalar_op, theano.scalar.Sub
+                assert isinstance(topo[-1].op, theano.tensor.Elemwise) and isinstance(
+                    topo[-1].op.scalar_op, theano.scalar.Sub
                 )
             elif (
                 y.type.dtype == up
@@ -1725,6 +1814,7 @@ class TestUsmm:
                 and not fast_compile
                 and theano.config.cxx
                 and up in ("float32", "float64")
+                and not theano.config.openmp
             ):
                 # The op UsmmCscDense should be inserted
                 assert (
@@ -1760,6 +1850,12 @@ class TestUsmm:
                 check_once(theano.tensor.Elemwise)
                 if inplace:
                     assert topo[4].op.inplace
+            elif multithreaded:
+                # The multithreaded UsmmCSxDense replaces Usmm
+                assert not any(isinstance(node.op, Usmm) for node in topo)
+                (usmm_node,) = [n for n in topo if isinstance(n.op, UsmmCSxDense)]
+                if inplace:
+                    assert usmm_node.op.inplace
             elif not fast_compile:
                 # The op Usmm should be inserted
                 assert len(topo) == 3, topo
@@ -2053,7 +2149,11 @@ class TestSpSum(utt.InferShapeTester):
             for axis in self.possible_axis:
                 variable, data = sparse_random_inputs(format, shape=(9, 10))
                 self._compile_and_check(
-                    variable, [self.op(variable[0], axis=axis)], data, self.op_class
+                    variable,
+                    [self.op(variable[0], axis=axis)],
+                    data,
+                    self.op_class,
+                    excluding=["local_sp_sum_csx"],
                 )
 
     def test_grad(self):
@@ -2160,7 +2260,11 @@ class TestEnsureSortedIndices(utt.InferShapeTester):
             for shape in zip(range(5, 9), range(3, 7)[::-1]):
                 variable, data = sparse_random_inputs(format, shape=shape)
                 self._compile_and_check(
-                    variable, [self.op(*variable)], data, self.op_class
+                    variable,
+                    [self.op(*variable)],
+                    data,
+                    self.op_class,
+                    excluding=["local_ensure_sorted_indices_csx"],
                 )
 
     def test_grad(self):
@@ -2233,7 +2337,11 @@ class TestRemove0(utt.InferShapeTester):
                 # the In thingy has to be there because theano has as rule not
                 # to optimize inputs
                 f = theano.function(
-                    [theano.In(x, borrow=True, mutable=True)], Remove0()(x)
+                    [theano.In(x, borrow=True, mutable=True)],
+                    Remove0()(x),
+                    mode=theano.compile.mode.get_default_mode().excluding(
+                        "local_remove0_csx"
+                    ),
                 )
 
                 # assert optimization local_inplace_remove0 is applied in
@@ -2275,11 +2383,23 @@ class TestRemove0(utt.InferShapeTester):
 
         x_csc = theano.sparse.csc_matrix(dtype=theano.config.floatX)
         mat_csc = sp.sparse.csc_matrix(mat, dtype=theano.config.floatX)
-        self._compile_and_check([x_csc], [Remove0()(x_csc)], [mat_csc], self.op_class)
+        self._compile_and_check(
+            [x_csc],
+            [Remove0()(x_csc)],
+            [mat_csc],
+            self.op_class,
+            excluding=["local_remove0_csx"],
+        )
 
         x_csr = theano.sparse.csr_matrix(dtype=theano.config.floatX)
         mat_csr = sp.sparse.csr_matrix(mat, dtype=theano.config.floatX)
-        self._compile_and_check([x_csr], [Remove0()(x_csr)], [mat_csr], self.op_class)
+        self._compile_and_check(
+            [x_csr],
+            [Remove0()(x_csr)],
+            [mat_csr],
+            self.op_class,
+            excluding=["local_remove0_csx"],
+        )
 
     def test_grad(self):
         mat = (np.arange(9) + 1).reshape((3, 3))
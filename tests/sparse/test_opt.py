@@ -144,6 +144,167 @@ def test_local_sampling_dot_csr():
             )
 
 
+def non_canonical_csx(cast):
+    # Unsorted and duplicated indices, explicit zeros and an empty row
+    return cast(
+        (
+            np.array([1.0, 2.0, 0.0, 3.0, -1.5, 4.0], dtype=config.floatX),
+            np.array([3, 0, 1, 3, 2, 0], dtype="int32"),
+            np.array([0, 4, 4, 6], dtype="int32"),
+        ),
+        shape=(3, 4) if cast is sp.sparse.csr_matrix else (4, 3),
+    )
+
+
+@pytest.mark.skipif(
+    not theano.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+@pytest.mark.parametrize("sp_format", ["csr", "csc"])
+def test_local_csx_kernels(sp_format):
+    mode = theano.compile.mode.get_default_mode().including("specialize")
+    cast = getattr(sp.sparse, sp_format + "_matrix")
+    x = getattr(theano.sparse, sp_format + "_matrix")()
+    y = getattr(theano.sparse, sp_format + "_matrix")()
+    outs = [
+        sparse.add_s_s(x, y),
+        sparse.mul_s_s(x, y),
+        sparse.sp_sum(x),
+        sparse.sp_sum(x, axis=0),
+        sparse.sp_sum(x, axis=1),
+        sparse.remove0(x),
+        sparse.ensure_sorted_indices(x),
+    ]
+    f = theano.function([x, y], outs, mode=mode)
+    replaced = (
+        sparse.AddSS,
+        sparse.MulSS,
+        sparse.SpSum,
+        sparse.Remove0,
+        sparse.EnsureSortedIndices,
+    )
+    assert not any(isinstance(n.op, replaced) for n in f.maker.fgraph.apply_nodes)
+
+    x_val = non_canonical_csx(cast)
+    y_val = cast(random_lil(x_val.shape, config.floatX, 5))
+    res = f(x_val, y_val)
+    x_dense = x_val.toarray()
+    expected = [
+        x_dense + y_val.toarray(),
+        x_dense * y_val.toarray(),
+        x_dense.sum(),
+        x_dense.sum(0),
+        x_dense.sum(1),
+        x_dense,
+        x_dense,
+    ]
+    for r, e in zip(res, expected):
+        utt.assert_allclose(r.toarray() if sp.sparse.issparse(r) else r, e)
+    assert 0 not in res[5].data
+    assert all(
+        np.all(np.diff(res[6].indices[start:stop]) >= 0)
+        for start, stop in zip(res[6].indptr[:-1], res[6].indptr[1:])
+    )
+
+
+@pytest.mark.skipif(
+    not theano.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+@pytest.mark.parametrize("openmp", [False, True])
+def test_csx_kernels_c_code(openmp):
+    data = tensor.vector()
+    ind, ptr = tensor.ivector(), tensor.ivector()
+    y_data = tensor.vector()
+    y_ind, y_ptr = tensor.ivector(), tensor.ivector()
+    n = tensor.iscalar()
+    inputs = [data, ind, ptr, y_data, y_ind, y_ptr, n]
+
+    def compile_kernels(linker):
+        outs = [
+            sparse.opt.ElemwiseSSCSx("add", openmp)(*inputs),
+            sparse.opt.ElemwiseSSCSx("mul", openmp)(*inputs),
+            [sparse.opt.SumCSx("major", openmp)(data, ind, ptr, n)],
+            [sparse.opt.SumCSx("minor", openmp)(data, ind, ptr, n)],
+            sparse.opt.Remove0CSx(openmp)(data, ind, ptr),
+            sparse.opt.EnsureSortedIndicesCSx(False, openmp)(data, ind, ptr),
+        ]
+        mode = theano.compile.Mode(linker=linker, optimizer=None)
+        return theano.function(inputs, sum(outs, []), mode=mode)
+
+    x_val = non_canonical_csx(sp.sparse.csr_matrix)
+    y_val = sp.sparse.csr_matrix(random_lil(x_val.shape, config.floatX, 5))
+    values = [x_val.data, x_val.indices, x_val.indptr]
+    values += [y_val.data, y_val.indices, y_val.indptr, np.int32(x_val.shape[1])]
+    py_res = compile_kernels("py")(*values)
+    with config.change_flags(openmp=openmp, openmp_elemwise_minsize=0):
+        c_res = compile_kernels("c")(*values)
+
+    def to_dense(*csr):
+        return sp.sparse.csr_matrix(csr, shape=x_val.shape).toarray()
+
+    for k in (0, 3, 8):
+        utt.assert_allclose(to_dense(*c_res[k : k + 3]), to_dense(*py_res[k : k + 3]))
+    for k in (6, 7, 8, 9, 10, 12):
+        utt.assert_allclose(c_res[k], py_res[k])
+    # The duplicated indices can be sorted in any order
+    utt.assert_allclose(to_dense(c_res[11], c_res[12], x_val.indptr), x_val.toarray())
+
+
+@pytest.mark.skipif(
+    not theano.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+@pytest.mark.parametrize("openmp", [False, True])
+@pytest.mark.parametrize("sp_format", ["csr", "csc"])
+def test_local_csx_dense_dot(sp_format, openmp):
+    x = getattr(theano.sparse, sp_format + "_matrix")("x")
+    y = tensor.matrix("y")
+    v = tensor.vector("v")
+    a = tensor.scalar("a")
+    z = tensor.matrix("z")
+    outs = [
+        sparse.dot(x, y),
+        sparse.dot(y.T, x.T),
+        sparse.dot(x, v),
+        sparse.structured_dot(x, y),
+        sparse.usmm(a, x, y, z),
+        sparse.usmm(a, y.T, x.T, z.T),
+    ]
+    # Keep the BLAS version of Usmm out of the way
+    mode = theano.compile.mode.get_default_mode().excluding("local_usmm_csx")
+    with config.change_flags(openmp=openmp, openmp_elemwise_minsize=0):
+        f = theano.function([x, y, v, a, z], outs, mode=mode)
+    topo = f.maker.fgraph.toposort()
+    replaced = (sparse.Dot, sparse.StructuredDot, sparse.Usmm)
+    assert not any(isinstance(node.op, replaced) for node in topo)
+    assert any(isinstance(node.op, sparse.opt.DotCSxDense) for node in topo)
+
+    x_val = getattr(sp.sparse, sp_format + "_matrix")(
+        random_lil((30, 600), config.floatX, 200)
+    )
+    y_val = np.random.rand(600, 300).astype(config.floatX)
+    v_val = y_val[:, 0].copy()
+    z_val = np.random.rand(30, 300).astype(config.floatX)
+    res = f(x_val, y_val, v_val, np.asarray(1.5, dtype=config.floatX), z_val)
+    dot = x_val * y_val
+    expected = [dot, dot.T, x_val * v_val, dot, 1.5 * dot + z_val]
+    expected.append(expected[-1].T)
+    for r, e in zip(res, expected):
+        utt.assert_allclose(r, e)
+
+
+@pytest.mark.skipif(
+    not theano.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+def test_csx_dense_dot_shape_mismatch():
+    x = sparse.csr_matrix("x")
+    y = tensor.matrix("y")
+    f = theano.function([x, y], sparse.dot(x, y))
+    topo = f.maker.fgraph.toposort()
+    assert any(isinstance(node.op, sparse.opt.DotCSxDense) for node in topo)
+    x_val = sp.sparse.csr_matrix(random_lil((3, 4), config.floatX, 5))
+    with pytest.raises(ValueError):
+        f(x_val, np.ones((5, 2), dtype=config.floatX))
+
+
 def test_local_dense_from_sparse_sparse_from_dense():
     mode = theano.compile.mode.get_default_mode()
     mode = mode.including("local_dense_from_sparse_sparse_from_dense")
@@ -0,0 +1,12 @@
+import pytest
+
+from theano.tensor import calibration as calibration_module
+
+
+@pytest.fixture
+def calibration():
+    # Restore the calibration tables in use after the test
+    saved = {name: table.get() for name, table in calibration_module.tables.items()}
+    yield
+    for name, table in saved.items():
+        calibration_module.tables[name].set(table)
@@ -3,10 +3,11 @@ from functools import partial
 
 import numpy as np
 import scipy.stats as stats
-from pytest import fixture, importorskip, raises
+from pytest import fixture, importorskip, mark, raises
 
 import theano.tensor as tt
-from theano import change_flags, config
+from theano import change_flags, config, shared
+from theano.compile.function import function
 from theano.graph.basic import Constant, Variable, graph_inputs
 from theano.graph.fg import FunctionGraph
 from theano.graph.op import get_test_value
@@ -652,3 +653,42 @@ def test_pickle():
     a_unpkl = pickle.loads(a_pkl)
 
     assert a_unpkl.owner.op._props() == sample_a.owner.op._props()
+
+
+@mark.parametrize("make_rng", [np.random.RandomState, np.random.default_rng])
+@mark.parametrize(
+    "rv, params",
+    [
+        (uniform, (0.0, 1.0)),
+        (beta, (1.0, 2.0)),
+        (normal, (0.0, 1.0)),
+        (halfnormal, (0.0, 1.0)),
+        (gamma, (1.0, 2.0)),
+        (exponential, (1.0,)),
+        (multivariate_normal, (np.zeros(2), np.eye(2))),
+        (dirichlet, (np.ones(3),)),
+        (poisson, (2.0,)),
+        (cauchy, (0.0, 1.0)),
+        (halfcauchy, (0.0, 1.0)),
+        (invgamma, (2.0, 1.0)),
+        (truncexpon, (2.0, 0.0, 1.0)),
+        (bernoulli, (0.5,)),
+        (binomial, (10, 0.5)),
+        (nbinom, (10, 0.5)),
+        (betabinom, (10, 1.0, 2.0)),
+        (multinomial, (10, np.full(3, 1 / 3))),
+        (categorical, (np.full(3, 1 / 3),)),
+        (randint, (0, 10)),
+        (choice, (np.arange(5),)),
+        (permutation, (np.arange(5),)),
+    ],
+)
+def test_rng_types(make_rng, rv, params):
+    # Every `RandomVariable` can sample from a `RandomState` or a `Generator`
+    rng = shared(make_rng(2032))
+    with change_flags(compute_test_value="off"):
+        out = rv(*params, rng=rng)
+        f = function([], out, updates={rng: out.owner.outputs[0]})
+    res = f()
+    assert res.dtype == out.type.dtype
+    assert res.ndim == out.ndim
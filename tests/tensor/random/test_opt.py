@@ -1,16 +1,22 @@
 import numpy as np
 import pytest
 
+import theano
 import theano.tensor as tt
 from theano import change_flags, config, shared
 from theano.compile.function import function
 from theano.compile.mode import Mode
-from theano.graph.basic import Constant
+from theano.graph.basic import Constant, graph_inputs
 from theano.graph.fg import FunctionGraph
 from theano.graph.opt import EquilibriumOptimizer
 from theano.graph.optdb import Query
 from theano.tensor.elemwise import DimShuffle
 from theano.tensor.random.basic import (
+    BernoulliRV,
+    CauchyRV,
+    NormalRV,
+    UniformRV,
+    cauchy,
     dirichlet,
     multivariate_normal,
     normal,
@@ -21,7 +27,9 @@ from theano.tensor.random.op import RandomVariable
 from theano.tensor.random.opt import (
     lift_rv_shapes,
     local_dimshuffle_rv_lift,
+    local_rv_affine_lift,
     local_subtensor_rv_lift,
+    local_uniform_comparison_lift,
 )
 from theano.tensor.subtensor import AdvancedSubtensor, AdvancedSubtensor1, Subtensor
 
@@ -505,3 +513,154 @@ def test_Dimshuffle_lift_restrictions():
     assert rv_node.op == normal
     assert isinstance(rv_node.inputs[-1].owner.op, DimShuffle)
     assert isinstance(rv_node.inputs[-2].owner.op, DimShuffle)
+
+
+@pytest.mark.parametrize(
+    "make_rv, param_shape, size, out_shape",
+    [
+        (lambda mu, rng: normal(mu, 1e-6, size=(2,), rng=rng), (), (2,), (4, 2)),
+        (lambda mu, rng: normal(mu, 1e-6, rng=rng), (3,), None, (4, 3)),
+        (
+            lambda mu, rng: multivariate_normal(mu, np.eye(3) * 1e-12, rng=rng),
+            (3,),
+            None,
+            (4, 3),
+        ),
+    ],
+)
+def test_vectorize_RandomVariable(make_rv, param_shape, size, out_shape):
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    mu = tt.TensorType(config.floatX, (False,) * len(param_shape))("mu")
+    batch_mu = tt.TensorType(config.floatX, (False,) * (len(param_shape) + 1))()
+    rv = make_rv(mu, rng)
+
+    batch_rv = theano.vectorize(rv, {mu: batch_mu})
+    assert isinstance(batch_rv.owner.op, RandomVariable)
+
+    mu_val = np.arange(np.prod((4,) + param_shape), dtype=config.floatX).reshape(
+        (4,) + param_shape
+    )
+    res = function([batch_mu], batch_rv)(mu_val)
+    assert res.shape == out_shape
+    if size is not None:
+        mu_val = mu_val[:, None]
+    np.testing.assert_allclose(res, np.broadcast_to(mu_val, out_shape), atol=1e-3)
+
+
+def lift_elemwise(outputs, lopt):
+    inputs = [v for v in graph_inputs(outputs) if not isinstance(v, Constant)]
+    fg = FunctionGraph(inputs, outputs, clone=False)
+    with change_flags(random__lift_transforms=True):
+        EquilibriumOptimizer([lopt], max_use_ratio=100).apply(fg)
+    return fg
+
+
+def test_rv_transform_lifts_opt_in():
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    x = normal(0.0, 1.0, size=(4,), rng=rng)
+    out = x * 2.0 + 1.0
+    fg = FunctionGraph([rng], [out], clone=False)
+    EquilibriumOptimizer([local_rv_affine_lift], max_use_ratio=100).apply(fg)
+    assert fg.outputs[0] is out
+
+
+@pytest.mark.parametrize(
+    "make_rv, transform, rv_type, ref",
+    [
+        (
+            lambda rng: normal(0.0, 1.0, size=(4,), rng=rng),
+            lambda x, s: x * s + 3.0,
+            NormalRV,
+            lambda s: (np.full(4, 3.0), np.abs(s)),
+        ),
+        (
+            lambda rng: normal(1.0, 2.0, size=(4,), rng=rng),
+            lambda x, s: (5.0 - x) / s,
+            NormalRV,
+            lambda s: ((5.0 - 1.0) / s, 2.0 / np.abs(s)),
+        ),
+        (
+            lambda rng: cauchy(1.0, 2.0, size=(4,), rng=rng),
+            lambda x, s: -x,
+            CauchyRV,
+            lambda s: (np.full(4, -1.0), np.full(4, 2.0)),
+        ),
+        (
+            lambda rng: uniform(0.0, 1.0, size=(4,), rng=rng),
+            lambda x, s: x * s - 1.0,
+            UniformRV,
+            lambda s: (np.full(4, -1.0), s - 1.0),
+        ),
+    ],
+)
+def test_rv_affine_lift(make_rv, transform, rv_type, ref):
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    s = tt.vector("s")
+    rv = make_rv(rng)
+    out = transform(rv, s)
+
+    fg = lift_elemwise([out], local_rv_affine_lift)
+    (new_out,) = fg.outputs
+    assert isinstance(new_out.owner.op, rv_type)
+    assert new_out.type == out.type
+
+    s_val = np.array([1.0, -2.0, 0.5, 3.0], dtype=config.floatX)
+    f = function([s], new_out.owner.inputs[3:], mode=no_mode, on_unused_input="ignore")
+    for val, ref_val in zip(f(s_val), ref(s_val)):
+        np.testing.assert_allclose(np.broadcast_to(val, (4,)), ref_val, rtol=1e-5)
+
+
+def test_rv_affine_lift_restrictions():
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    x = normal(0.0, 1.0, size=(4,), rng=rng)
+
+    # The sample is used elsewhere
+    fg = lift_elemwise([x * 2.0, x], local_rv_affine_lift)
+    assert fg.outputs[0].owner.inputs[0] is x
+
+    # Not affine
+    y = normal(0.0, 1.0, size=(4,), rng=rng)
+    fg = lift_elemwise([2.0 / y], local_rv_affine_lift)
+    assert fg.outputs[0].owner.inputs[1] is y
+
+    # The output is broadcasted beyond the sample
+    z = normal(0.0, 1.0, size=(4,), rng=rng)
+    fg = lift_elemwise([z * tt.matrix()], local_rv_affine_lift)
+    assert fg.outputs[0].owner.inputs[0].owner.inputs[0] is z
+
+
+def test_rv_affine_lift_rng_update():
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    x = normal(0.0, 1.0, size=(4,), rng=rng)
+    new_rng = x.owner.outputs[0]
+
+    fg = lift_elemwise([x * 2.0 + 1.0, new_rng], local_rv_affine_lift)
+    new_out, new_rng_out = fg.outputs
+    assert isinstance(new_out.owner.op, NormalRV)
+    assert new_rng_out is new_out.owner.outputs[0]
+    assert x.owner not in fg.apply_nodes
+
+
+@pytest.mark.parametrize(
+    "compare, prob",
+    [
+        (lambda x, p: x < p, lambda p: p),
+        (lambda x, p: p >= x, lambda p: p),
+        (lambda x, p: x > p, lambda p: 1 - p),
+        (lambda x, p: p <= x, lambda p: 1 - p),
+    ],
+)
+def test_uniform_comparison_lift(compare, prob):
+    rng = shared(np.random.RandomState(1233532), borrow=False)
+    p = tt.dvector("p")
+    out = compare(uniform(0.0, 1.0, size=(3,), rng=rng), p)
+
+    fg = lift_elemwise([out], local_uniform_comparison_lift)
+    (new_out,) = fg.outputs
+    assert new_out.type == out.type
+    bern = new_out.owner.inputs[0]
+    assert isinstance(bern.owner.op, BernoulliRV)
+
+    p_val = np.array([-0.5, 0.25, 2.0])
+    f = function([p], bern.owner.inputs[3], mode=no_mode)
+    np.testing.assert_allclose(f(p_val), np.clip(prob(p_val), 0, 1))
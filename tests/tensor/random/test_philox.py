@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+import theano.tensor as tt
+from theano import change_flags, config, shared
+from theano.compile.function import function
+from theano.compile.mode import Mode
+from theano.graph.optdb import Query
+from theano.tensor.random.basic import (
+    bernoulli,
+    cauchy,
+    exponential,
+    gamma,
+    halfcauchy,
+    halfnormal,
+    normal,
+    uniform,
+)
+from theano.tensor.random.philox import PhiloxRV, philox4x32, philox_key, philox_sample
+
+
+philox_mode = Mode(
+    "py", Query(include=["random_philox", "random_make_inplace"], exclude=[])
+)
+
+
+def test_philox4x32():
+    # Known answer test of the Random123 distribution
+    res = philox4x32(
+        (0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344), (0xA4093822, 0x299F31D0)
+    )
+    assert [int(x) for x in res] == [0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1]
+
+
+@pytest.mark.parametrize(
+    "rv, params, dist",
+    [
+        (uniform, (-1.0, 2.0), stats.uniform(-1.0, 3.0)),
+        (normal, (1.0, 2.0), stats.norm(1.0, 2.0)),
+        (halfnormal, (1.0, 2.0), stats.halfnorm(1.0, 2.0)),
+        (exponential, (2.0,), stats.expon(scale=2.0)),
+        (cauchy, (1.0, 2.0), stats.cauchy(1.0, 2.0)),
+        (halfcauchy, (1.0, 2.0), stats.halfcauchy(1.0, 2.0)),
+        (gamma, (3.0, 2.0), stats.gamma(3.0, scale=0.5)),
+        (gamma, (0.5, 2.0), stats.gamma(0.5, scale=0.5)),
+    ],
+)
+def test_distributions(rv, params, dist):
+    rng = shared(np.random.RandomState(123))
+    out = rv(*params, size=(20000,), rng=rng)
+    with change_flags(random__philox=True):
+        f = function([], out, mode=philox_mode)
+    (node,) = f.maker.fgraph.apply_nodes
+    assert isinstance(node.op, PhiloxRV)
+    assert node.op.inplace
+
+    samples = f()
+    assert samples.dtype == config.floatX
+    assert stats.kstest(samples, dist.cdf).pvalue > 1e-3
+
+
+def test_bernoulli():
+    rng = shared(np.random.RandomState(123))
+    p = tt.dvector("p")
+    with change_flags(random__philox=True):
+        f = function([p], bernoulli(p, size=(5000, 3), rng=rng), mode=philox_mode)
+    samples = f([0.1, 0.5, 0.9])
+    assert samples.dtype == "int64"
+    np.testing.assert_allclose(samples.mean(0), [0.1, 0.5, 0.9], atol=0.03)
+
+
+def test_flag():
+    out = normal(0, 1, size=(3,))
+    f = function([], out, mode=philox_mode)
+    (node,) = f.maker.fgraph.apply_nodes
+    assert not isinstance(node.op, PhiloxRV)
+
+
+def test_perform_reproducible():
+    # The samples only depend on the key and their index, so they can be
+    # recomputed for any part of the output
+    key = philox_key(np.random.RandomState(5))
+    loc = np.arange(6.0).reshape((2, 3))
+    samples = philox_sample("normal", key, [loc, 1.0])
+    assert samples.shape == (2, 3)
+    np.testing.assert_array_equal(samples, philox_sample("normal", key, [loc, 1.0]))
+    np.testing.assert_allclose(
+        philox_sample("normal", key, [0.0, 1.0], size=(6,)),
+        (samples - loc).ravel(),
+        atol=1e-12,
+    )
+    with pytest.raises(ValueError):
+        philox_sample("normal", key, [loc, 1.0], size=(3, 2))
+
+
+@pytest.mark.skipif(not config.cxx, reason="No C compiler")
+@pytest.mark.parametrize("size", [None, (4, 2, 3)])
+def test_c_code(size):
+    loc = tt.dmatrix("loc")
+    scale = tt.dvector("scale")
+    shape = tt.dvector("shape")
+    inputs = [loc, scale, shape]
+    values = [np.arange(6.0).reshape((2, 3)), [1.0, 2.0, 3.0], [0.3, 1.0, 4.0]]
+
+    def compile_samplers(linker):
+        # The `PhiloxRV`s read the flag `openmp` when they are created
+        rng = shared(np.random.RandomState(7))
+        outs = [
+            PhiloxRV("normal", 0, (0, 0), "floatX")(loc, scale, size=size, rng=rng),
+            PhiloxRV("gamma", 0, (0, 0), "floatX")(shape, 2.0, size=size, rng=rng),
+            PhiloxRV("bernoulli", 0, (0,), "int64")(scale / 4, size=size, rng=rng),
+        ]
+        return function(inputs, outs, mode=Mode(linker, optimizer=None))
+
+    py_res = compile_samplers("py")(*values)
+    for flags in ({}, dict(openmp=True, openmp_elemwise_minsize=1)):
+        with change_flags(**flags):
+            c_res = compile_samplers("c")(*values)
+        for c_val, py_val in zip(c_res, py_res):
+            assert c_val.dtype == py_val.dtype
+            np.testing.assert_allclose(c_val, py_val, rtol=1e-6)
+
+
+def test_generator_rng():
+    # `PhiloxRV` only needs a key, which a `Generator` also provides
+    rng = shared(np.random.Generator(np.random.Philox(3)))
+    out = normal(0, 1, size=(3,), rng=rng)
+    with change_flags(random__philox=True):
+        f = function([], out, mode=philox_mode)
+    key = philox_key(np.random.Generator(np.random.Philox(3)))
+    np.testing.assert_allclose(
+        f(), philox_sample("normal", key, [0.0, 1.0], (3,)), rtol=1e-6
+    )
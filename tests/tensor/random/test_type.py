@@ -6,7 +6,12 @@ import pytest
 
 from theano import shared
 from theano.compile.ops import ViewOp
-from theano.tensor.random.type import RandomStateType, random_state_type
+from theano.tensor.random.type import (
+    RandomGeneratorType,
+    RandomStateType,
+    random_generator_type,
+    random_state_type,
+)
 
 
 # @pytest.mark.skipif(
@@ -26,6 +31,7 @@ def test_view_op_c_code():
     # )
 
     assert ViewOp.c_code_and_version[RandomStateType]
+    assert ViewOp.c_code_and_version[RandomGeneratorType]
 
 
 class TestRandomStateType:
@@ -112,3 +118,44 @@ class TestRandomStateType:
         shape_info_c = random_state_type.get_shape_info(rng_var_c)
 
         assert random_state_type.may_share_memory(shape_info_b, shape_info_c) is True
+
+
+class TestRandomGeneratorType:
+    def test_repr(self):
+        assert repr(random_generator_type) == "RandomGeneratorType"
+
+    def test_filter(self):
+        rng = np.random.default_rng()
+        assert random_generator_type.filter(rng) is rng
+
+        with pytest.raises(TypeError):
+            random_generator_type.filter(np.random.RandomState())
+
+    def test_values_eq(self):
+        rng_a = np.random.Generator(np.random.Philox(12))
+        rng_b = np.random.Generator(np.random.Philox(12))
+        rng_c = np.random.Generator(np.random.Philox(123))
+        rng_d = np.random.Generator(np.random.PCG64(12))
+
+        assert random_generator_type.values_eq(rng_a, rng_b)
+        assert not random_generator_type.values_eq(rng_a, rng_c)
+        assert not random_generator_type.values_eq(rng_a, rng_d)
+
+        rng_b.random()
+        assert not random_generator_type.values_eq(rng_a, rng_b)
+
+    def test_may_share_memory(self):
+        bg = np.random.Philox(12)
+        rng_a = np.random.Generator(bg)
+        rng_b = np.random.Generator(bg)
+        rng_c = np.random.Generator(np.random.Philox(12))
+
+        assert random_generator_type.may_share_memory(rng_a, rng_b)
+        assert not random_generator_type.may_share_memory(rng_a, rng_c)
+
+    def test_shared(self):
+        rng = np.random.default_rng(3)
+        rng_var = shared(rng)
+        assert rng_var.type == random_generator_type
+        assert rng_var.get_value(borrow=True) is not rng
+        assert random_generator_type.values_eq(rng_var.get_value(), rng)
@@ -267,3 +267,52 @@ class TestSharedRandomStream:
             su2[0].set_value(su1[0].get_value())
 
         np.testing.assert_array_almost_equal(f1(), f2(), decimal=6)
+
+    def test_generator_streams(self):
+        random = RandomStream(seed=234, rng_ctor=np.random.Generator)
+        rv_u = random.uniform(0, 1, size=(2, 2))
+        rv_n = random.normal(0, 1, size=(2, 2))
+        rng_u = rv_u.rng.get_value(borrow=True)
+        assert isinstance(rng_u, np.random.Generator)
+        assert isinstance(rng_u.bit_generator, np.random.Philox)
+
+        # Each node gets its own child of the seed sequence
+        seed_seq = np.random.SeedSequence(234)
+        ref_u, ref_n = (
+            np.random.Generator(np.random.Philox(child)) for child in seed_seq.spawn(2)
+        )
+        f = function([], [rv_u, rv_n])
+        first_vals = f()
+        for u_val, n_val in (first_vals, f()):
+            np.testing.assert_allclose(u_val, ref_u.uniform(0, 1, size=(2, 2)))
+            np.testing.assert_allclose(n_val, ref_n.normal(0, 1, size=(2, 2)))
+
+        random.seed(234)
+        assert rv_u.rng.get_value(borrow=True) is not rng_u
+        np.testing.assert_allclose(f()[1], first_vals[1])
+
+        with pytest.raises(TypeError):
+            RandomStream(rng_ctor=np.random.Philox)
+
+    def test_generator_randint(self):
+        random = RandomStream(seed=1, rng_ctor=np.random.Generator)
+        out = random.randint(0, 10, size=(3,))
+        res = function([], out)()
+        assert res.shape == (3,)
+        assert np.all((0 <= res) & (res < 10))
+
+
+def test_split_rng():
+    random = RandomStream(seed=5, rng_ctor=np.random.Generator)
+    rngs = random.split_rng(3)
+    assert all(isinstance(r.bit_generator, np.random.Philox) for r in rngs)
+
+    draws = [r.random(4) for r in rngs + random.split_rng(2)]
+    for i, a in enumerate(draws):
+        for b in draws[i + 1 :]:
+            assert not np.allclose(a, b)
+
+    # The same seed gives the same generators
+    ref = RandomStream(seed=5, rng_ctor=np.random.Generator).split_rng(3)
+    for a, r_ref in zip(draws, ref):
+        np.testing.assert_array_equal(a, r_ref.random(4))
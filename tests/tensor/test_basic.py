@@ -1642,6 +1642,31 @@ def test_batched_dot_not_contiguous():
         check_first_dim(inverted)
 
 
+@pytest.mark.parametrize("small_size", [0, 16])
+def test_batched_dot_small_matrices(small_size):
+    # With small_size=16, the products are done by the small matrix loop
+    # instead of one BLAS call per matrix.
+    rng = np.random.RandomState(utt.fetch_seed())
+    with config.change_flags(blas__batched_dot_small_size=small_size):
+        X = tensor3()
+        W = tensor3()
+        f = function([X, W], batched_dot(X, W))
+
+    x = rng.rand(50, 4, 3).astype(config.floatX)
+    w = rng.rand(50, 3, 5).astype(config.floatX)
+    x_container = rng.rand(9, 100, 6).astype(config.floatX)
+    for x_, w_ in [
+        (x, w),
+        # Non contiguous inputs
+        (x_container.transpose(1, 0, 2)[::2, :8:2, ::2], w),
+        (x, w.transpose(0, 2, 1).copy().transpose(0, 2, 1)),
+        (x[::-1], w[:, :, ::-1]),
+    ]:
+        assert x_.shape == (50, 4, 3)
+        ref_result = np.asarray([np.dot(u, v) for u, v in zip(x_, w_)])
+        utt.assert_allclose(ref_result, f(x_, w_))
+
+
 def test_batched_tensordot():
     first = tt.tensor4("first")
     second = tt.tensor4("second")
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+import theano
+from theano.compile.mode import Mode
+from theano.configdefaults import config
+from theano.tensor import blas_calibration
+from theano.tensor.blas import Gemm, gemm_no_inplace
+from theano.tensor.blas_c import CGemv, CGer, cgemv_no_inplace, cger_no_inplace
+from theano.tensor.type import TensorType
+
+
+def reference(op_name, values):
+    if op_name == "gemm":
+        z, a, x, y, b = values
+        return b * z + a * np.dot(x, y)
+    elif op_name == "gemv":
+        y, a, A, x, b = values
+        return b * y + a * np.dot(A, x)
+    else:
+        A, a, x, y = values
+        return A + a * np.outer(x, y)
+
+
+def test_size_class():
+    bounds = blas_calibration.SIZE_CLASS_BOUNDS
+    assert blas_calibration.size_class(0) == 0
+    assert blas_calibration.size_class(bounds[0]) == 0
+    assert blas_calibration.size_class(bounds[0] + 1) == 1
+    assert blas_calibration.size_class(bounds[-1] * 10) == len(bounds)
+
+
+def test_blas_size():
+    assert blas_calibration.blas_size([np.zeros((3, 7)), 1.0, np.zeros(20)]) == 7
+    assert blas_calibration.blas_size([np.zeros(20)]) == 0
+
+
+def test_save_load_calibration(tmp_path, calibration):
+    path = str(tmp_path / blas_calibration.calibration.filename)
+    assert blas_calibration.calibration.load(path) == {}
+
+    gemm_key = blas_calibration.calibration_key("gemm", "float64")
+    ger_key = blas_calibration.calibration_key("ger", "float32")
+    blas_calibration.calibration.save({gemm_key: {0: "py", 1: "c"}}, path)
+    blas_calibration.calibration.save({gemm_key: {1: "py"}}, path)
+    table = blas_calibration.calibration.save({ger_key: {4: "c"}}, path)
+    assert blas_calibration.calibration.load(path) == table
+    assert table == {gemm_key: {0: "py", 1: "py"}, ger_key: {4: "c"}}
+    assert blas_calibration.calibration.get() == table
+
+    with open(path, "w") as f:
+        f.write("not json")
+    assert blas_calibration.calibration.load(path) == {}
+
+
+@pytest.mark.skipif(
+    not config.cxx or not config.blas__ldflags, reason="No C BLAS available"
+)
+@pytest.mark.parametrize(
+    "op_name, op, make_values",
+    [
+        (
+            "gemm",
+            gemm_no_inplace,
+            lambda rng, n: [rng.rand(n, 3), 0.5, rng.rand(n, 4), rng.rand(4, 3), 0.7],
+        ),
+        (
+            "gemv",
+            cgemv_no_inplace,
+            lambda rng, n: [rng.rand(n), 0.5, rng.rand(n, 4), rng.rand(4), 0.7],
+        ),
+        (
+            "ger",
+            cger_no_inplace,
+            lambda rng, n: [rng.rand(n, 4), 0.5, rng.rand(n), rng.rand(4)],
+        ),
+    ],
+)
+def test_dispatch(op_name, op, make_values, calibration, monkeypatch):
+    # Small problems use the Python implementation, big ones the C one.
+    blas_calibration.calibration.set(
+        {blas_calibration.calibration_key(op_name, "float64"): {0: "py"}}
+    )
+    calls = []
+    perform = type(op).perform
+
+    def counting_perform(self, *args):
+        calls.append(self)
+        return perform(self, *args)
+
+    monkeypatch.setattr(type(op), "perform", counting_perform)
+
+    rng = np.random.RandomState(42)
+    small = [np.asarray(v) for v in make_values(rng, 5)]
+    big = [np.asarray(v) for v in make_values(rng, 100)]
+    inputs = [TensorType("float64", (False,) * v.ndim)() for v in small]
+    out = op(*inputs)
+    with config.change_flags(blas__autotune=True):
+        f = theano.function(inputs, out, mode=Mode(optimizer=None))
+    (node,) = f.maker.fgraph.apply_nodes
+    assert isinstance(node.op, (Gemm, CGemv, CGer))
+    (thunk,) = f.fn.thunks
+    assert not hasattr(thunk, "cthunk")
+
+    for values, n_calls in ((small, 1), (big, 1), (small, 2)):
+        np.testing.assert_allclose(f(*values), reference(op_name, values))
+        assert len(calls) == n_calls
+
+
+@pytest.mark.skipif(
+    not config.cxx or not config.blas__ldflags, reason="No C BLAS available"
+)
+def test_dispatch_only_c(calibration):
+    blas_calibration.calibration.set(
+        {blas_calibration.calibration_key("gemv", "float64"): {0: "c", 4: "c"}}
+    )
+    inputs = [
+        TensorType("float64", bcast)()
+        for bcast in [(False,), (), (False, False), (False,), ()]
+    ]
+    with config.change_flags(blas__autotune=True):
+        f = theano.function(
+            inputs, cgemv_no_inplace(*inputs), mode=Mode(optimizer=None)
+        )
+    (thunk,) = f.fn.thunks
+    assert hasattr(thunk, "cthunk")
+
+
+@pytest.mark.skipif(
+    not config.cxx or not config.blas__ldflags, reason="No C BLAS available"
+)
+@pytest.mark.parametrize("op_name", ["gemm", "gemv", "ger"])
+def test_calibrate(op_name, calibration):
+    entry = blas_calibration.calibrate(
+        op_name, "float64", sizes=[4, 8, 100], n_repeat=1, save=False
+    )
+    assert set(entry) == {0, 2}
+    assert set(entry.values()) <= set(blas_calibration.PROVIDERS)
@@ -0,0 +1,31 @@
+import pytest
+
+from theano.tensor import calibration as calibration_module
+from theano.tensor.calibration import CalibrationTable, time_function
+
+
+def test_calibration_table(tmp_path):
+    table = CalibrationTable("test_table", lambda entry: {"n": int(entry["n"])})
+    try:
+        assert calibration_module.tables["test_table"] is table
+        assert table.filename == "test_table_calibration.json"
+        with pytest.raises(ValueError):
+            CalibrationTable("test_table", dict)
+
+        path = str(tmp_path / table.filename)
+        table.save({"a": {"n": 1}}, path)
+        assert table.save({"b": {"n": 2}}, path) == {"a": {"n": 1}, "b": {"n": 2}}
+        assert table.get() == table.load(path)
+
+        # Entries that can not be parsed invalidate the file
+        with open(path, "w") as f:
+            f.write('{"a": {"m": 1}}')
+        assert table.load(path) == {}
+    finally:
+        del calibration_module.tables["test_table"]
+
+
+def test_time_function():
+    calls = []
+    assert time_function(lambda x: calls.append(x), [3], 4) >= 0
+    assert calls == [3] * 5
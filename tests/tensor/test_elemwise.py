@@ -1399,3 +1399,83 @@ def test_not_implemented_elemwise_grad():
     # Verify that trying to use the not implemented gradient fails.
     with pytest.raises(theano.gradient.NullTypeGradError):
         tt.grad(test_op(x, 2), x)
+
+
+@pytest.mark.skipif(not theano.config.cxx, reason="G++ not available")
+class TestFloat16CCode:
+    # The VM linker makes a thunk per node, which falls back to Python for
+    # the ops that do not support float16 in C
+    mode = Mode(linker="cvm", optimizer="fast_run")
+
+    def check_c_thunks(self, f):
+        n_checked = 0
+        for node, thunk in zip(f.fn.nodes, f.fn.thunks):
+            if isinstance(node.op, (Elemwise, CAReduce)):
+                assert hasattr(thunk, "cthunk"), node
+                n_checked += 1
+        assert n_checked > 0
+
+    def check(self, inputs, output):
+        f = theano.function(inputs, output, mode=self.mode)
+        self.check_c_thunks(f)
+        f_py = theano.function(inputs, output, mode=Mode(linker="py"))
+        rng = np.random.RandomState(utt.fetch_seed())
+        vals = [
+            np.asarray(rng.uniform(-1, 2, size=(5, 7)[-i.ndim :]), dtype=i.dtype)
+            for i in inputs
+        ]
+        out = f(*vals)
+        assert out.dtype == output.dtype
+        utt.assert_allclose(f_py(*vals), out)
+
+    def test_elemwise(self):
+        x = tt.vector(dtype="float16")
+        y = tt.matrix(dtype="float16")
+        self.check([x], tt.exp(x) * 2 + x)
+        self.check([x, y], tt.tanh(y) * x)
+        self.check([x], x.astype("float64") + 1)
+        self.check([x], x > 0.5)
+        self.check([y], tt.cast(y.astype("float64") * 3, "float16"))
+
+    def test_reduce(self):
+        y = tt.matrix(dtype="float16")
+        self.check([y], y.sum(axis=0))
+        self.check([y], (y * y).sum())
+        self.check([y], y.max(axis=1))
+        self.check([y], y.min())
+        self.check([y], y.prod(axis=1))
+
+    def test_accumulate_in_float32(self):
+        # 4096 + 1 is not representable in float16
+        y = tt.vector(dtype="float16")
+        f = theano.function([y], y.sum(acc_dtype="float16"), mode=self.mode)
+        self.check_c_thunks(f)
+        assert f(np.ones(6000, dtype="float16")) == np.float16(6000)
+
+    def test_conversions(self):
+        x = tt.vector(dtype="float16")
+        f = theano.function(
+            [x],
+            [x.astype("float32"), (x.astype("float32") * 1).astype("float16")],
+            mode=Mode(linker="c", optimizer=None),
+        )
+        all_halfs = np.arange(2 ** 16, dtype="uint16").view("float16")
+        as_float32, as_float16 = f(all_halfs)
+        np.testing.assert_array_equal(as_float32, all_halfs.astype("float32"))
+        not_nan = ~np.isnan(all_halfs)
+        np.testing.assert_array_equal(
+            as_float16.view("uint16")[not_nan], all_halfs.view("uint16")[not_nan]
+        )
+
+        y = tt.vector(dtype="float32")
+        f = theano.function([y], y.astype("float16"), mode=Mode(linker="c"))
+        rng = np.random.RandomState(utt.fetch_seed())
+        vals = np.concatenate(
+            [
+                rng.randn(10000) * 10 ** rng.uniform(-9, 6, size=10000),
+                [65519, 65520, 1e6, -np.inf, 2 ** -25, 2 ** -24 * 1.5],
+            ]
+        ).astype("float32")
+        np.testing.assert_array_equal(
+            f(vals).view("uint16"), vals.astype("float16").view("uint16")
+        )
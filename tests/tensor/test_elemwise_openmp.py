@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import theano
+from theano import scalar
+from theano.compile.mode import Mode
+from theano.configdefaults import config
+from theano.graph.op import OpenMPOp
+from theano.tensor import elemwise_openmp
+from theano.tensor.elemwise import Elemwise
+from theano.tensor.type import TensorType
+
+
+def test_save_load_calibration(tmp_path, calibration):
+    path = str(tmp_path / elemwise_openmp.calibration.filename)
+    assert elemwise_openmp.calibration.load(path) == {}
+
+    add_key = elemwise_openmp.calibration_key(scalar.add, "float64")
+    exp_key = elemwise_openmp.calibration_key(scalar.exp, "float64")
+    elemwise_openmp.calibration.save(
+        {add_key: {"minsize": 1000, "num_threads": 2}}, path
+    )
+    table = elemwise_openmp.calibration.save(
+        {exp_key: {"minsize": 10, "num_threads": 0}}, path
+    )
+    assert elemwise_openmp.calibration.load(path) == table
+    assert table == {
+        add_key: {"minsize": 1000, "num_threads": 2},
+        exp_key: {"minsize": 10, "num_threads": 0},
+    }
+
+    with open(path, "w") as f:
+        f.write("not json")
+    assert elemwise_openmp.calibration.load(path) == {}
+
+
+def test_openmp_params(calibration):
+    elemwise_openmp.calibration.set(
+        {
+            elemwise_openmp.calibration_key(scalar.exp, "float32"): {
+                "minsize": 123,
+                "num_threads": 3,
+            }
+        }
+    )
+    default = (config.openmp_elemwise_minsize, 0)
+    with config.change_flags(openmp_elemwise_autotune=False):
+        assert elemwise_openmp.openmp_params(scalar.exp, "float32") == default
+    with config.change_flags(openmp_elemwise_autotune=True):
+        assert elemwise_openmp.openmp_params(scalar.exp, "float32") == (123, 3)
+        assert elemwise_openmp.openmp_params(scalar.exp, "float64") == default
+        assert elemwise_openmp.openmp_params(scalar.log, "float32") == default
+
+
+def test_omp_parallel_for():
+    assert elemwise_openmp.omp_parallel_for("n", 10) == (
+        "#pragma omp parallel for if(n >= 10)\n"
+    )
+    assert elemwise_openmp.omp_parallel_for("n", 10, 4) == (
+        "#pragma omp parallel for if(n >= 10) num_threads(4)\n"
+    )
+
+
+@pytest.mark.skipif(not config.cxx, reason="G++ not available")
+def test_elemwise_uses_calibration(calibration):
+    if not OpenMPOp.test_gxx_support():
+        pytest.skip("OpenMP not supported")
+    elemwise_openmp.calibration.set(
+        {
+            elemwise_openmp.calibration_key(scalar.add, "float64"): {
+                "minsize": 7,
+                "num_threads": 2,
+            }
+        }
+    )
+    x = TensorType("float64", (False,))()
+    y = TensorType("float64", (False, False))()
+    with config.change_flags(openmp_elemwise_autotune=True):
+        for inp in (x, y):
+            out = Elemwise(scalar.add, openmp=True)(inp, inp)
+            node = out.owner
+            assert ("openmp_params", 7, 2) in node.op.c_code_cache_version_apply(node)
+            f = theano.function([inp], out, mode=Mode(linker="c", optimizer=None))
+            val = np.arange(20.0).reshape((20,) + (1,) * (inp.ndim - 1))
+            val = np.tile(val, (1,) * (inp.ndim - 1) + (3,) * (inp.ndim - 1))
+            np.testing.assert_allclose(f(val), val + val)
+
+
+@pytest.mark.skipif(not config.cxx, reason="G++ not available")
+def test_calibrate(tmp_path, calibration):
+    if not OpenMPOp.test_gxx_support():
+        pytest.skip("OpenMP not supported")
+    entry = elemwise_openmp.calibrate(
+        scalar.exp,
+        "float64",
+        sizes=[16, 1024],
+        thread_counts=[0, 2],
+        n_repeat=1,
+        save=False,
+    )
+    assert entry["minsize"] in (16, 1024, 2048)
+    assert entry["num_threads"] in (0, 2)
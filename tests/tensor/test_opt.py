@@ -25,6 +25,7 @@ from theano.graph.opt import (
     out2in,
 )
 from theano.graph.optdb import Query
+from theano.ifelse import IfElse
 from theano.misc.safe_asarray import _asarray
 from theano.tensor import (
     AdvancedIncSubtensor,
@@ -58,7 +59,7 @@ from theano.tensor import (
     vectors,
 )
 from theano.tensor.basic import _convert_to_int8
-from theano.tensor.blas import Dot22, Gemv
+from theano.tensor.blas import Dot22, Gemm, Gemv
 from theano.tensor.blas_c import CGemv
 from theano.tensor.elemwise import DimShuffle, Elemwise, Prod
 from theano.tensor.nnet.sigm import softplus
@@ -66,6 +67,7 @@ from theano.tensor.opt import (
     Assert,
     MakeVector,
     Shape_i,
+    ShapeFeature,
     assert_op,
     local_add_specialize,
     local_canonicalize_alloc,
@@ -4027,6 +4029,82 @@ def test_local_subtensor_of_dot():
     assert check_stack_trace(f, ops_to_check="last")
 
 
+class TestLocalDotChainReorder:
+    def setup_method(self):
+        self.mode = compile.get_default_mode().including("local_dot_chain_reorder")
+        rng = np.random.RandomState(utt.fetch_seed())
+        self.a_val = rng.rand(40, 3).astype(config.floatX)
+        self.b_val = rng.rand(3, 40).astype(config.floatX)
+        self.c_val = rng.rand(40, 2).astype(config.floatX)
+        self.expected = np.dot(np.dot(self.a_val, self.b_val), self.c_val)
+
+    def test_order(self):
+        # Matrix chain from Cormen et al., Introduction to Algorithms
+        dims = [30, 35, 15, 5, 10, 20, 25]
+        tree = opt._dot_chain_order(dims)
+        assert tree == ((0, (1, 2)), ((3, 4), 5))
+        assert opt._dot_chain_cost(tree, dims) == 15125
+        assert opt._dot_chain_cost(((((((0, 1), 2), 3), 4), 5)), dims) == 40500
+
+    def test_static_shapes(self):
+        a, b, c = tt.matrices("abc")
+        out = tt.nlinalg.matrix_dot(
+            tt.specify_shape(a, (40, 3)),
+            tt.specify_shape(b, (3, 40)),
+            tt.specify_shape(c, (40, 2)),
+        )
+        f = function([a, b, c], out, mode=self.mode)
+        utt.assert_allclose(f(self.a_val, self.b_val, self.c_val), self.expected)
+        # The product of b and c is done first
+        root = f.maker.fgraph.outputs[0].owner
+        assert isinstance(root.op, (tt.Dot, Dot22))
+        assert isinstance(root.inputs[1].owner.op, (tt.Dot, Dot22))
+        assert check_stack_trace(f, ops_to_check=(tt.Dot, Dot22))
+
+    def test_already_optimal(self):
+        a, b, c = tt.matrices("abc")
+        out = tt.dot(
+            tt.specify_shape(a, (40, 3)),
+            tt.dot(tt.specify_shape(b, (3, 40)), tt.specify_shape(c, (40, 2))),
+        )
+        fgraph = FunctionGraph([a, b, c], [out])
+        fgraph.attach_feature(ShapeFeature())
+        node = fgraph.outputs[0].owner
+        assert not opt.local_dot_chain_reorder.transform(fgraph, node)
+
+    def test_shared_intermediate(self):
+        # The intermediate product is used elsewhere, it is not recomputed.
+        a, b, c = tt.matrices("abc")
+        a = tt.specify_shape(a, (40, 3))
+        ab = tt.dot(a, tt.specify_shape(b, (3, 40)))
+        out = tt.dot(ab, tt.specify_shape(c, (40, 2)))
+        fgraph = FunctionGraph([a.owner.inputs[0], b, c], [out, ab], clone=False)
+        fgraph.attach_feature(ShapeFeature())
+        assert not opt.local_dot_chain_reorder.transform(fgraph, out.owner)
+
+    def test_symbolic_shapes(self):
+        a, b, c = tt.matrices("abc")
+        out = tt.nlinalg.matrix_dot(a, b, c)
+        # Only reordered at run time on request
+        f = function([a, b, c], out, mode=self.mode)
+        assert not any(isinstance(n.op, IfElse) for n in f.maker.fgraph.toposort())
+
+        mode = self.mode.including("local_dot_chain_reorder_ifelse")
+        f = function([a, b, c], out, mode=mode)
+        assert any(isinstance(n.op, IfElse) for n in f.maker.fgraph.toposort())
+        assert check_stack_trace(f, ops_to_check=(tt.Dot, Dot22))
+        utt.assert_allclose(f(self.a_val, self.b_val, self.c_val), self.expected)
+        # The other order is the cheapest
+        a_val, b_val, c_val = self.c_val.T, self.b_val.T, self.a_val.T
+        utt.assert_allclose(f(a_val, b_val, c_val), np.dot(a_val, np.dot(b_val, c_val)))
+
+    def test_gemm_fusion(self):
+        # Chains with symbolic shapes are left to the BLAS optimizations
+        a, b, c, z = tt.matrices("abcz")
+        f = function([a, b, c, z], z + tt.dot(tt.dot(a, b), c), mode=self.mode)
+        assert any(isinstance(n.op, Gemm) for n in f.maker.fgraph.toposort())
+
+
 class TestLocalElemwiseAlloc:
     dtype = config.floatX
 
@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+import theano
+import theano.tensor as tt
+from tests import unittest_tools as utt
+from theano.configdefaults import config
+from theano.graph.vectorize import vectorize_graph
+from theano.scan.op import Scan
+from theano.tensor.blas import BatchedDot
+
+
+def check_vectorize(outputs, inputs, batch_values, other_inputs=(), other_values=()):
+    # Compare the vectorized graph to one call per example
+    batches = [tt.TensorType(config.floatX, (False,) * (x.ndim + 1))() for x in inputs]
+    batch_outputs = theano.vectorize(outputs, dict(zip(inputs, batches)))
+    f_batch = theano.function(list(batches) + list(other_inputs), batch_outputs)
+    f_example = theano.function(list(inputs) + list(other_inputs), outputs)
+    assert not any(
+        isinstance(node.op, Scan) for node in f_batch.maker.fgraph.apply_nodes
+    )
+
+    results = f_batch(*batch_values, *other_values)
+    for i in range(len(batch_values[0])):
+        expected = f_example(*[v[i] for v in batch_values], *other_values)
+        for res, exp in zip(results, expected):
+            utt.assert_allclose(res[i], exp)
+    return f_batch
+
+
+def random_values(*shapes):
+    rng = np.random.RandomState(utt.fetch_seed())
+    return [rng.rand(*shape).astype(config.floatX) for shape in shapes]
+
+
+def test_elemwise_reduce_dimshuffle():
+    x = tt.vector("x")
+    y = tt.matrix("y")
+    w = tt.vector("w")
+    outputs = [tt.exp(x) * w + y.T.sum(axis=1), (x * y).sum(), y.max(axis=0)]
+    check_vectorize(
+        outputs, [x, y], random_values((5, 3), (5, 3, 3)), [w], random_values((3,))
+    )
+
+
+@pytest.mark.parametrize(
+    "x_shape, y_shape, batched",
+    [
+        ((3, 4), (4, 2), (True, True)),
+        ((3, 4), (4,), (True, True)),
+        ((4,), (4,), (True, True)),
+        ((3, 4), (4, 2), (True, False)),
+        ((3, 4), (4, 2), (False, True)),
+        ((4,), (4, 2), (False, True)),
+    ],
+)
+def test_dot(x_shape, y_shape, batched):
+    x = tt.TensorType(config.floatX, (False,) * len(x_shape))("x")
+    y = tt.TensorType(config.floatX, (False,) * len(y_shape))("y")
+    inputs = [v for v, b in zip([x, y], batched) if b]
+    others = [v for v, b in zip([x, y], batched) if not b]
+    shapes = [(6,) + s for s, b in zip([x_shape, y_shape], batched) if b]
+    other_shapes = [s for s, b in zip([x_shape, y_shape], batched) if not b]
+    f = check_vectorize(
+        [tt.dot(x, y)],
+        inputs,
+        random_values(*shapes),
+        others,
+        random_values(*other_shapes),
+    )
+    if all(batched) and len(x_shape) == len(y_shape) == 2:
+        assert any(
+            isinstance(node.op, BatchedDot) for node in f.maker.fgraph.apply_nodes
+        )
+
+
+def test_subtensor_and_shape():
+    x = tt.matrix("x")
+    i = tt.lscalar("i")
+    outputs = [x[1:, ::2], x[0], x.reshape((x.shape[1], x.shape[0])) + x.shape[0]]
+    check_vectorize(outputs, [x], random_values((4, 3, 5)))
+
+    # Batched indices become advanced indexing
+    idx = tt.lvector("idx")
+    m = tt.matrix("m")
+    batch_m = tt.tensor3("batch_m")
+    out = theano.vectorize([m[i, 1:], x[i]], {i: idx, m: batch_m})
+    f = theano.function([idx, batch_m, x], out)
+    m_val, x_val = random_values((4, 3, 5), (3, 5))
+    idx_val = np.array([2, 0, 1, 2])
+    res_m, res_x = f(idx_val, m_val, x_val)
+    utt.assert_allclose(res_m, m_val[np.arange(4), idx_val, 1:])
+    utt.assert_allclose(res_x, x_val[idx_val])
+
+
+def test_reduce_props():
+    # The vectorized reductions keep the props of the original ones
+    x = tt.matrix("x")
+    X = tt.tensor3("X")
+    outputs = [
+        x.sum(axis=1, dtype="float64", acc_dtype="float64"),
+        tt.prod(x, axis=0, no_zeros_in_input=True),
+        tt.basic.Max(axis=1)(x),
+        tt.mean(x, axis=0, op=True),
+        tt.all(x),
+    ]
+    for out, batch_out in zip(outputs, theano.vectorize(outputs, {x: X})):
+        op, batch_op = out.owner.op, batch_out.owner.op
+        assert type(batch_op) is type(op)
+        assert batch_op.scalar_op == op.scalar_op
+        assert batch_out.dtype == out.dtype
+    assert outputs[0].owner.op.acc_dtype == "float64"
+    assert theano.vectorize(outputs[1], {x: X}).owner.op.no_zeros_in_input
+    assert theano.vectorize(outputs[2], {x: X}).owner.op.axis == (2,)
+
+    (X_val,) = random_values((2, 3, 4))
+    f = theano.function([X], theano.vectorize(outputs, {x: X}))
+    for res, exp in zip(f(X_val), theano.function([x], outputs)(X_val[1])):
+        utt.assert_allclose(res[1], exp)
+
+
+def test_unbatched_output():
+    x = tt.vector("x")
+    w = tt.vector("w")
+    out = theano.vectorize([x + w, w * 2], {x: tt.matrix("X")})
+    assert out[1].ndim == 2
+
+
+def test_batch_axes():
+    x = tt.vector("x")
+    X = tt.matrix("X")
+    out = theano.vectorize(x.sum(), {x: X}, batch_axes=1)
+    (X_val,) = random_values((3, 5))
+    utt.assert_allclose(theano.function([X], out)(X_val), X_val.sum(axis=0))
+
+    with pytest.raises(TypeError):
+        theano.vectorize(x.sum(), {x: tt.tensor3()})
+
+
+def test_no_rule():
+    x = tt.vector("x")
+    with pytest.raises(NotImplementedError):
+        theano.vectorize(tt.sort(x), {x: tt.matrix()})
+
+
+def test_vectorize_graph_batched_flags():
+    x = tt.vector("x")
+    w = tt.vector("w")
+    new_w = tt.vector("new_w")
+    X = tt.matrix("X")
+    (out_x, out_w, out_shape), batched = vectorize_graph(
+        [x * w, w + 1, x.shape], {x: X, w: new_w}, [x]
+    )
+    assert batched == [True, False, False]
+    assert new_w in out_w.owner.inputs
@@ -95,6 +95,7 @@ from theano.compile import (
 from theano.compile.function import function, function_dump
 from theano.compile.function.types import FunctionMaker
 from theano.gradient import Lop, Rop, grad, subgraph_grad
+from theano.graph.vectorize import vectorize
 from theano.printing import pp, pprint
 from theano.updates import OrderedUpdates
 
@@ -20,6 +20,7 @@ from theano.graph.optdb import EquilibriumDB, LocalGroupDB, Query, SequenceDB, T
 from theano.link.basic import PerformLinker
 from theano.link.c.basic import CLinker, OpWiseCLinker
 from theano.link.jax import JAXLinker
+from theano.link.numba import NumbaLinker
 from theano.link.vm import VMLinker
 
 
@@ -39,6 +40,7 @@ predefined_linkers = {
     "vm_nogc": VMLinker(allow_gc=False, use_cloop=False),
     "cvm_nogc": VMLinker(allow_gc=False, use_cloop=True),
     "jax": JAXLinker(),
+    "numba": NumbaLinker(),
 }
 
 
@@ -417,12 +419,16 @@ else:
     FAST_RUN = Mode("vm", "fast_run")
 
 JAX = Mode(JAXLinker(), Query(include=["fast_run"], exclude=["cxx_only", "BlasOpt"]))
+NUMBA = Mode(
+    NumbaLinker(), Query(include=["fast_run"], exclude=["cxx_only", "BlasOpt"])
+)
 
 
 predefined_modes = {
     "FAST_COMPILE": FAST_COMPILE,
     "FAST_RUN": FAST_RUN,
     "JAX": JAX,
+    "NUMBA": NUMBA,
 }
 
 instantiated_default_mode = None
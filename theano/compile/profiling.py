@@ -1503,6 +1503,38 @@ class ProfileStats:
         self.print_extra(file)
         self.print_tips(file)
 
+    def as_dict(self):
+        """
+        Return the main statistics as a dict of built-in types.
+
+        This is meant to export profiles, e.g. to JSON, and compare them
+        outside of Theano. The Apply nodes are sorted by decreasing time.
+
+        """
+        nodes = []
+        for (fgraph, node), t in sorted(
+            self.apply_time.items(), key=operator.itemgetter(1), reverse=True
+        ):
+            nodes.append(
+                {
+                    "node": str(node),
+                    "op": str(node.op),
+                    "time": t,
+                    "callcount": self.apply_callcount.get((fgraph, node), 0),
+                    "c_impl": bool(self.apply_cimpl.get(node, False)),
+                }
+            )
+        return {
+            "message": self.message,
+            "compile_time": self.compile_time,
+            "optimizer_time": self.optimizer_time,
+            "linker_time": self.linker_time,
+            "fct_callcount": self.fct_callcount,
+            "fct_call_time": self.fct_call_time,
+            "vm_call_time": self.vm_call_time,
+            "nodes": nodes,
+        }
+
     def print_tips(self, file):
         print(
             """Here are tips to potentially make your code run faster
@@ -1735,9 +1767,48 @@ class ScanProfileStats(ProfileStats):
     nbsteps = 0.0
     call_time = 0.0
 
+    copy_time = 0.0
+    # Part of the overhead spent copying the outputs of the steps, only
+    # measured with profiling__scan_steps
+    #
+
+    step_time_hist = None
+    # dict from a power of 2 of microseconds to the number of iterations
+    # that took at most that time, but more than the previous power of 2.
+    # Only filled with profiling__scan_steps.
+    #
+
+    step_time_min = np.inf
+    step_time_max = 0.0
+    step_time_sum = 0.0
+
     def __init__(self, atexit_print=True, name=None, **kwargs):
         super().__init__(atexit_print, **kwargs)
         self.name = name
+        self.step_time_hist = {}
+
+    def record_steps(self, step_times, copy_time):
+        """Accumulate the times of the iterations of one call of the Scan."""
+        self.copy_time += copy_time
+        for t in step_times:
+            bucket = 2 ** max(0, int(np.ceil(np.log2(max(t, 1e-9) * 1e6))))
+            self.step_time_hist[bucket] = self.step_time_hist.get(bucket, 0) + 1
+            self.step_time_min = min(self.step_time_min, t)
+            self.step_time_max = max(self.step_time_max, t)
+            self.step_time_sum += t
+
+    def as_dict(self):
+        rval = super().as_dict()
+        rval.update(
+            name=self.name,
+            callcount=self.callcount,
+            nbsteps=self.nbsteps,
+            call_time=self.call_time,
+            overhead_time=self.call_time - self.vm_call_time,
+            copy_time=self.copy_time,
+            step_time_hist=dict(sorted(self.step_time_hist.items())),
+        )
+        return rval
 
     def summary_globals(self, file):
         # Do nothing, we don't want to print extra global summary
@@ -1785,4 +1856,28 @@ class ScanProfileStats(ProfileStats):
             f"  Total overhead (computing slices..) {self.call_time - self.vm_call_time:e}s ({val:.3f}%)",
             file=file,
         )
+        if self.step_time_hist:
+            val = 0
+            if self.call_time > 0:
+                val = self.copy_time * 100 / self.call_time
+            print(
+                f"    of which copying the step outputs {self.copy_time:e}s "
+                f"({val:.3f}%)",
+                file=file,
+            )
+            n_steps = sum(self.step_time_hist.values())
+            print("", file=file)
+            print(
+                f"  Time per iteration ({n_steps} iterations): "
+                f"min {self.step_time_min:e}s, "
+                f"mean {self.step_time_sum / n_steps:e}s, "
+                f"max {self.step_time_max:e}s",
+                file=file,
+            )
+            for bucket, count in sorted(self.step_time_hist.items()):
+                print(
+                    f"    <= {bucket:>8d}us: {count:>8d} "
+                    f"({count * 100.0 / n_steps:5.1f}%)",
+                    file=file,
+                )
         print("", file=file)
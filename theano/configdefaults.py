@@ -107,6 +107,7 @@ def _filter_mode(val):
         "FAST_COMPILE",
         "DEBUG_MODE",
         "JAX",
+        "NUMBA",
     ]
     if val in str_options:
         return val
@@ -665,7 +666,8 @@ def add_compile_configvars():
             "linker",
             "Default linker used if the theano flags mode is Mode",
             EnumStr(
-                "cvm", ["c|py", "py", "c", "c|py_nogc", "vm", "vm_nogc", "cvm_nogc"]
+                "cvm",
+                ["c|py", "py", "c", "c|py_nogc", "vm", "vm_nogc", "cvm_nogc", "numba"],
             ),
             in_c_key=False,
         )
@@ -675,7 +677,7 @@ def add_compile_configvars():
         config.add(
             "linker",
             "Default linker used if the theano flags mode is Mode",
-            EnumStr("vm", ["py", "vm_nogc"]),
+            EnumStr("vm", ["py", "vm_nogc", "numba"]),
             in_c_key=False,
         )
         if type(config).cxx.is_default:
@@ -865,6 +867,24 @@ def add_tensor_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "random__philox",
+        "If True, the univariate random variables that have a Philox "
+        "implementation are sampled with it in fast_run mode, in C and in "
+        "parallel with OpenMP.  Their samples differ from NumPy's.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
+    config.add(
+        "random__lift_transforms",
+        "If True, affine transforms and comparisons of random variables are "
+        "folded into the random variables in fast_run mode.  The samples "
+        "drawn from a given seed change.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
     config.add(
         "tensor__insert_inplace_optimizer_validate_nb",
         "-1: auto, if graph have less then 500 nodes 1, else 10",
@@ -1220,6 +1240,14 @@ def add_testvalue_and_checking_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "profiling__scan_steps",
+        """Profiled Scans record the time of each iteration and the time
+                 spent copying the step outputs""",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
     config.add(
         "on_shape_error",
         "warn: print a warning and use the default" " value. raise: raise an error",
@@ -1283,6 +1311,16 @@ def add_multiprocessing_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "openmp_elemwise_autotune",
+        "If True, element wise ops use the OpenMP minimum size and number "
+        "of threads measured for their scalar op on this machine by "
+        "theano.tensor.elemwise_openmp.calibrate, when available, "
+        "instead of openmp_elemwise_minsize.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
 
 def add_optimizer_configvars():
     config.add(
@@ -1412,6 +1450,22 @@ def add_vm_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "numba__cache",
+        "If True, the functions compiled by the Numba linker are saved in "
+        "the compiledir, so that they are reused by later processes",
+        BoolParam(True),
+        in_c_key=False,
+    )
+
+    config.add(
+        "jax__compilation_cache",
+        "If True, the JAX linker keeps the functions compiled by XLA in the "
+        "compiledir, so that they are reused by later processes",
+        BoolParam(True),
+        in_c_key=False,
+    )
+
 
 def add_deprecated_configvars():
     # TODO: remove this?
@@ -1614,6 +1668,25 @@ def add_scan_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "scan__while_growth",
+        "If True, the outputs of Scans with a stopping condition start with a "
+        "small buffer that is doubled when full, instead of one holding the "
+        "maximal number of steps (default: False)",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
+    config.add(
+        "scan__group_loop_invariants",
+        "If True, the terms of sums and products in a Scan that are the same "
+        "at every step are regrouped, so they are computed once outside of "
+        "the loop. This reassociates floating point operations, which can "
+        "change the results slightly (default: False)",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
     config.add(
         "scan__debug",
         "If True, enable extra verbose output related to scan",
@@ -1172,6 +1172,14 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
                     else:
                         new_output_grads.append(og)
 
+                # Sparse gradients of dense outputs (see `theano.sparse_grad`)
+                # only stay sparse up to the variables they are computed for.
+                # The `Op.grad` of a dense output expects a dense gradient.
+                new_output_grads = [
+                    _dense_output_grad(o, og)
+                    for o, og in zip(node.outputs, new_output_grads)
+                ]
+
                 # Make sure that, if new_output_grads[i] has a floating point
                 # dtype, it is the same dtype as outputs[i]
                 for o, ng in zip(node.outputs, new_output_grads):
@@ -1442,6 +1450,19 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
     return rval
 
 
+def _is_sparse(var):
+    # `theano.sparse` is only loaded when sparse variables can exist
+    sparse = getattr(theano, "sparse", None)
+    return sparse is not None and isinstance(var.type, sparse.SparseType)
+
+
+def _dense_output_grad(output, grad):
+    """Return the gradient of the dense `output` of an `Op` as a dense variable."""
+    if _is_sparse(grad) and isinstance(output.type, theano.tensor.TensorType):
+        return theano.sparse.dense_from_sparse(grad)
+    return grad
+
+
 def _float_zeros_like(x):
     """Like zeros_like, but forces the object to have a
     a floating point dtype"""
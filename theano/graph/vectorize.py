@@ -0,0 +1,171 @@
+"""
+Vectorization of graphs over a batch axis.
+
+`vectorize` rewrites a graph that computes one example into a graph that
+computes a whole batch of examples at once, without a `Scan`.  Each `Op`
+that depends on the batched inputs is replaced by its batched form, which
+is given by the rule registered for the `Op` with `vectorize_node`.  For
+example, `Elemwise` broadcasts over the batch axis and `Dot` becomes
+`BatchedDot`.  The rules of the tensor `Op`s are in
+`theano.tensor.vectorize`.
+
+"""
+
+from functools import singledispatch
+
+from theano.graph.basic import Variable, io_toposort
+
+
+@singledispatch
+def vectorize_node(op, node, inputs, batched):
+    """
+    Return the outputs of `node` computed on a batch of examples.
+
+    Parameters
+    ----------
+    op : Op
+        The `Op` of `node`, used to dispatch to the rule registered for it.
+    node : Apply
+        The node computing one example.
+    inputs : list of Variable
+        The replacements of the inputs of `node`.  Those for which `batched`
+        is True have a leading batch axis, the others are the same for all
+        examples.
+    batched : list of bool
+        Which of `inputs` have a batch axis.  At least one of them has.
+
+    Returns
+    -------
+    list of Variable
+        The replacements of the outputs of `node`.  An output is batched
+        when it has one more dimension than the output it replaces.
+
+    Raises
+    ------
+    NotImplementedError
+        When `op` has no batched form for these inputs.
+
+    """
+    raise NotImplementedError(f"No vectorization rule for the given `Op`: {op}")
+
+
+def vectorize_graph(outputs, replace, batched_inputs):
+    """
+    Replace variables in the graph of `outputs`, some of them by batches.
+
+    Parameters
+    ----------
+    outputs : list of Variable
+        The outputs of the graph.
+    replace : dict
+        Mapping from variables of the graph to their replacements.
+    batched_inputs : collection of Variable
+        The keys of `replace` whose replacements have a leading batch axis.
+
+    Returns
+    -------
+    new_outputs : list of Variable
+        The replacements of `outputs`.
+    batched : list of bool
+        Which of `new_outputs` have a leading batch axis.
+
+    Raises
+    ------
+    NotImplementedError
+        When a node depending on a batched input has no batched form.
+
+    """
+    givens = dict(replace)
+    batched = {var: True for var in batched_inputs}
+    for node in io_toposort(list(replace), outputs):
+        new_inputs = [givens.get(x, x) for x in node.inputs]
+        node_batched = [batched.get(x, False) for x in node.inputs]
+        if not any(node_batched):
+            if all(new is old for new, old in zip(new_inputs, node.inputs)):
+                continue
+            new_outputs = node.clone_with_new_inputs(new_inputs, strict=False).outputs
+        else:
+            new_outputs = vectorize_node(node.op, node, new_inputs, node_batched)
+        for out, new_out in zip(node.outputs, new_outputs):
+            givens[out] = new_out
+            batched[out] = getattr(new_out.type, "ndim", 0) == (
+                getattr(out.type, "ndim", 0) + 1
+            )
+    return (
+        [givens.get(out, out) for out in outputs],
+        [batched.get(out, False) for out in outputs],
+    )
+
+
+def vectorize(outputs, inputs, batch_axes=0):
+    """
+    Vectorize the graph of `outputs` over a batch axis.
+
+    Parameters
+    ----------
+    outputs : Variable or list of Variable
+        The outputs of a graph computing one example.
+    inputs : dict
+        Mapping from the inputs of that graph that change between examples
+        to the variables holding the whole batch.
+    batch_axes : int or list of int
+        The batch axis of the variables holding the batch, one per item of
+        `inputs` or the same for all.
+
+    Returns
+    -------
+    Variable or list of Variable
+        The outputs computed for the whole batch, with the batch axis first.
+        Outputs that do not depend on `inputs` are repeated along it.
+
+    Raises
+    ------
+    NotImplementedError
+        When the graph contains an `Op` without batched form.
+
+    Examples
+    --------
+    >>> x = tt.vector("x")
+    >>> W = tt.matrix("W")
+    >>> y = tt.tanh(tt.dot(W, x))
+    >>> X = tt.matrix("X")
+    >>> Y = theano.vectorize(y, {x: X})  # Y[i] == tanh(dot(W, X[i]))
+
+    """
+    import theano.tensor as tt
+
+    single_output = isinstance(outputs, Variable)
+    if single_output:
+        outputs = [outputs]
+    if isinstance(batch_axes, int):
+        batch_axes = [batch_axes] * len(inputs)
+    if len(batch_axes) != len(inputs):
+        raise ValueError("`batch_axes` must have one axis per input")
+
+    replace = {}
+    for (var, batch), axis in zip(inputs.items(), batch_axes):
+        batch = tt.as_tensor_variable(batch)
+        if batch.ndim != var.ndim + 1:
+            raise TypeError(
+                f"The batch of {var} must have {var.ndim + 1} dimensions,"
+                f" got {batch.ndim}"
+            )
+        if axis < 0:
+            axis += batch.ndim
+        if axis != 0:
+            batch = batch.dimshuffle(axis, *[i for i in range(batch.ndim) if i != axis])
+        replace[var] = batch
+    if not replace:
+        raise ValueError("`inputs` must contain at least one variable")
+
+    new_outputs, batched = vectorize_graph(outputs, replace, list(replace))
+    batch_size = next(iter(replace.values())).shape[0]
+    new_outputs = [
+        out
+        if is_batched
+        else tt.alloc(out, batch_size, *[out.shape[i] for i in range(out.ndim)])
+        for out, is_batched in zip(new_outputs, batched)
+    ]
+    if single_output:
+        return new_outputs[0]
+    return new_outputs
@@ -1,11 +1,18 @@
 import typing
+import warnings
 from copy import copy, deepcopy
 
 from theano.configdefaults import config
-from theano.graph.basic import Apply
+from theano.graph.basic import Apply, Constant
 from theano.graph.fg import FunctionGraph
 from theano.graph.type import CType
-from theano.link.utils import gc_helper, map_storage, raise_with_op, streamline
+from theano.link.utils import (
+    gc_helper,
+    map_storage,
+    partition_nodes,
+    raise_with_op,
+    streamline,
+)
 from theano.utils import deprecated, difference, to_return_values
 
 
@@ -419,6 +426,213 @@ class PerformLinker(LocalLinker):
         )
 
 
+class JITLinker(PerformLinker):
+    """
+    Base class of the `Linker`s that compile regions of the graph to a
+    single function with another library, like JAX or Numba.
+
+    The nodes are split in regions by `partition_nodes`. Each region of
+    nodes supported by the library becomes one thunk made by
+    `create_region_thunk`, and the other nodes use their usual C or Python
+    thunks.
+
+    Subclasses implement `check_node` and `create_region_thunk`.
+
+    Attributes
+    ----------
+    allow_fallback: bool
+        Whether the nodes that the library can not compile use their usual
+        thunks. If False, such a node makes `make_all` raise the
+        `NotImplementedError` of `check_node`.
+
+    """
+
+    allow_fallback = False
+
+    def check_node(self, node):
+        """Raise `NotImplementedError` if `node` can not be compiled."""
+        raise NotImplementedError()
+
+    def create_region_thunk(self, nodes, compute_map, storage_map, compiled_nodes):
+        """
+        Create a single thunk computing a region of the graph.
+
+        Parameters
+        ----------
+        nodes: list of Apply
+            The nodes of the region, in a topological order.
+        compute_map: dict
+            The compute map dictionary.
+        storage_map: dict
+            The storage map dictionary.
+        compiled_nodes: set of Apply
+            The nodes of the graph that are compiled, in this region or in
+            others.
+
+        Returns
+        -------
+        thunk: callable
+            The thunk.
+        inputs: list of Variable
+            The inputs of the region.
+        outputs: list of Variable
+            The outputs of the region used outside of it.
+
+        """
+        raise NotImplementedError()
+
+    def region_io(self, nodes, compiled_nodes):
+        """
+        Return the inputs and outputs of a region of the graph.
+
+        Returns
+        -------
+        inputs: list of Variable
+            The variables used by `nodes` that are not constants and are not
+            computed in the region.
+        outputs: list of Variable
+            The outputs of `nodes` used outside of the region.
+        external: list of bool
+            For each of `outputs`, whether it is used by nodes that are not
+            compiled, or is an update in a graph with such nodes.
+
+        """
+        fgraph = self.fgraph
+        node_set = set(nodes)
+        hybrid = len(compiled_nodes) < len(fgraph.apply_nodes)
+        update_outputs = set()
+        if fgraph.update_mapping:
+            update_outputs = {fgraph.outputs[i] for i in fgraph.update_mapping}
+        inputs = []
+        outputs = []
+        external = []
+        for node in nodes:
+            for i in node.inputs:
+                if (
+                    i.owner not in node_set
+                    and not isinstance(i, Constant)
+                    and i not in inputs
+                ):
+                    inputs.append(i)
+            for o in node.outputs:
+                clients = [c for c, _ in fgraph.clients[o] if c not in node_set]
+                if clients:
+                    outputs.append(o)
+                    external.append(
+                        (o in update_outputs and hybrid)
+                        or any(
+                            c != "output" and c not in compiled_nodes for c in clients
+                        )
+                    )
+        return inputs, outputs, external
+
+    def make_all(self, input_storage=None, output_storage=None, storage_map=None):
+        fgraph = self.fgraph
+        nodes = self.schedule(fgraph)
+        no_recycling = self.no_recycling
+
+        input_storage, output_storage, storage_map = map_storage(
+            fgraph, nodes, input_storage, output_storage, storage_map
+        )
+
+        compute_map = {}
+        for k in storage_map:
+            compute_map[k] = [k.owner is None]
+
+        unsupported = {}
+
+        def is_compiled(node):
+            try:
+                self.check_node(node)
+            except NotImplementedError as e:
+                if not self.allow_fallback:
+                    raise
+                unsupported.setdefault(type(node.op).__name__, e)
+                return False
+            return True
+
+        regions = partition_nodes(nodes, is_compiled, fgraph.orderings())
+        compiled_nodes = {
+            node for compiled, region in regions if compiled for node in region
+        }
+
+        if unsupported:
+            warnings.warn(
+                f"{type(self).__name__} could not compile the Ops "
+                f"{', '.join(sorted(unsupported))}, which use their C or Python "
+                f"implementation: {list(unsupported.values())[0]}"
+            )
+
+        thunks = []
+        order = []
+        # The inputs and outputs of each thunk, for the garbage collection
+        thunks_io = []
+        for compiled, region in regions:
+            if compiled:
+                thunk, inputs, outputs = self.create_region_thunk(
+                    region, compute_map, storage_map, compiled_nodes
+                )
+                thunks.append(thunk)
+                order.append(region[-1])
+                thunks_io.append((inputs, outputs))
+                continue
+            for node in region:
+                thunk = node.op.make_thunk(node, storage_map, compute_map, no_recycling)
+                thunk.inputs = [storage_map[v] for v in node.inputs]
+                thunk.outputs = [storage_map[v] for v in node.outputs]
+                thunks.append(thunk)
+                order.append(node)
+                thunks_io.append((node.inputs, node.outputs))
+
+        if self.allow_gc:
+            computed = {o for _, outs in thunks_io for o in outs}
+            last_user = {}
+            for i, (ins, _) in enumerate(thunks_io):
+                for v in ins:
+                    last_user[v] = i
+            post_thunk_old_storage = [
+                [
+                    storage_map[v]
+                    for v in ins
+                    if v in computed and v not in fgraph.outputs and last_user[v] == i
+                ]
+                for i, (ins, _) in enumerate(thunks_io)
+            ]
+        else:
+            post_thunk_old_storage = None
+
+        if no_recycling is True:
+            no_recycling = list(storage_map.values())
+            no_recycling = difference(no_recycling, input_storage)
+        else:
+            no_recycling = [
+                storage_map[r] for r in no_recycling if r not in fgraph.inputs
+            ]
+
+        fn = streamline(
+            fgraph, thunks, order, post_thunk_old_storage, no_recycling=no_recycling
+        )
+
+        fn.allow_gc = self.allow_gc
+        fn.storage_map = storage_map
+        fn.thunks = thunks
+        fn.nodes = order
+
+        return (
+            fn,
+            [
+                Container(input, storage)
+                for input, storage in zip(fgraph.inputs, input_storage)
+            ],
+            [
+                Container(output, storage, readonly=True)
+                for output, storage in zip(fgraph.outputs, output_storage)
+            ],
+            thunks,
+            order,
+        )
+
+
 class WrapLinker(Linker):
     """
     This class makes it easier to run several L{LocalLinker}s in parallel, and
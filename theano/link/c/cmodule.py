@@ -2850,6 +2850,26 @@ def add_blas_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "blas__batched_dot_small_size",
+        "BatchedDot computes the products of matrices whose dimensions are "
+        "all smaller or equal to this value with a specialized loop instead "
+        "of one BLAS gemm call per matrix. 0 disables it. "
+        "See theano/misc/check_batched_dot.py to measure the crossover.",
+        theano.configparser.IntParam(16, lambda i: i >= 0),
+        # Added in the c key of BatchedDot.
+        in_c_key=False,
+    )
+
+    config.add(
+        "blas__autotune",
+        "If True, Gemm, Gemv and Ger run their C or their Python (NumPy/SciPy "
+        "BLAS) implementation, depending on the size of their inputs, as "
+        "measured on this machine by theano.tensor.blas_calibration.calibrate.",
+        theano.configparser.BoolParam(False),
+        in_c_key=False,
+    )
+
 
 # Register config parameters that are specific to this module:
 add_blas_configvars()
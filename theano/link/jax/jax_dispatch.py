@@ -669,6 +669,51 @@ def jax_funcify_AdvancedIncSubtensor(op):
     return advancedincsubtensor
 
 
+def fgraph_to_jax_function(fgraph):
+    """Create a JAX-able function computing all the outputs of `fgraph`.
+
+    Unlike `jax_funcify_FunctionGraph`, which returns one function per output
+    node, the returned function returns the list of the outputs of `fgraph`,
+    so that they can be JIT-compiled together. The functions of the nodes
+    are composed with `compose_jax_funcs`, with one memo for all the outputs.
+
+    """
+    memo = {}
+    out_funcs = []
+    for out in fgraph.outputs:
+        out_dtype = getattr(out, "dtype", None)
+        if out in fgraph.inputs:
+            # An input that is also an output
+            idx = fgraph.inputs.index(out)
+
+            def out_func(*inputs, out_dtype=out_dtype, idx=idx):
+                return jnp.array(inputs[idx], dtype=jnp.dtype(out_dtype))
+
+        elif out.owner is None:
+            # A `Constant` output
+
+            def out_func(*inputs, out_dtype=out_dtype, out_data=out.data):
+                return jnp.array(out_data, dtype=jnp.dtype(out_dtype))
+
+        elif out.owner.nout > 1:
+            # As in `compose_jax_funcs`, one function returns all the outputs
+            (multiout_func,) = compose_jax_funcs(out.owner, fgraph.inputs, memo)
+            out_idx = out.owner.outputs.index(out)
+
+            def out_func(*inputs, out_idx=out_idx, multiout_func=multiout_func):
+                return multiout_func(*inputs)[out_idx]
+
+        else:
+            out_func = compose_jax_funcs(out.owner, fgraph.inputs, memo)
+
+        out_funcs.append(out_func)
+
+    def jax_fgraph_func(*input_vals):
+        return [out_func(*input_vals) for out_func in out_funcs]
+
+    return jax_fgraph_func
+
+
 @jax_funcify.register(FunctionGraph)
 def jax_funcify_FunctionGraph(fgraph):
 
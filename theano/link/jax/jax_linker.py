@@ -1,195 +1,119 @@
-from collections.abc import Sequence
-from warnings import warn
+import os
 
-from theano.graph.basic import Constant
-from theano.link.basic import Container, PerformLinker
-from theano.link.utils import gc_helper, map_storage, streamline
-from theano.utils import difference
+import numpy as np
 
+from theano.configdefaults import config
+from theano.graph.fg import FunctionGraph
+from theano.link.basic import JITLinker
 
-class JAXLinker(PerformLinker):
-    """A `Linker` that JIT-compiles NumPy-based operations using JAX.
 
-    Attributes
-    ----------
-    allow_non_jax: bool
-        A boolean indicating whether or not an exception is thrown when the
-        graph cannot be JAX compiled (e.g. the graph has an unsupported operator).
-        If `allow_non_jax` is `True`, the fallback is currently Python compilation.
+_compilation_cache_dir = None
 
-    """
 
-    allow_non_jax = False
+def enable_compilation_cache():
+    """Make JAX keep its compiled functions in the compiledir.
 
-    def create_jax_thunks(self, compute_map, storage_map):
-        """Create a thunk for each output of the `Linker`s `FunctionGraph`.
+    JAX keys the compiled functions by their computation, which includes
+    the shapes and dtypes of the inputs, so a new process running the same
+    graph on the same shapes loads the compiled function instead of running
+    XLA again.
 
-        This is differs from the other thunk-making function in that it only
-        produces thunks for the `FunctionGraph` output nodes.
+    """
+    global _compilation_cache_dir
+    import jax
 
-        Parameters
-        ----------
-        compute_map: dict
-            The compute map dictionary.
-        storage_map: dict
-            The storage map dictionary.
+    path = os.path.join(config.compiledir, "jax_cache")
+    if _compilation_cache_dir == path:
+        return
+    try:
+        jax.config.update("jax_compilation_cache_dir", path)
+    except (AttributeError, KeyError):
+        # Older versions of JAX can only set the cache once per process
+        if _compilation_cache_dir is not None:
+            return
+        from jax.experimental.compilation_cache import compilation_cache
 
-        Returns
-        -------
-        thunks: list
-            A tuple containing the thunks.
-        output_nodes: list and their
-            A tuple containing the output nodes.
+        compilation_cache.initialize_cache(path)
+    _compilation_cache_dir = path
 
-        """
-        import jax
 
-        from theano.link.jax.jax_dispatch import jax_funcify
+class JAXLinker(JITLinker):
+    """A `Linker` that JIT-compiles NumPy-based operations using JAX.
 
-        output_nodes = [o.owner for o in self.fgraph.outputs]
+    Attributes
+    ----------
+    allow_non_jax: bool
+        A boolean indicating whether or not an exception is thrown when the
+        graph cannot be JAX compiled (e.g. the graph has an unsupported operator).
+        If `allow_non_jax` is `True`, the graph is split in regions (see
+        `partition_nodes`): each region of supported operators is compiled by
+        JAX, and the other nodes use their C or Python implementation.
 
-        # Create a JAX-compilable function from our `FunctionGraph`
-        jaxed_fgraph_outputs = jax_funcify(self.fgraph)
+    """
 
-        assert len(jaxed_fgraph_outputs) == len(output_nodes)
+    allow_non_jax = False
 
-        # I suppose we can consider `Constant`s to be "static" according to
-        # JAX.
-        static_argnums = [
-            n for n, i in enumerate(self.fgraph.inputs) if isinstance(i, Constant)
-        ]
+    @property
+    def allow_fallback(self):
+        return self.allow_non_jax
 
-        thunk_inputs = [storage_map[n] for n in self.fgraph.inputs]
+    def check_node(self, node):
+        from theano.link.jax.jax_dispatch import jax_funcify
 
-        thunks = []
+        jax_funcify(node.op)
 
-        for node, jax_funcs in zip(output_nodes, jaxed_fgraph_outputs):
+    def create_region_thunk(self, nodes, compute_map, storage_map, compiled_nodes):
+        """Create a single thunk computing the outputs of a region of the graph.
 
-            thunk_outputs = [storage_map[n] for n in node.outputs]
+        The region is converted to one JAX function, which is JIT-compiled
+        once, so that subgraphs shared by several outputs are only computed
+        once and each call is a single dispatch to JAX.
 
-            if not isinstance(jax_funcs, Sequence):
-                jax_funcs = [jax_funcs]
+        """
+        import jax
 
-            jax_impl_jits = [
-                jax.jit(jax_func, static_argnums) for jax_func in jax_funcs
-            ]
+        from theano.link.jax.jax_dispatch import fgraph_to_jax_function
 
-            def thunk(
-                node=node, jax_impl_jits=jax_impl_jits, thunk_outputs=thunk_outputs
-            ):
-                outputs = [
-                    jax_impl_jit(*[x[0] for x in thunk_inputs])
-                    for jax_impl_jit in jax_impl_jits
-                ]
-
-                if len(jax_impl_jits) < len(node.outputs):
-                    # In this case, the JAX function will output a single
-                    # output that contains the other outputs.
-                    # This happens for multi-output `Op`s that directly
-                    # correspond to multi-output JAX functions (e.g. `SVD` and
-                    # `jax.numpy.linalg.svd`).
-                    outputs = outputs[0]
-
-                for o_node, o_storage, o_val in zip(
-                    node.outputs, thunk_outputs, outputs
-                ):
-                    compute_map[o_node][0] = True
-                    if len(o_storage) > 1:
-                        assert len(o_storage) == len(o_val)
-                        for i, o_sub_val in enumerate(o_val):
-                            o_storage[i] = o_sub_val
-                    else:
-                        o_storage[0] = o_val
-                return outputs
-
-            thunk.inputs = thunk_inputs
-            thunk.outputs = thunk_outputs
-            thunk.lazy = False
-
-            thunks.append(thunk)
-
-        return thunks, output_nodes
-
-    def make_all(self, input_storage=None, output_storage=None, storage_map=None):
         fgraph = self.fgraph
-        nodes = self.schedule(fgraph)
-        no_recycling = self.no_recycling
-
-        input_storage, output_storage, storage_map = map_storage(
-            fgraph, nodes, input_storage, output_storage, storage_map
-        )
-
-        compute_map = {}
-        for k in storage_map:
-            compute_map[k] = [k.owner is None]
-
-        try:
-            # We need to create thunk functions that will populate the output
-            # storage arrays with the JAX-computed values.
-            thunks, nodes = self.create_jax_thunks(compute_map, storage_map)
-
-        except NotImplementedError as e:
-            if not self.allow_non_jax:
-                raise
-
-            warn(f"JaxLinker could not JAXify graph: {e}")
-
-            thunks = []
-            for node in nodes:
-                thunk = node.op.make_thunk(
-                    node, storage_map, compute_map, no_recycling, "py"
-                )
-                thunk_inputs = [storage_map[v] for v in node.inputs]
-                thunk_outputs = [storage_map[v] for v in node.outputs]
-
-                thunk.inputs = thunk_inputs
-                thunk.outputs = thunk_outputs
-
-                thunks.append(thunk)
-
-        computed, last_user = gc_helper(nodes)
-
-        if self.allow_gc:
-            post_thunk_old_storage = []
-
-            for node in nodes:
-                post_thunk_old_storage.append(
-                    [
-                        storage_map[input]
-                        for input in node.inputs
-                        if (input in computed)
-                        and (input not in fgraph.outputs)
-                        and (node == last_user[input])
-                    ]
-                )
-        else:
-            post_thunk_old_storage = None
-
-        if no_recycling is True:
-            no_recycling = list(storage_map.values())
-            no_recycling = difference(no_recycling, input_storage)
-        else:
-            no_recycling = [
-                storage_map[r] for r in no_recycling if r not in fgraph.inputs
-            ]
-
-        fn = streamline(
-            fgraph, thunks, nodes, post_thunk_old_storage, no_recycling=no_recycling
-        )
-
-        fn.allow_gc = self.allow_gc
-        fn.storage_map = storage_map
-
-        return (
-            fn,
-            [
-                Container(input, storage)
-                for input, storage in zip(fgraph.inputs, input_storage)
-            ],
-            [
-                Container(output, storage, readonly=True)
-                for output, storage in zip(fgraph.outputs, output_storage)
-            ],
-            thunks,
-            nodes,
-        )
+        inputs, outputs, to_numpy = self.region_io(nodes, compiled_nodes)
+
+        jax_func = fgraph_to_jax_function(FunctionGraph(inputs, outputs))
+
+        # The buffers of the inputs replaced by an update can be reused for
+        # the outputs when no other thunk reads them. The CPU backend does not
+        # support donation.
+        donate_argnums = []
+        if (
+            len(nodes) == len(fgraph.apply_nodes)
+            and fgraph.update_mapping
+            and jax.default_backend() != "cpu"
+        ):
+            donate_argnums = sorted(
+                inputs.index(fgraph.inputs[i])
+                for i in fgraph.update_mapping.values()
+                if fgraph.inputs[i] in inputs
+            )
+
+        if config.jax__compilation_cache:
+            enable_compilation_cache()
+        jax_func = jax.jit(jax_func, donate_argnums=donate_argnums)
+
+        thunk_inputs = [storage_map[i] for i in inputs]
+        thunk_outputs = [storage_map[o] for o in outputs]
+        output_computed = [compute_map[o] for o in outputs]
+
+        def thunk():
+            outputs = jax_func(*[x[0] for x in thunk_inputs])
+            # The outputs used by nodes that are not converted to JAX need to
+            # be NumPy arrays
+            for o_storage, o_computed, o_val, o_numpy in zip(
+                thunk_outputs, output_computed, outputs, to_numpy
+            ):
+                o_computed[0] = True
+                o_storage[0] = np.asarray(o_val) if o_numpy else o_val
+            return outputs
+
+        thunk.inputs = thunk_inputs
+        thunk.outputs = thunk_outputs
+        thunk.lazy = False
+        return thunk, inputs, outputs
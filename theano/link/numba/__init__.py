@@ -0,0 +1 @@
+from theano.link.numba.numba_linker import NumbaLinker
@@ -0,0 +1,702 @@
+"""
+Conversion of Theano graphs to functions compiled by Numba.
+
+`numba_funcify` returns, for a node, a function computing its outputs that
+Numba can compile in nopython mode.  Most of them are generated from source,
+so that the parameters of the `Op` (axes, indices, dtypes) are literals in
+the compiled code.  `fgraph_to_numba_function` combines the functions of the
+nodes of a graph into a single jitted function.
+
+"""
+
+import hashlib
+import os
+from functools import reduce, singledispatch
+
+import numba
+import numpy as np
+
+from theano.compile.ops import (
+    DeepCopyOp,
+    Rebroadcast,
+    Shape,
+    Shape_i,
+    SpecifyShape,
+    ViewOp,
+)
+from theano.configdefaults import config
+from theano.graph.basic import Constant
+from theano.graph.fg import FunctionGraph
+from theano.graph.op import Op
+from theano.graph.type import CType
+from theano.scalar.basic import (
+    Cast,
+    Clip,
+    Composite,
+    Identity,
+    ScalarOp,
+    Second,
+    Switch,
+    get_scalar_type,
+)
+from theano.scan.op import Scan
+from theano.tensor.basic import (
+    Alloc,
+    AllocEmpty,
+    ARange,
+    Dot,
+    Join,
+    Reshape,
+    ScalarFromTensor,
+    TensorFromScalar,
+)
+from theano.tensor.elemwise import CAReduce, DimShuffle, Elemwise
+from theano.tensor.opt import MakeVector
+from theano.tensor.subtensor import AdvancedSubtensor1, IncSubtensor, Subtensor
+
+
+def to_scalar(x):
+    """Return the value of a 0-d array, or `x` itself if it is a scalar."""
+    return np.asarray(x).item()
+
+
+@numba.extending.overload(to_scalar)
+def _to_scalar(x):
+    if isinstance(x, numba.types.Array):
+        return lambda x: x.item()
+    return lambda x: x
+
+
+def dtype_source(dtype):
+    """Return the source of the NumPy scalar type of `dtype`."""
+    if dtype == "bool":
+        return "np.bool_"
+    return f"np.{dtype}"
+
+
+def compile_function_src(src, function_name, global_env, filename=None):
+    """
+    Execute the source of a function and return the function.
+
+    Parameters
+    ----------
+    src: str
+        The source of the function.
+    function_name: str
+        The name of the function in `src`.
+    global_env: dict
+        The global variables used by the function.
+    filename: str (optional)
+        If given, `src` is written to this file and loaded from it.  Numba
+        can only cache the functions whose source is in a file.
+
+    """
+    if filename is None:
+        env = dict(global_env)
+        exec(compile(src, "<numba_fgraph>", "exec"), env)
+        return env[function_name]
+
+    if not os.path.exists(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w") as f:
+            f.write(src)
+        os.replace(tmp_filename, filename)
+    with open(filename) as f:
+        src = f.read()
+    # The function is compiled in a private namespace, without adding a
+    # module to `sys.modules`.  It belongs to this module, which Numba can
+    # import, while its code refers to `filename`, which Numba caches.
+    env = dict(global_env, __name__=__name__)
+    exec(compile(src, filename, "exec"), env)
+    return env[function_name]
+
+
+# The items of `Scan.info` that determine what a `Scan` computes
+SCAN_KEY_INFO = (
+    "tap_array",
+    "n_seqs",
+    "n_mit_mot",
+    "mit_mot_out_slices",
+    "n_mit_sot",
+    "n_sit_sot",
+    "n_shared_outs",
+    "n_nit_sot",
+    "as_while",
+)
+
+
+def op_key(op):
+    """
+    Return a string identifying what `op` computes, or None if it has none.
+
+    The key is part of the name of the cached functions, so two `Op`s with
+    the same key must compile to the same code.
+
+    """
+    if isinstance(op, Composite):
+        key = graph_key(op.fgraph)
+    elif isinstance(op, Scan):
+        info = [op.info[k] for k in SCAN_KEY_INFO]
+        key = repr((info, graph_key(FunctionGraph(op.inputs, op.outputs))))
+    elif getattr(op, "__props__", None) is not None:
+        # Callable properties, like the `output_types_preference` of the
+        # `ScalarOp`s, only determine the types of the outputs, which are in
+        # the key of the graph.
+        key = repr(
+            [
+                op_key(p)
+                if isinstance(p, Op)
+                else type(p).__qualname__
+                if callable(p)
+                else repr(p)
+                for p in op._props()
+            ]
+        )
+    else:
+        key = str(op)
+    if key is None or " at 0x" in key:
+        return None
+    return f"{type(op).__module__}.{type(op).__qualname__}{key}"
+
+
+def graph_key(fgraph):
+    """Return a string identifying the computation of `fgraph`, or None."""
+    index = {var: f"i{n}" for n, var in enumerate(fgraph.inputs)}
+    parts = []
+    for n, node in enumerate(fgraph.toposort()):
+        key = op_key(node.op)
+        if key is None:
+            return None
+        inputs = []
+        for var in node.inputs:
+            if var in index:
+                inputs.append(index[var])
+            elif isinstance(var, Constant):
+                data = np.asarray(var.data)
+                digest = hashlib.sha256(data.tobytes()).hexdigest()
+                inputs.append(f"{var.type}{data.shape}{digest}")
+            else:
+                return None
+        for k, var in enumerate(node.outputs):
+            index[var] = f"n{n}.{k}"
+        parts.append(f"{key}({', '.join(inputs)}) -> {[o.type for o in node.outputs]}")
+    parts.append(repr([index.get(var, str(var.type)) for var in fgraph.outputs]))
+    return "\n".join(parts)
+
+
+@singledispatch
+def numba_funcify(op, node, **kwargs):
+    """
+    Create a function computing the outputs of `node` with Numba.
+
+    Functions of nodes with one output return it, the others return a tuple.
+    The scalar `Op`s return a Python function for `numba.vectorize`, the
+    other `Op`s a jitted function.
+
+    Raises
+    ------
+    NotImplementedError
+        When `op` has no conversion to Numba.
+
+    """
+    raise NotImplementedError(f"No Numba conversion for the given `Op`: {op}")
+
+
+def fgraph_to_numba_function(fgraph, cache=False):
+    """
+    Create a jitted function computing all the outputs of `fgraph`.
+
+    The function takes the values of the inputs of `fgraph` as positional
+    arguments, calls the functions of the nodes in topological order, and
+    returns the tuple of the outputs.
+
+    When `cache` is True, the function is written in the compiledir, in a
+    file named after `graph_key`, and compiled with ``cache=True`` so that
+    the machine code is reused by later processes.
+
+    """
+    env = {"np": np, "to_scalar": to_scalar}
+    names = {}
+    for n, var in enumerate(fgraph.inputs):
+        names[var] = f"i{n}"
+
+    def name_of(var):
+        if var not in names:
+            # `Constant`s and other variables without owner in the graph
+            names[var] = f"c{len(env)}"
+            env[names[var]] = var.data
+        return names[var]
+
+    lines = []
+    for n, node in enumerate(fgraph.toposort()):
+        env[f"n{n}"] = numba_funcify(node.op, node)
+        if isinstance(node.op, ScalarOp):
+            # The functions of `ScalarOp`s are jitted or vectorized by their
+            # callers
+            env[f"n{n}"] = numba.njit(env[f"n{n}"])
+        args = ", ".join(name_of(var) for var in node.inputs)
+        out_names = []
+        for k, var in enumerate(node.outputs):
+            names[var] = f"v{n}_{k}"
+            out_names.append(names[var])
+        if len(out_names) == 1:
+            lines.append(f"{out_names[0]} = n{n}({args})")
+        else:
+            lines.append(f"{', '.join(out_names)} = n{n}({args})")
+    outs = "".join(f"{name_of(var)}, " for var in fgraph.outputs)
+    lines.append(f"return ({outs})")
+
+    args = ", ".join(names[var] for var in fgraph.inputs)
+    body = "".join(f"    {line}\n" for line in lines)
+    src = f"def numba_fgraph({args}):\n{body}"
+
+    filename = None
+    if cache:
+        key = graph_key(fgraph)
+        if key is not None:
+            digest = hashlib.sha256(f"{__name__}\n{src}\n{key}".encode()).hexdigest()
+            filename = os.path.join(
+                config.compiledir, "numba", f"numba_fgraph_{digest}.py"
+            )
+    fn = compile_function_src(src, "numba_fgraph", env, filename)
+    return numba.njit(fn, cache=filename is not None)
+
+
+def compile_kernel(src, function_name, global_env=None):
+    """Compile the source of a node function with `numba.njit`."""
+    env = {"np": np, "to_scalar": to_scalar}
+    if global_env:
+        env.update(global_env)
+    return numba.njit(compile_function_src(src, function_name, env))
+
+
+def scalar_node(op, node):
+    """Return a node of the `ScalarOp` `op` on the dtypes of `node`."""
+    return op.make_node(*[get_scalar_type(i.dtype)() for i in node.inputs])
+
+
+@numba_funcify.register(ScalarOp)
+def numba_funcify_ScalarOp(op, node, **kwargs):
+    nfunc_spec = getattr(op, "nfunc_spec", None)
+    if nfunc_spec is None:
+        raise NotImplementedError(f"No Numba conversion for the given `Op`: {op}")
+    nfunc_name, nfunc_nin, _ = nfunc_spec
+    args = [f"i{n}" for n in range(len(node.inputs))]
+    if len(args) == nfunc_nin:
+        expr = f"np.{nfunc_name}({', '.join(args)})"
+    elif nfunc_nin == 2 and len(args) > 2:
+        # `Add` and `Mul` take any number of inputs
+        expr = reduce(lambda a, b: f"np.{nfunc_name}({a}, {b})", args)
+    elif nfunc_nin == 2 and len(args) == 1:
+        expr = args[0]
+    else:
+        raise NotImplementedError(f"No Numba conversion for the given `Op`: {op}")
+    src = f"def scalar_op({', '.join(args)}):\n    return {expr}\n"
+    return compile_function_src(src, "scalar_op", {"np": np})
+
+
+@numba_funcify.register(Cast)
+def numba_funcify_Cast(op, node, **kwargs):
+    src = f"def cast(i0):\n    return {dtype_source(op.o_type.dtype)}(i0)\n"
+    return compile_function_src(src, "cast", {"np": np})
+
+
+@numba_funcify.register(Identity)
+def numba_funcify_Identity(op, node, **kwargs):
+    return compile_function_src("def identity(i0):\n    return i0\n", "identity", {})
+
+
+@numba_funcify.register(Second)
+def numba_funcify_Second(op, node, **kwargs):
+    return compile_function_src("def second(i0, i1):\n    return i1\n", "second", {})
+
+
+@numba_funcify.register(Switch)
+def numba_funcify_Switch(op, node, **kwargs):
+    src = "def switch(i0, i1, i2):\n    return i1 if i0 else i2\n"
+    return compile_function_src(src, "switch", {})
+
+
+@numba_funcify.register(Clip)
+def numba_funcify_Clip(op, node, **kwargs):
+    src = "def clip(i0, i1, i2):\n    return min(max(i0, i1), i2)\n"
+    return compile_function_src(src, "clip", {})
+
+
+@numba_funcify.register(Composite)
+def numba_funcify_Composite(op, node, **kwargs):
+    fgraph = op.fgraph
+    env = {"np": np}
+    names = {var: f"i{n}" for n, var in enumerate(fgraph.inputs)}
+    lines = []
+    for n, inner_node in enumerate(fgraph.toposort()):
+        env[f"f{n}"] = numba.njit(numba_funcify(inner_node.op, inner_node))
+        args = []
+        for var in inner_node.inputs:
+            if var not in names:
+                names[var] = f"c{n}_{len(args)}"
+                env[names[var]] = np.asarray(var.data, dtype=var.dtype)[()]
+            args.append(names[var])
+        out_names = [f"v{n}_{k}" for k in range(len(inner_node.outputs))]
+        names.update(zip(inner_node.outputs, out_names))
+        lines.append(f"{', '.join(out_names)} = f{n}({', '.join(args)})")
+    outs = [names[var] for var in fgraph.outputs]
+    lines.append(f"return {', '.join(outs)}")
+    args = ", ".join(names[var] for var in fgraph.inputs)
+    body = "".join(f"    {line}\n" for line in lines)
+    return compile_function_src(f"def composite({args}):\n{body}", "composite", env)
+
+
+@numba_funcify.register(Elemwise)
+def numba_funcify_Elemwise(op, node, **kwargs):
+    if len(node.outputs) > 1:
+        raise NotImplementedError("Numba Elemwise with several outputs")
+    scalar_func = numba_funcify(op.scalar_op, scalar_node(op.scalar_op, node))
+    signature = numba.from_dtype(np.dtype(node.outputs[0].dtype))(
+        *[numba.from_dtype(np.dtype(i.dtype)) for i in node.inputs]
+    )
+    return numba.vectorize([signature], nopython=True)(scalar_func)
+
+
+@numba_funcify.register(CAReduce)
+def numba_funcify_CAReduce(op, node, **kwargs):
+    (x,) = node.inputs
+    out_dtype = node.outputs[0].dtype
+    axis = op.axis
+    if axis is None:
+        axis = list(range(x.ndim))
+    axis = [a % x.ndim for a in axis] if x.ndim else []
+    if not axis:
+        raise NotImplementedError("Numba reductions over no axis")
+    kept = [a for a in range(x.ndim) if a not in axis]
+    perm = "".join(f"{a}, " for a in kept + sorted(axis))
+
+    scalar_op = op.scalar_op
+    reduce_node = scalar_op.make_node(
+        get_scalar_type(out_dtype)(), get_scalar_type(out_dtype)()
+    )
+    env = {
+        "scalar_op": numba.njit(numba_funcify(scalar_op, reduce_node)),
+        "identity": np.dtype(out_dtype).type(getattr(scalar_op, "identity", 0)),
+    }
+    if getattr(scalar_op, "identity", None) is not None:
+        init, start = "identity", "0"
+    else:
+        init, start = "rows[r, 0]", "1"
+
+    shape = "".join(f"xt.shape[{k}], " for k in range(len(kept)))
+    src = f"""
+def careduce(x):
+    xt = np.ascontiguousarray(np.transpose(x, ({perm})))
+    n_kept = 1
+    for k in range({len(kept)}):
+        n_kept *= xt.shape[k]
+    rows = xt.reshape((n_kept, -1))
+    out = np.empty(n_kept, dtype={dtype_source(out_dtype)})
+    for r in range(n_kept):
+        acc = {init}
+        for j in range({start}, rows.shape[1]):
+            acc = scalar_op(acc, rows[r, j])
+        out[r] = acc
+"""
+    if kept:
+        src += f"    return out.reshape(({shape}))\n"
+    else:
+        src += "    return out[0]\n"
+    return compile_kernel(src, "careduce", env)
+
+
+@numba_funcify.register(DimShuffle)
+def numba_funcify_DimShuffle(op, node, **kwargs):
+    if not op.new_order:
+        src = "def dimshuffle(x):\n    return x.ravel()[0]\n"
+        return compile_kernel(src, "dimshuffle")
+    if node.inputs[0].ndim == 0:
+        shape = "".join("1, " for _ in op.new_order)
+        src = f"def dimshuffle(x):\n    return np.full(({shape}), to_scalar(x))\n"
+        return compile_kernel(src, "dimshuffle")
+
+    # The dropped dimensions are moved last, and removed by the reshape as
+    # their length is one
+    perm = [d for d in op.new_order if d != "x"] + list(op.drop)
+    shape = "".join(
+        "1, " if d == "x" else f"xt.shape[{perm.index(d)}], " for d in op.new_order
+    )
+    src = f"""
+def dimshuffle(x):
+    xt = np.ascontiguousarray(np.transpose(x, ({"".join(f"{d}, " for d in perm)})))
+    return xt.reshape(({shape}))
+"""
+    return compile_kernel(src, "dimshuffle")
+
+
+def index_source(idx_list, args):
+    """Return the source of the index given by `idx_list` and `args`."""
+    args = list(args)
+
+    def entry_source(entry):
+        if isinstance(entry, CType):
+            return f"to_scalar({args.pop(0)})"
+        elif entry is None:
+            return ""
+        return repr(entry)
+
+    indices = []
+    for entry in idx_list:
+        if isinstance(entry, slice):
+            indices.append(
+                ":".join(entry_source(e) for e in (entry.start, entry.stop, entry.step))
+            )
+        else:
+            indices.append(entry_source(entry))
+    return "".join(f"{idx}, " for idx in indices)
+
+
+@numba_funcify.register(Subtensor)
+def numba_funcify_Subtensor(op, node, **kwargs):
+    args = [f"i{n}" for n in range(len(node.inputs) - 1)]
+    index = index_source(op.idx_list, args)
+    src = f"def subtensor(x, {', '.join(args)}):\n    return x[{index}]\n"
+    return compile_kernel(src, "subtensor")
+
+
+@numba_funcify.register(IncSubtensor)
+def numba_funcify_IncSubtensor(op, node, **kwargs):
+    args = [f"i{n}" for n in range(len(node.inputs) - 2)]
+    index = index_source(op.idx_list, args)
+    assign = "=" if op.set_instead_of_inc else "+="
+    copy = "x" if op.inplace else "x.copy()"
+    src = f"""
+def incsubtensor(x, y, {', '.join(args)}):
+    z = {copy}
+    z[{index}] {assign} y
+    return z
+"""
+    return compile_kernel(src, "incsubtensor")
+
+
+@numba_funcify.register(AdvancedSubtensor1)
+def numba_funcify_AdvancedSubtensor1(op, node, **kwargs):
+    return compile_kernel("def take(x, i):\n    return x[i]\n", "take")
+
+
+@numba_funcify.register(Shape)
+def numba_funcify_Shape(op, node, **kwargs):
+    ndim = node.inputs[0].ndim
+    assign = "".join(f"    out[{k}] = x.shape[{k}]\n" for k in range(ndim))
+    src = f"def shape(x):\n    out = np.empty({ndim}, dtype=np.int64)\n{assign}"
+    return compile_kernel(src + "    return out\n", "shape")
+
+
+@numba_funcify.register(Shape_i)
+def numba_funcify_Shape_i(op, node, **kwargs):
+    return compile_kernel(f"def shape_i(x):\n    return x.shape[{op.i}]\n", "shape_i")
+
+
+@numba_funcify.register(Reshape)
+def numba_funcify_Reshape(op, node, **kwargs):
+    shape = "".join(f"to_scalar(shp[{k}]), " for k in range(op.ndim))
+    src = f"""
+def reshape(x, shp):
+    return np.ascontiguousarray(x).reshape(({shape}))
+"""
+    return compile_kernel(src, "reshape")
+
+
+@numba_funcify.register(Alloc)
+def numba_funcify_Alloc(op, node, **kwargs):
+    args = [f"s{n}" for n in range(len(node.inputs) - 1)]
+    shape = "".join(f"to_scalar({s}), " for s in args)
+    dtype = dtype_source(node.outputs[0].dtype)
+    src = f"""
+def alloc(v, {', '.join(args)}):
+    out = np.empty(({shape}), dtype={dtype})
+    out[...] = v
+    return out
+"""
+    return compile_kernel(src, "alloc")
+
+
+@numba_funcify.register(AllocEmpty)
+def numba_funcify_AllocEmpty(op, node, **kwargs):
+    args = [f"s{n}" for n in range(len(node.inputs))]
+    shape = "".join(f"to_scalar({s}), " for s in args)
+    dtype = dtype_source(node.outputs[0].dtype)
+    src = f"""
+def allocempty({', '.join(args)}):
+    return np.empty(({shape}), dtype={dtype})
+"""
+    return compile_kernel(src, "allocempty")
+
+
+@numba_funcify.register(MakeVector)
+def numba_funcify_MakeVector(op, node, **kwargs):
+    args = [f"i{n}" for n in range(len(node.inputs))]
+    dtype = dtype_source(node.outputs[0].dtype)
+    assign = "".join(f"    out[{n}] = to_scalar({a})\n" for n, a in enumerate(args))
+    src = (
+        f"def makevector({', '.join(args)}):\n"
+        f"    out = np.empty({len(args)}, dtype={dtype})\n{assign}    return out\n"
+    )
+    return compile_kernel(src, "makevector")
+
+
+@numba_funcify.register(ARange)
+def numba_funcify_ARange(op, node, **kwargs):
+    dtype = dtype_source(node.outputs[0].dtype)
+    src = f"""
+def arange(start, stop, step):
+    return np.arange(
+        to_scalar(start), to_scalar(stop), to_scalar(step)
+    ).astype({dtype})
+"""
+    return compile_kernel(src, "arange")
+
+
+@numba_funcify.register(Join)
+def numba_funcify_Join(op, node, **kwargs):
+    args = [f"t{n}" for n in range(len(node.inputs) - 1)]
+    tensors = "".join(f"{a}, " for a in args)
+    src = f"""
+def join(axis, {', '.join(args)}):
+    return np.concatenate(({tensors}), axis=to_scalar(axis))
+"""
+    return compile_kernel(src, "join")
+
+
+@numba_funcify.register(Dot)
+def numba_funcify_Dot(op, node, **kwargs):
+    dtype = dtype_source(node.outputs[0].dtype)
+    src = f"""
+def dot(x, y):
+    return np.asarray(np.dot(x, y)).astype({dtype})
+"""
+    return compile_kernel(src, "dot")
+
+
+@numba_funcify.register(ScalarFromTensor)
+def numba_funcify_ScalarFromTensor(op, node, **kwargs):
+    return compile_kernel("def scalar(x):\n    return to_scalar(x)\n", "scalar")
+
+
+@numba_funcify.register(TensorFromScalar)
+def numba_funcify_TensorFromScalar(op, node, **kwargs):
+    return compile_kernel("def tensor(x):\n    return np.asarray(x)\n", "tensor")
+
+
+@numba_funcify.register(DeepCopyOp)
+def numba_funcify_DeepCopyOp(op, node, **kwargs):
+    return compile_kernel("def deepcopy(x):\n    return np.copy(x)\n", "deepcopy")
+
+
+@numba_funcify.register(ViewOp)
+@numba_funcify.register(Rebroadcast)
+@numba_funcify.register(SpecifyShape)
+def numba_funcify_view(op, node, **kwargs):
+    return compile_kernel("def view(x, *args):\n    return x\n", "view")
+
+
+@numba_funcify.register(Scan)
+def numba_funcify_Scan(op, node, **kwargs):
+    inner_func = fgraph_to_numba_function(FunctionGraph(op.inputs, op.outputs))
+
+    n_seqs = op.n_seqs
+    n_mit_mot = op.n_mit_mot
+    n_outs = op.n_outs
+    n_nit_sot = op.n_nit_sot
+    n_shared_outs = op.n_shared_outs
+    n_non_seqs = len(node.inputs) - 1 - n_seqs - n_outs - n_shared_outs - n_nit_sot
+
+    # The outer inputs are n_steps, then the sequences, the mit-mot, mit-sot
+    # and sit-sot buffers, the initial values of the shared variables, the
+    # lengths of the nit-sot outputs and the non-sequences.
+    seqs = [f"q{k}" for k in range(n_seqs)]
+    bufs = [f"b{j}" for j in range(n_outs)]
+    shared = [f"h{k}" for k in range(n_shared_outs)]
+    nit_stores = [f"z{k}" for k in range(n_nit_sot)]
+    non_seqs = [f"p{k}" for k in range(n_non_seqs)]
+    args = ["n_steps"] + seqs + bufs + shared + nit_stores + non_seqs
+
+    lines = ["n_steps = to_scalar(n_steps)"]
+    for j in range(n_outs):
+        lines.append(f"buf{j} = b{j}.copy()")
+        lines.append(f"store{j} = buf{j}.shape[0]")
+    nit_outs = node.outputs[n_outs : n_outs + n_nit_sot]
+    for k, out in enumerate(nit_outs):
+        zeros = "".join("0, " for _ in range(out.ndim))
+        lines.append(f"nit{k} = np.zeros(({zeros}), dtype={dtype_source(out.dtype)})")
+        lines.append(f"nit_store{k} = to_scalar(z{k})")
+    for k in range(n_shared_outs):
+        lines.append(f"sh{k} = h{k}")
+    lines.append("n_done = n_steps")
+
+    # The buffers are used as ring buffers, as in `Scan.perform`
+    step = [f"{s}[i]" for s in seqs]
+    for j in range(n_outs):
+        for tap in op.tap_array[j]:
+            step.append(f"buf{j}[(i - {op.mintaps[j]} + {tap}) % store{j}]")
+    step += [f"sh{k}" for k in range(n_shared_outs)] + non_seqs
+    loop = [f"outs = inner_func({', '.join(step)})"]
+    o = 0
+    for j in range(n_outs):
+        taps = op.mit_mot_out_slices[j] if j < n_mit_mot else [0]
+        for tap in taps:
+            loop.append(f"buf{j}[(i - {op.mintaps[j]} + {tap}) % store{j}] = outs[{o}]")
+            o += 1
+    for k, out in enumerate(nit_outs):
+        row_shape = f"(nit_store{k},)"
+        if out.ndim > 1:
+            row_shape += f" + np.asarray(outs[{o}]).shape"
+        loop.append("if i == 0:")
+        loop.append(
+            f"    nit{k} = np.zeros({row_shape}, dtype={dtype_source(out.dtype)})"
+        )
+        loop.append(f"nit{k}[i % nit_store{k}] = outs[{o}]")
+        o += 1
+    for k in range(n_shared_outs):
+        dtype = dtype_source(node.outputs[n_outs + n_nit_sot + k].dtype)
+        loop.append(f"sh{k} = np.asarray(outs[{o}]).astype({dtype})")
+        o += 1
+    if op.as_while:
+        loop.append(f"if to_scalar(outs[{o}]):")
+        loop.append("    n_done = i + 1")
+        loop.append("    break")
+    lines.append("for i in range(n_steps):")
+    lines += [f"    {line}" for line in loop]
+
+    # Put the buffers in the order `Scan.perform` returns them
+    for j in range(n_mit_mot, n_outs):
+        lines += [
+            f"n_rows = n_done - {op.mintaps[j]}",
+            f"if store{j} < n_rows:",
+            f"    start = n_rows % store{j}",
+            f"    buf{j} = np.concatenate((buf{j}[start:], buf{j}[:start]))",
+            f"elif store{j} > n_rows:",
+            f"    buf{j}[n_rows:] = 0",
+            "    if n_done < n_steps:",
+            f"        buf{j} = buf{j}[: store{j} - (n_steps - n_done)]",
+        ]
+    for k in range(n_nit_sot):
+        lines += [
+            f"if nit_store{k} <= n_done:",
+            f"    start = n_done % nit_store{k}",
+            f"    nit{k} = np.concatenate((nit{k}[start:], nit{k}[:start]))",
+            "else:",
+            f"    nit{k}[n_done:] = 0",
+            "    if n_done < n_steps:",
+            f"        nit{k} = nit{k}[: nit_store{k} - (n_steps - n_done)]",
+        ]
+    outs = (
+        [f"buf{j}" for j in range(n_outs)]
+        + [f"nit{k}" for k in range(n_nit_sot)]
+        + [f"sh{k}" for k in range(n_shared_outs)]
+    )
+    if len(outs) == 1:
+        lines.append(f"return {outs[0]}")
+    else:
+        lines.append(f"return {', '.join(outs)}")
+
+    body = "".join(f"    {line}\n" for line in lines)
+    src = f"def scan({', '.join(args)}):\n{body}"
+    return compile_kernel(src, "scan", {"inner_func": inner_func})
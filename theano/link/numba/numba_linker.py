@@ -0,0 +1,57 @@
+import numpy as np
+
+from theano.configdefaults import config
+from theano.graph.fg import FunctionGraph
+from theano.link.basic import JITLinker
+
+
+class NumbaLinker(JITLinker):
+    """A `Linker` that compiles the graph to a single function with Numba.
+
+    The functions of the nodes are given by `numba_funcify`, and the whole
+    graph is compiled by `numba.njit`. Unlike the C linker, this needs no C
+    compiler and creates a single module per graph, which is cached in the
+    compiledir when the Theano flag ``numba__cache`` is True.
+
+    Attributes
+    ----------
+    allow_fallback: bool
+        Whether the nodes without Numba conversion use their C or Python
+        implementation, in which case the graph is split in regions (see
+        `partition_nodes`). If False, such nodes raise a
+        `NotImplementedError`.
+
+    """
+
+    def check_node(self, node):
+        from theano.link.numba.numba_dispatch import numba_funcify
+
+        numba_funcify(node.op, node)
+
+    def create_region_thunk(self, nodes, compute_map, storage_map, compiled_nodes):
+        from theano.link.numba.numba_dispatch import fgraph_to_numba_function
+
+        inputs, outputs, _ = self.region_io(nodes, compiled_nodes)
+        numba_func = fgraph_to_numba_function(
+            FunctionGraph(inputs, outputs), cache=config.numba__cache
+        )
+
+        thunk_inputs = [storage_map[i] for i in inputs]
+        thunk_outputs = [storage_map[o] for o in outputs]
+        output_computed = [compute_map[o] for o in outputs]
+        # Numba returns Python scalars for 0-d outputs
+        output_dtypes = [getattr(o, "dtype", None) for o in outputs]
+
+        def thunk():
+            outputs = numba_func(*[x[0] for x in thunk_inputs])
+            for o_storage, o_computed, o_val, o_dtype in zip(
+                thunk_outputs, output_computed, outputs, output_dtypes
+            ):
+                o_computed[0] = True
+                o_storage[0] = np.asarray(o_val, dtype=o_dtype)
+            return outputs
+
+        thunk.inputs = thunk_inputs
+        thunk.outputs = thunk_outputs
+        thunk.lazy = False
+        return thunk, inputs, outputs
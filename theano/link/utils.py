@@ -1,3 +1,4 @@
+import heapq
 import io
 import sys
 import traceback
@@ -210,6 +211,67 @@ def streamline(
     return f
 
 
+def partition_nodes(nodes, is_compiled, orderings=None):
+    """Group `nodes` into regions that are all compiled or not.
+
+    The nodes are scheduled again, in a topological order that takes the
+    ready nodes of the same kind as the current region first, so that the
+    regions are as big as possible. A region is a run of consecutive nodes
+    of that order, so it can be computed as a whole once the regions before
+    it are.
+
+    Parameters
+    ----------
+    nodes: list of Apply
+        The nodes in a topological order.
+    is_compiled: callable
+        Returns whether a node can be compiled.
+    orderings: dict, optional
+        Maps nodes to the nodes that must be computed before them, in
+        addition to their inputs, as returned by `FunctionGraph.orderings`
+        (e.g. so that an inplace operation runs after the other clients of
+        the variable it destroys).
+
+    Returns
+    -------
+    list of (bool, list of Apply)
+        The regions in execution order, with whether they are compiled.
+
+    """
+    node_set = set(nodes)
+    kinds = {node: bool(is_compiled(node)) for node in nodes}
+    position = {node: i for i, node in enumerate(nodes)}
+    n_parents = {}
+    children = {node: [] for node in nodes}
+    for node in nodes:
+        parents = {i.owner for i in node.inputs if i.owner in node_set}
+        if orderings:
+            parents.update(p for p in orderings.get(node, ()) if p in node_set)
+        n_parents[node] = len(parents)
+        for parent in parents:
+            children[parent].append(node)
+
+    ready = {True: [], False: []}
+    for node in nodes:
+        if n_parents[node] == 0:
+            heapq.heappush(ready[kinds[node]], (position[node], node))
+
+    regions = []
+    kind = None
+    while ready[True] or ready[False]:
+        if kind is None or not ready[kind]:
+            # Start a new region with the kind of the earliest ready node
+            kind = min((k for k in ready if ready[k]), key=lambda k: ready[k][0][0])
+            regions.append((kind, []))
+        _, node = heapq.heappop(ready[kind])
+        regions[-1][1].append(node)
+        for child in children[node]:
+            n_parents[child] -= 1
+            if n_parents[child] == 0:
+                heapq.heappush(ready[kinds[child]], (position[child], child))
+    return regions
+
+
 def gc_helper(node_list: typing.List[Apply]):
     """
     Return the set of Variable instances which are computed by node_list.
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+# Time BatchedDot with its small matrix loop and with one BLAS gemm call
+# per matrix, to choose the Theano flag blas__batched_dot_small_size.
+
+
+import time
+from optparse import OptionParser
+
+import numpy as np
+
+import theano
+import theano.tensor as tt
+from theano.configdefaults import config
+
+
+def time_batched_dot(batch, size, small_size, iters=10, dtype=None):
+    """
+    Return the best time of `iters` batched products of `batch` matrices of
+    shape `(size, size)`, using the small matrix loop up to `small_size`.
+
+    """
+    if dtype is None:
+        dtype = config.floatX
+    with config.change_flags(blas__batched_dot_small_size=small_size):
+        x = tt.tensor3(dtype=dtype)
+        y = tt.tensor3(dtype=dtype)
+        f = theano.function([x, y], tt.blas.BatchedDot()(x, y))
+    rng = np.random.RandomState(0)
+    x_val = rng.rand(batch, size, size).astype(dtype)
+    y_val = rng.rand(batch, size, size).astype(dtype)
+    f(x_val, y_val)
+    best = np.inf
+    for _ in range(iters):
+        t0 = time.perf_counter()
+        f(x_val, y_val)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(batch, sizes, iters):
+    print(f"blas__ldflags={config.blas__ldflags} floatX={config.floatX}")
+    print(f"Time of {batch} products of (size, size) matrices")
+    print("size  small loop (s)  gemm (s)  speedup")
+    for size in sizes:
+        small = time_batched_dot(batch, size, size, iters)
+        gemm = time_batched_dot(batch, size, 0, iters)
+        print(f"{size:4d}  {small:14.3g}  {gemm:8.3g}  {gemm / small:7.2f}")
+
+
+if __name__ == "__main__":
+    parser = OptionParser(usage="%prog <options>\nTime BatchedDot on small matrices")
+    parser.add_option(
+        "-B", "--batch", action="store", dest="batch", default=10000, type="int"
+    )
+    parser.add_option(
+        "-i", "--iter", action="store", dest="iters", default=10, type="int"
+    )
+    options, arguments = parser.parse_args()
+    main(options.batch, [2, 4, 8, 12, 16, 24, 32, 48, 64], options.iters)
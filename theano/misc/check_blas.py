@@ -175,6 +175,31 @@ parser.add_option(
     type="int",
     help="The M, N, and K for big gemm",
 )
+parser.add_option(
+    "--calibrate",
+    action="store_true",
+    dest="calibrate",
+    default=False,
+    help="Measure whether the C or the NumPy/SciPy BLAS is the fastest for "
+    "gemm, gemv and ger at several sizes and store the result in the "
+    "compiledir (used when the Theano flag blas__autotune is True)",
+)
+
+
+def calibrate():
+    from theano.tensor import blas_calibration
+
+    for op_name in ("gemm", "gemv", "ger"):
+        for dtype in ("float32", "float64"):
+            entry = blas_calibration.calibrate(op_name, dtype)
+            bounds = blas_calibration.SIZE_CLASS_BOUNDS
+            for c, provider in sorted(entry.items()):
+                if c < len(bounds):
+                    sizes = f"<= {bounds[c]}"
+                else:
+                    sizes = f"> {bounds[-1]}"
+                print(f"{op_name} {dtype} size {sizes}: {provider}")
+    print(f"Saved in {blas_calibration.calibration.path()}")
 
 
 if __name__ == "__main__":
@@ -183,6 +208,9 @@ if __name__ == "__main__":
     if hasattr(options, "help"):
         print(options.help)
         sys.exit(0)
+    if options.calibrate:
+        calibrate()
+        sys.exit(0)
 
     if not options.quiet:
         print(
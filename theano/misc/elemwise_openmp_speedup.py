@@ -21,6 +21,36 @@ parser.add_option(
     type="int",
     help="Number of vector elements",
 )
+parser.add_option(
+    "--calibrate",
+    action="store_true",
+    dest="calibrate",
+    default=False,
+    help="Measure the OpenMP threshold and number of threads of common "
+    "scalar ops and store them in the compiledir "
+    "(used when the Theano flag openmp_elemwise_autotune is True)",
+)
+
+
+def calibrate():
+    from theano import scalar
+    from theano.tensor import elemwise_openmp
+
+    for scalar_op in (
+        scalar.add,
+        scalar.mul,
+        scalar.true_div,
+        scalar.exp,
+        scalar.log,
+        scalar.tanh,
+    ):
+        for dtype in ("float32", "float64"):
+            entry = elemwise_openmp.calibrate(scalar_op, dtype)
+            print(
+                f"{scalar_op} {dtype}: minsize {entry['minsize']}"
+                f" num_threads {entry['num_threads']}"
+            )
+    print(f"Saved in {elemwise_openmp.calibration.path()}")
 
 
 def runScript(N):
@@ -44,6 +74,9 @@ if __name__ == "__main__":
     if hasattr(options, "help"):
         print(options.help)
         sys.exit(0)
+    if options.calibrate:
+        calibrate()
+        sys.exit(0)
     orig_flags = os.environ.get("THEANO_FLAGS", "")
     os.environ["THEANO_FLAGS"] = orig_flags + ",openmp=false"
     (cheapTime, costlyTime) = runScript(N=options.N)
@@ -6,32 +6,46 @@ import numpy as np
 import theano.tensor as tt
 from theano.configdefaults import config
 from theano.graph.basic import Apply
-from theano.graph.op import COp
+from theano.graph.op import OpenMPOp
 from theano.scalar import Scalar, as_scalar
 
 
-class MultinomialFromUniform(COp):
+class MultinomialFromUniform(OpenMPOp):
     """
     Converts samples from a uniform into sample from a multinomial.
 
+    The multinomials (rows of `pvals`) are independent, so the C code
+    samples them in parallel with OpenMP.
+
     TODO : need description for parameter 'odtype'
     """
 
     __props__ = ("odtype",)
 
-    def __init__(self, odtype):
+    def __init__(self, odtype, openmp=None):
+        super().__init__(openmp=openmp)
         self.odtype = odtype
 
     def __str__(self):
         return f"{self.__class__.__name__}{{{self.odtype}}}"
 
     def __setstate__(self, dct):
-        self.__dict__.update(dct)
+        super().__setstate__(dct)
         try:
             self.odtype
         except AttributeError:
             self.odtype = "auto"
 
+    def omp_rows_pragma(self):
+        """Return the OpenMP pragma of the loop over the multinomials."""
+        self.update_self_openmp()
+        if not self.openmp:
+            return ""
+        return (
+            "#pragma omp parallel for"
+            f" if (nb_multi * nb_outcomes >= {config.openmp_elemwise_minsize})"
+        )
+
     def make_node(self, pvals, unis, n=1):
         pvals = tt.as_tensor_variable(pvals)
         unis = tt.as_tensor_variable(unis)
@@ -57,7 +71,7 @@ class MultinomialFromUniform(COp):
         ]
 
     def c_code_cache_version(self):
-        return (8,)
+        return (9,)
 
     def c_code(self, node, name, ins, outs, sub):
         # support old pickled graphs
@@ -76,6 +90,7 @@ class MultinomialFromUniform(COp):
             else:
                 t = t.upper()
         fail = sub["fail"]
+        omp_pragma = self.omp_rows_pragma()
         return (
             """
         if (PyArray_NDIM(%(pvals)s) != 2)
@@ -121,8 +136,9 @@ class MultinomialFromUniform(COp):
         //
         // For each multinomial, loop over each possible outcome
         //
-        for (int c = 0; c < n_samples; ++c){
-            for (int n = 0; n < nb_multi; ++n)
+        %(omp_pragma)s
+        for (int n = 0; n < nb_multi; ++n){
+            for (int c = 0; c < n_samples; ++c)
             {
                 int waiting = 1;
                 double cummul = 0.;
@@ -207,14 +223,16 @@ class MultinomialFromUniform(COp):
 
         # Vectorized version that is much faster as all the looping is
         # done in C even if this make extra work.
+        # The dtype='float64' is important. Otherwise we don't
+        # have the same answer as the c code as in the c code
+        # the cumul is in double precission.
+        cumsum = pvals.cumsum(axis=1, dtype="float64")
+        rows = np.arange(nb_multi)
         for c in range(n_samples):
-            for n in range(nb_multi):
-                unis_n = unis[c * nb_multi + n]
-                # The dtype='float64' is important. Otherwise we don't
-                # have the same answer as the c code as in the c code
-                # the cumul is in double precission.
-                cumsum = pvals[n].cumsum(dtype="float64")
-                z[0][n, np.searchsorted(cumsum, unis_n)] += 1
+            unis_c = unis[c * nb_multi : (c + 1) * nb_multi]
+            # Same as `np.searchsorted(cumsum[n], unis_c[n])` for each row
+            outcomes = (cumsum < unis_c[:, None]).sum(axis=1)
+            np.add.at(z[0], (rows, outcomes), 1)
 
 
 class ChoiceFromUniform(MultinomialFromUniform):
@@ -234,7 +252,7 @@ class ChoiceFromUniform(MultinomialFromUniform):
         super().__init__(odtype=odtype, *args, **kwargs)
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        super().__setstate__(state)
         if "replace" not in state:
             self.replace = False
 
@@ -253,7 +271,7 @@ class ChoiceFromUniform(MultinomialFromUniform):
         return Apply(self, [pvals, unis, as_scalar(n)], [out])
 
     def c_code_cache_version(self):
-        return (1,)
+        return (2,)
 
     def c_code(self, node, name, ins, outs, sub):
         (pvals, unis, n) = ins
@@ -268,6 +286,7 @@ class ChoiceFromUniform(MultinomialFromUniform):
             else:
                 t = t.upper()
         fail = sub["fail"]
+        omp_pragma = self.omp_rows_pragma()
         return (
             """
         // create a copy of pvals matrix
@@ -338,8 +357,9 @@ class ChoiceFromUniform(MultinomialFromUniform):
         // For each multinomial, loop over each possible outcome,
         // and set selected pval to 0 after being selected
         //
-        for (int c = 0; c < n_samples; ++c){
-            for (int n = 0; n < nb_multi; ++n)
+        %(omp_pragma)s
+        for (int n = 0; n < nb_multi; ++n){
+            for (int c = 0; c < n_samples; ++c)
             {
                 double cummul = 0.;
                 const dtype_%(unis)s* unis_n = (dtype_%(unis)s*)PyArray_GETPTR1(%(unis)s, c*nb_multi + n);
@@ -415,24 +435,23 @@ class ChoiceFromUniform(MultinomialFromUniform):
             z[0] = -1 * np.ones((pvals.shape[0], n_samples), dtype=odtype)
 
         nb_multi = pvals.shape[0]
-        nb_outcomes = pvals.shape[1]
+        rows = np.arange(nb_multi)
 
-        # For each multinomial, loop over each possible outcome,
-        # and set selected pval to 0 after being selected
+        # For all the multinomials at once, find the first outcome whose
+        # cumulative probability is above the uniform, and set its pval to
+        # 0 after being selected
         for c in range(n_samples):
-            for n in range(nb_multi):
-                cummul = 0
-                unis_n = unis[c * nb_multi + n]
-                for m in range(nb_outcomes):
-                    cummul += pvals[n, m]
-                    if cummul > unis_n:
-                        z[0][n, c] = m
-                        # set to zero and re-normalize so that it's not
-                        # selected again
-                        if not self.replace:
-                            pvals[n, m] = 0.0
-                            pvals[n] /= pvals[n].sum()
-                        break
+            unis_c = unis[c * nb_multi : (c + 1) * nb_multi]
+            cummul = pvals.cumsum(axis=1)
+            above = cummul > unis_c[:, None]
+            found = above.any(axis=1)
+            outcomes = above.argmax(axis=1)[found]
+            z[0][rows[found], c] = outcomes
+            # set to zero and re-normalize so that it's not
+            # selected again
+            if not self.replace:
+                pvals[rows[found], outcomes] = 0.0
+                pvals[found] /= pvals[found].sum(axis=1, keepdims=True)
 
 
 class MultinomialWOReplacementFromUniform(ChoiceFromUniform):
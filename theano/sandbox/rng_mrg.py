@@ -22,7 +22,7 @@ from theano.compile import optdb
 from theano.configdefaults import config
 from theano.gradient import undefined_grad
 from theano.graph.basic import Apply, Constant, Variable
-from theano.graph.op import COp, Op
+from theano.graph.op import COp, Op, OpenMPOp
 from theano.graph.opt import local_optimizer
 from theano.graph.params_type import ParamsType
 from theano.scalar import bool as bool_t
@@ -316,6 +316,38 @@ def mrg_next_value(rstate, new_rstate, NORM, mask, offset):
         return (((x11 - x21) & mask) + offset) * NORM
 
 
+def mrg_next_values(rstate, NORM, mask, offset):
+    """Vectorized `mrg_next_value` over the streams of `rstate`.
+
+    `rstate` is an int32 matrix with one stream per row, which is advanced
+    inplace.  Return the sample of each stream.
+
+    """
+    x11, x12, x13, x21, x22, x23 = rstate.T
+    i0, i7, i9, i15, i16, i22, i24 = np_int32_vals
+
+    def reduce_mod(y, m):
+        return np.where((y < 0) | (y >= m), y - m, y)
+
+    # first component
+    y1 = ((x12 & MASK12) << i22) + (x12 >> i9) + ((x13 & MASK13) << i7) + (x13 >> i24)
+    y1 = reduce_mod(y1, M1)
+    y1 = reduce_mod(y1 + x13, M1)
+    new_x1 = (y1, x11, x12)
+
+    # second component
+    y1 = reduce_mod(((x21 & MASK2) << i15) + (MULT2 * (x21 >> i16)), M2)
+    y2 = reduce_mod(((x23 & MASK2) << i15) + (MULT2 * (x23 >> i16)), M2)
+    y2 = reduce_mod(y2 + x23, M2)
+    y2 = reduce_mod(y2 + y1, M2)
+    new_x2 = (y2, x21, x22)
+
+    rstate[...] = np.stack(new_x1 + new_x2, axis=1)
+    x11, x21 = new_x1[0].astype("int64"), new_x2[0].astype("int64")
+    diff = np.where(x11 <= x21, x11 - x21 + M1, x11 - x21)
+    return ((diff & mask) + offset) * NORM
+
+
 class mrg_uniform_base(Op):
     # TODO : need description for class, parameter
     __props__ = ("output_type", "inplace")
@@ -364,10 +396,14 @@ class mrg_uniform_base(Op):
         return [None for i in eval_points]
 
 
-class mrg_uniform(COp, mrg_uniform_base):
+class mrg_uniform(OpenMPOp, mrg_uniform_base):
     # CPU VERSION
     _f16_ok = True
 
+    def __init__(self, output_type, inplace=False, openmp=None):
+        mrg_uniform_base.__init__(self, output_type, inplace)
+        OpenMPOp.__init__(self, openmp=openmp)
+
     def make_node(self, rstate, size):
         # error checking slightly redundant here, since
         # this op should not be called directly.
@@ -422,25 +458,28 @@ class mrg_uniform(COp, mrg_uniform_base):
             offset = 0
             NORM = 4.656612873077392578125e-10  # 1./2^31
 
-        err_orig = np.seterr(over="ignore")
-        try:
-            for i in range(n_elements):
-                sample = mrg_next_value(
-                    rstate[i % n_streams],
-                    rstate[i % n_streams],
-                    NORM=NORM,
-                    mask=mask,
-                    offset=offset,
+        # Element `i` is drawn from the stream `i % n_streams`, so the
+        # elements are drawn by blocks of one element per stream.
+        with np.errstate(over="ignore"):
+            for start in range(0, n_elements, n_streams):
+                stop = min(start + n_streams, n_elements)
+                rval[start:stop] = mrg_next_values(
+                    rstate[: stop - start], NORM=NORM, mask=mask, offset=offset
                 )
-                rval[i] = sample
-        finally:
-            np.seterr(**err_orig)
 
         # send to GPU if necessary
         o_rstate[0] = node.outputs[0].type.filter(rstate)
         o_sample[0] = node.outputs[1].type.filter(rval.reshape(size))
 
     def c_support_code(self, **kwargs):
+        self.update_self_openmp()
+        omp_pragma = ""
+        if self.openmp:
+            # Only use threads when each of them gets enough samples
+            omp_pragma = (
+                "#pragma omp parallel for schedule(static)"
+                f" if (n_elements >= {config.openmp_elemwise_minsize})"
+            )
         return "\n".join(
             """
         void cpu_rng_mrg_uniform_%(dtype)s(PyArrayObject* o_sample, PyArrayObject* o_rstate,
@@ -462,9 +501,12 @@ class mrg_uniform(COp, mrg_uniform_base):
 
             %(dtype)s* sample_data = (%(dtype)s *) PyArray_DATA(o_sample);
             npy_int32* state_data = (npy_int32 *) PyArray_DATA(o_rstate);
-            for (int i = 0; i < n_elements; ++i)
+            // Element i is drawn from the stream i %% n_streams, so each
+            // stream can be advanced by a different thread.
+            %(omp_pragma)s
+            for (int s = 0; s < n_streams; ++s)
             {
-                npy_int32 * state_data_i = state_data + (i%%n_streams)*6;
+                npy_int32 * state_data_i = state_data + s*6;
                 npy_int32 y1, y2, x11, x12, x13, x21, x22, x23;
 
                 x11 = state_data_i[0];
@@ -474,41 +516,44 @@ class mrg_uniform(COp, mrg_uniform_base):
                 x22 = state_data_i[4];
                 x23 = state_data_i[5];
 
-                y1 = ((x12 & MASK12) << i22) + (x12 >> i9) + ((x13 & MASK13) << i7) + (x13 >> i24);
-                if ((y1 < 0 || y1 >= M1))     //must also check overflow
-                    y1 -= M1;
-                y1 += x13;
-                if ((y1 < 0 or y1 >= M1))
-                    y1 -= M1;
-                x13 = x12;
-                x12 = x11;
-                x11 = y1;
-
-                y1 = ((x21 & MASK2) << i15) + (MULT2 * (x21 >> i16));
-                if (y1 < 0 || y1 >= M2)
-                    y1 -= M2;
-                y2 = ((x23 & MASK2) << i15) + (MULT2 * (x23 >> i16));
-                if (y2 < 0 || y2 >= M2)
-                    y2 -= M2;
-                y2 += x23;
-                if (y2 < 0 || y2 >= M2)
-                    y2 -= M2;
-                y2 += y1;
-                if (y2 < 0 or y2 >= M2)
-                    y2 -= M2;
-
-                x23 = x22;
-                x22 = x21;
-                x21 = y2;
-
-                if (x11 <= x21) {
-                    assert((x11 - x21 + M1) <= M1);
-                    sample_data[i] = (x11 - x21 + M1) * %(NORM)s;
-                }
-                else
+                for (npy_int64 i = s; i < n_elements; i += n_streams)
                 {
-                    assert(x11 - x21 <= M1);
-                    sample_data[i] = (x11 - x21) * %(NORM)s;
+                    y1 = ((x12 & MASK12) << i22) + (x12 >> i9) + ((x13 & MASK13) << i7) + (x13 >> i24);
+                    if ((y1 < 0 || y1 >= M1))     //must also check overflow
+                        y1 -= M1;
+                    y1 += x13;
+                    if ((y1 < 0 or y1 >= M1))
+                        y1 -= M1;
+                    x13 = x12;
+                    x12 = x11;
+                    x11 = y1;
+
+                    y1 = ((x21 & MASK2) << i15) + (MULT2 * (x21 >> i16));
+                    if (y1 < 0 || y1 >= M2)
+                        y1 -= M2;
+                    y2 = ((x23 & MASK2) << i15) + (MULT2 * (x23 >> i16));
+                    if (y2 < 0 || y2 >= M2)
+                        y2 -= M2;
+                    y2 += x23;
+                    if (y2 < 0 || y2 >= M2)
+                        y2 -= M2;
+                    y2 += y1;
+                    if (y2 < 0 or y2 >= M2)
+                        y2 -= M2;
+
+                    x23 = x22;
+                    x22 = x21;
+                    x21 = y2;
+
+                    if (x11 <= x21) {
+                        assert((x11 - x21 + M1) <= M1);
+                        sample_data[i] = (x11 - x21 + M1) * %(NORM)s;
+                    }
+                    else
+                    {
+                        assert(x11 - x21 <= M1);
+                        sample_data[i] = (x11 - x21) * %(NORM)s;
+                    }
                 }
 
                 state_data_i[0]= x11;
@@ -520,7 +565,7 @@ class mrg_uniform(COp, mrg_uniform_base):
             }
         }
         """
-            % dict(dtype=dtype, NORM=NORM)
+            % dict(dtype=dtype, NORM=NORM, omp_pragma=omp_pragma)
             for dtype, NORM in (
                 ("npy_float32", "4.6566126e-10f"),
                 ("npy_float64", "4.656612873077392578125e-10"),
@@ -656,7 +701,7 @@ class mrg_uniform(COp, mrg_uniform_base):
         )
 
     def c_code_cache_version(self):
-        return (10,)
+        return (11,)
 
 
 def guess_n_streams(size, warn=False):
@@ -690,6 +690,81 @@ class Scalar(CType):
                 + operator_mul
             )
 
+        elif self.dtype == "float16":
+            # npy_float16 is an integer type holding the bits of the
+            # value, computations on it are done in float32. We do not use
+            # the NumPy npymath functions as we do not link with it.
+            return """
+            #ifndef THEANO_HALF_CONVERSIONS
+            #define THEANO_HALF_CONVERSIONS
+            static inline npy_float32 theano_half_to_float(npy_uint16 h)
+            {
+                npy_uint32 sign = ((npy_uint32)(h & 0x8000u)) << 16;
+                npy_uint32 exponent = (h >> 10) & 0x1fu;
+                npy_uint32 mantissa = h & 0x3ffu;
+                npy_uint32 bits;
+                npy_float32 f;
+                if (exponent == 0) {
+                    if (mantissa == 0) {
+                        bits = sign;
+                    } else {
+                        // Subnormal half, normal float
+                        exponent = 127 - 15 + 1;
+                        while (!(mantissa & 0x400u)) {
+                            mantissa <<= 1;
+                            exponent--;
+                        }
+                        bits = sign | (exponent << 23) | ((mantissa & 0x3ffu) << 13);
+                    }
+                } else if (exponent == 0x1f) {
+                    // inf or nan
+                    bits = sign | 0x7f800000u | (mantissa << 13);
+                } else {
+                    bits = sign | ((exponent + 127 - 15) << 23) | (mantissa << 13);
+                }
+                memcpy(&f, &bits, sizeof(f));
+                return f;
+            }
+
+            // Round to nearest even, like NumPy.
+            static inline npy_uint16 theano_float_to_half(npy_float32 f)
+            {
+                npy_uint32 bits;
+                memcpy(&bits, &f, sizeof(bits));
+                npy_uint16 sign = (bits >> 16) & 0x8000u;
+                npy_uint32 abs_bits = bits & 0x7fffffffu;
+                npy_uint32 h, rem, halfway;
+                if (abs_bits >= 0x7f800000u) {
+                    // inf or nan, keep nan as quiet nan
+                    if (abs_bits == 0x7f800000u)
+                        return sign | 0x7c00u;
+                    return sign | 0x7e00u | ((abs_bits >> 13) & 0x3ffu);
+                }
+                if (abs_bits >= 0x477ff000u) {
+                    // Round to inf
+                    return sign | 0x7c00u;
+                }
+                if (abs_bits < 0x38800000u) {
+                    // Subnormal half or zero
+                    if (abs_bits < 0x33000000u)
+                        return sign;
+                    npy_uint32 shift = 126 - (abs_bits >> 23);
+                    npy_uint32 mantissa = (abs_bits & 0x7fffffu) | 0x800000u;
+                    h = mantissa >> shift;
+                    rem = mantissa & ((1u << shift) - 1);
+                    halfway = 1u << (shift - 1);
+                } else {
+                    h = (abs_bits - 0x38000000u) >> 13;
+                    rem = abs_bits & 0x1fffu;
+                    halfway = 0x1000u;
+                }
+                if (rem > halfway || (rem == halfway && (h & 1)))
+                    h++;
+                return sign | (npy_uint16)h;
+            }
+            #endif
+            """
+
         else:
             return ""
 
@@ -697,7 +772,7 @@ class Scalar(CType):
         return ["import_array();"]
 
     def c_code_cache_version(self):
-        return (13, np.__version__)
+        return (14, np.__version__)
 
     def get_shape_info(self, obj):
         return obj.itemsize
@@ -54,6 +54,6 @@ configdefaults.add_scan_configvars()
 
 from theano.scan import opt
 from theano.scan.basic import scan
-from theano.scan.checkpoints import scan_checkpoints
+from theano.scan.checkpoints import scan_checkpoints, scan_recompute
 from theano.scan.utils import clone, until
 from theano.scan.views import foldl, foldr, map, reduce
@@ -1,5 +1,69 @@
+from collections import OrderedDict
+
+import numpy as np
+
 import theano
-from theano.tensor.basic import Join
+from theano.compile.builders import OpFromGraph
+from theano.compile.sharedvalue import SharedVariable
+from theano.gradient import DisconnectedType, disconnected_grad, grad
+from theano.graph.basic import Constant, graph_inputs
+from theano.scan.utils import clone
+from theano.tensor.basic import (
+    Join,
+    NotScalarConstantError,
+    float_dtypes,
+    get_scalar_constant_value,
+)
+
+
+def checkpoint_intervals(n_steps, memory_budget):
+    """
+    Return the ``save_every_N`` of each level of a checkpointing schedule.
+
+    With ``L`` nested levels of checkpoints, the steps are split in ``f``
+    segments, each split in ``f`` sub-segments and so on, with
+    ``f = ceil(n_steps ** (1 / (L + 1)))``. The backward pass then keeps
+    about ``(L + 1) * f`` step states in memory at once and recomputes the
+    forward pass ``L`` times. This returns the schedule with the fewest
+    levels that keeps at most `memory_budget` states, which is the one with
+    the least recomputation. When the budget can not be met, the schedule
+    that uses the least memory is returned.
+
+    Parameters
+    ----------
+    n_steps : int
+        The number of steps of the scan.
+    memory_budget : int
+        The maximum number of step states to keep in memory at once.
+
+    Returns
+    -------
+    list of int
+        The number of steps of a segment at each level, from the outermost
+        one. It is empty when all the steps fit in the budget.
+
+    """
+    if memory_budget < 2:
+        raise ValueError("memory_budget must be at least 2")
+    if n_steps <= memory_budget:
+        return []
+    n_levels = 1
+    while True:
+        fanout = int(np.ceil(n_steps ** (1.0 / (n_levels + 1))))
+        # Protect against rounding errors of the root
+        while fanout ** (n_levels + 1) < n_steps:
+            fanout += 1
+        while fanout > 1 and (fanout - 1) ** (n_levels + 1) >= n_steps:
+            fanout -= 1
+        if (n_levels + 1) * fanout <= memory_budget or fanout <= 2:
+            break
+        n_levels += 1
+    intervals = []
+    length = n_steps
+    for _ in range(n_levels):
+        length = -(-length // fanout)
+        intervals.append(length)
+    return intervals
 
 
 def scan_checkpoints(
@@ -11,6 +75,7 @@ def scan_checkpoints(
     n_steps=None,
     save_every_N=10,
     padding=True,
+    memory_budget=None,
 ):
     """Scan function that uses less memory, but is more restrictive.
 
@@ -28,10 +93,7 @@ def scan_checkpoints(
     * Every sequence has the same length.
     * If ``n_steps`` is specified, it has the same value as the length of
       any sequence.
-    * The value of ``save_every_N`` divides the number of steps the scan
-      will run without remainder.
-    * Only singly-recurrent and non-recurrent outputs are used.
-      No multiple recurrences.
+    * Sequences have no taps.
     * Only the last timestep of any output will ever be used.
 
     Parameters
@@ -76,6 +138,15 @@ def scan_checkpoints(
         avoided by setting ``padding`` to False, but you need to make
         sure the length of the sequences is a multple of ``save_every_N``.
 
+    memory_budget
+        If given, ``save_every_N`` is ignored and chosen automatically so
+        that the gradient computation keeps at most ``memory_budget`` step
+        states in memory at once. When the number of steps is known at
+        graph construction time, the checkpoints are nested on as many
+        levels as needed to meet the budget (see `checkpoint_intervals`).
+        Otherwise, a single level of checkpoints every ``sqrt(n_steps)``
+        steps is used, which keeps about ``2 * sqrt(n_steps)`` states.
+
     Returns
     -------
     tuple
@@ -83,7 +154,9 @@ def scan_checkpoints(
         with a small change: It only contain the output at each
         ``save_every_N`` step. The time steps that are not returned by
         this function will be recomputed during the gradient computation
-        (if any).
+        (if any). With ``memory_budget``, the number of checkpoints depends
+        on the budget, so only the output of the last step is returned, as
+        a sequence of length 1, whether checkpoints are used or not.
 
     See Also
     --------
@@ -104,15 +177,84 @@ def scan_checkpoints(
     elif not isinstance(non_sequences, list):
         non_sequences = [non_sequences]
 
-    # Check that outputs_info has no taps:
-    for element in outputs_info:
-        if isinstance(element, dict) and "taps" in element:
-            raise RuntimeError("scan_checkpoints doesn't work with taps.")
+    # Check that sequences have no taps:
+    for element in sequences:
+        if isinstance(element, dict):
+            raise RuntimeError("scan_checkpoints doesn't work with sequence taps.")
 
     # Determine how many steps the original scan would run
     if n_steps is None:
         n_steps = sequences[0].shape[0]
 
+    if memory_budget is None:
+        intervals = [save_every_N]
+    else:
+        try:
+            intervals = checkpoint_intervals(
+                int(get_scalar_constant_value(n_steps)), memory_budget
+            )
+        except NotScalarConstantError:
+            intervals = [
+                theano.tensor.cast(
+                    theano.tensor.ceil(theano.tensor.sqrt(n_steps)), "int64"
+                )
+            ]
+
+    if intervals:
+        results, updates = _scan_checkpoints(
+            fn,
+            sequences,
+            outputs_info,
+            non_sequences,
+            name,
+            n_steps,
+            intervals,
+            padding,
+        )
+        # The states of outputs with several taps hold their last steps
+        results = [
+            r[:, -1] if _output_taps(info) else r
+            for r, info in zip(results, outputs_info)
+        ]
+    else:
+        # Everything fits in memory
+        results, updates = theano.scan(
+            fn=fn,
+            sequences=sequences,
+            outputs_info=outputs_info,
+            non_sequences=non_sequences,
+            name=name,
+            n_steps=n_steps,
+        )
+        results = _as_list(results)
+    if memory_budget is not None:
+        results = [r[-1:] for r in results]
+
+    if len(results) == 1:
+        results = results[0]
+    return results, updates
+
+
+def _output_taps(info):
+    # The taps of an output with more than the last step as state, or None
+    if isinstance(info, dict) and info.get("taps", [-1]) != [-1]:
+        return info["taps"]
+    return None
+
+
+def _output_initial(info):
+    if isinstance(info, dict):
+        return info.get("initial")
+    return info
+
+
+def _scan_checkpoints(
+    fn, sequences, outputs_info, non_sequences, name, n_steps, intervals, padding
+):
+    # Scan with a level of checkpoints every `intervals[0]` steps, whose
+    # segments are computed with checkpoints every `intervals[1]` steps, ...
+    save_every_N = intervals[0]
+
     # Compute the number of steps of the outer scan
     o_n_steps = theano.tensor.cast(theano.tensor.ceil(n_steps / save_every_N), "int64")
 
@@ -126,39 +268,64 @@ def scan_checkpoints(
     if padding:
         # Since padding could be an empty tensor, Join returns a view of s.
         join = Join(view=0)
+        sequences = list(sequences)
         for i, s in enumerate(sequences):
-            n = s.shape[0] % save_every_N
-            z = theano.tensor.zeros((n, s.shape[1:]), dtype=s.dtype)
-            sequences[i] = join(0, [s, z])
+            n = (-s.shape[0]) % save_every_N
+            z = theano.tensor.zeros(
+                [n] + [s.shape[j] for j in range(1, s.ndim)], dtype=s.dtype
+            )
+            sequences[i] = join(0, s, z)
 
     # Establish the input variables of the outer scan
     o_sequences = [
         s.reshape(
-            [s.shape[0] / save_every_N, save_every_N]
+            [s.shape[0] // save_every_N, save_every_N]
             + [s.shape[i] for i in range(1, s.ndim)],
             s.ndim + 1,
         )
         for s in sequences
     ]
     o_sequences.append(i_n_steps)
-    new_nitsots = [i for i in outputs_info if i is None]
     o_nonsequences = non_sequences
 
+    # The outer scan carries the state of each recurrent output from one
+    # segment to the next. It is the last step of the output, or the last
+    # steps of it when it has several taps.
+    o_outputs_info = [_output_initial(info) for info in outputs_info]
+    n_recurrent = len([i for i in o_outputs_info if i is not None])
+
     def outer_step(*args):
         # Separate the received arguments into their respective (seq, outputs
         # from previous iterations, nonseqs) categories
         i_sequences = list(args[: len(o_sequences)])
-        i_prev_outputs = list(args[len(o_sequences) : -len(o_nonsequences)])
-        i_non_sequences = list(args[-len(o_nonsequences) :])
-        i_outputs_infos = (
-            i_prev_outputs
-            + [
-                None,
-            ]
-            * len(new_nitsots)
-        )
+        i_prev_outputs = list(args[len(o_sequences) : len(o_sequences) + n_recurrent])
+        i_non_sequences = list(args[len(o_sequences) + n_recurrent :])
+        # Keep the order of the recurrent and non recurrent outputs
+        i_prev_states = [
+            None if info is None else i_prev_outputs.pop(0) for info in o_outputs_info
+        ]
+        i_outputs_infos = [
+            {"initial": state, "taps": _output_taps(info)}
+            if _output_taps(info)
+            else state
+            for state, info in zip(i_prev_states, outputs_info)
+        ]
 
         # Call the user-provided function with the proper arguments
+        if len(intervals) > 1:
+            results, updates = _scan_checkpoints(
+                fn,
+                i_sequences[:-1],
+                i_outputs_infos,
+                i_non_sequences,
+                name + "_inner",
+                i_sequences[-1],
+                intervals[1:],
+                padding,
+            )
+            # The results are already the states at the end of each segment
+            return [r[-1] for r in results], updates
+
         results, updates = theano.scan(
             fn=fn,
             sequences=i_sequences[:-1],
@@ -167,23 +334,302 @@ def scan_checkpoints(
             name=name + "_inner",
             n_steps=i_sequences[-1],
         )
-        if not isinstance(results, list):
-            results = [results]
 
-        # Keep only the last timestep of every output but keep all the updates
-        if not isinstance(results, list):
-            return results[-1], updates
-        else:
-            return [r[-1] for r in results], updates
+        # Keep only the state at the end of the segment but keep all the
+        # updates
+        states = []
+        for r, state, info in zip(_as_list(results), i_prev_states, outputs_info):
+            taps = _output_taps(info)
+            if taps:
+                n_taps = -min(taps)
+                states.append(theano.tensor.join(0, state, r)[-n_taps:])
+            else:
+                states.append(r[-1])
+        return states, updates
 
     results, updates = theano.scan(
         fn=outer_step,
         sequences=o_sequences,
-        outputs_info=outputs_info,
+        outputs_info=o_outputs_info,
         non_sequences=o_nonsequences,
         name=name + "_outer",
         n_steps=o_n_steps,
         allow_gc=True,
     )
 
-    return results, updates
+    return _as_list(results), updates
+
+
+def scan_recompute(
+    fn,
+    sequences=None,
+    outputs_info=None,
+    non_sequences=None,
+    name="recomputescan_fn",
+    n_steps=None,
+    inverse_fn=None,
+    save_every_N=None,
+):
+    """Scan returning its last states, whose gradient recomputes the others.
+
+    The forward pass is a plain :func:`~theano.scan`, so it runs as fast as
+    one, but only the states after the last step are returned. The gradient
+    does not use the states of the other steps: they are recomputed while
+    going backward through the steps.
+
+    * If `inverse_fn` is given, the states before each step are computed
+      from the ones after it, starting from the last states. The gradient
+      then keeps the states of a single step in memory.
+    * Otherwise, the gradient first runs the steps again, keeping their
+      states every `save_every_N` steps, and then recomputes the states of
+      each segment before going backward through it, as `scan_checkpoints`
+      does.
+
+    The assumptions of `scan_checkpoints` hold, and every output must be
+    recurrent: `fn` returns exactly the new states.
+
+    Parameters
+    ----------
+    fn, sequences, outputs_info, non_sequences, name, n_steps
+        As in :func:`~theano.scan`. The variables used by `fn` that are
+        neither shared variables nor passed in `sequences`, `outputs_info`
+        or `non_sequences` must not depend on them.
+    inverse_fn
+        A function taking the same arguments as `fn`, except that the states
+        are the ones returned by `fn`, and returning the states `fn` was
+        given.
+    save_every_N
+        The number of steps between two checkpoints, when `inverse_fn` is
+        None. Defaults to ``ceil(sqrt(n_steps))``, which keeps about
+        ``2 * sqrt(n_steps)`` states in memory.
+
+    Returns
+    -------
+    tuple
+        Tuple of the form ``(outputs, updates)`` as in :func:`~theano.scan`,
+        but `outputs` are the states after the last step.
+
+    Examples
+    --------
+    >>> def step(x_t, h_tm1, W):
+    ...     return h_tm1 + tt.tanh(tt.dot(x_t, W))
+    >>> def inverse_step(x_t, h_t, W):
+    ...     return h_t - tt.tanh(tt.dot(x_t, W))
+    >>> h_last, _ = scan_recompute(
+    ...     step,
+    ...     sequences=x,
+    ...     outputs_info=h0,
+    ...     non_sequences=W,
+    ...     inverse_fn=inverse_step,
+    ... )
+
+    """
+    tt = theano.tensor
+
+    if sequences is None:
+        sequences = []
+    elif not isinstance(sequences, list):
+        sequences = [sequences]
+    single_output = not isinstance(outputs_info, list)
+    if single_output:
+        outputs_info = [outputs_info]
+    if non_sequences is None:
+        non_sequences = []
+    elif not isinstance(non_sequences, list):
+        non_sequences = [non_sequences]
+
+    for element in outputs_info:
+        if element is None or isinstance(element, dict):
+            raise RuntimeError(
+                "scan_recompute only works with recurrent outputs without taps."
+            )
+    sequences = [tt.as_tensor_variable(x) for x in sequences]
+    outputs_info = [tt.as_tensor_variable(x) for x in outputs_info]
+    non_sequences = [tt.as_tensor_variable(x) for x in non_sequences]
+    if n_steps is None:
+        n_steps = sequences[0].shape[0]
+    explicit = sequences + outputs_info + non_sequences
+    if not isinstance(n_steps, Constant):
+        n_steps = tt.as_tensor_variable(n_steps)
+        explicit.append(n_steps)
+    n_seqs = len(sequences)
+    n_outs = len(outputs_info)
+    n_explicit = len(explicit)
+
+    results, updates = theano.scan(
+        fn=fn,
+        sequences=sequences,
+        outputs_info=outputs_info,
+        non_sequences=non_sequences,
+        name=name,
+        n_steps=n_steps,
+    )
+    if updates:
+        raise ValueError("scan_recompute does not support updates.")
+    if not isinstance(results, list):
+        results = [results]
+    last = [r[-1] for r in results]
+
+    # The other variables of the graph, except the shared variables that
+    # `OpFromGraph` handles itself, are inputs of `op` as well.
+    implicit = [
+        var
+        for var in graph_inputs(last, blockers=explicit)
+        if var not in explicit and not isinstance(var, (Constant, SharedVariable))
+    ]
+
+    def lop(inputs, outputs, output_grads):
+        # `inputs` are the inner inputs of `op`, followed by inputs for its
+        # shared variables. `fn` uses the outer variables of the inputs
+        # that were not passed explicitly.
+        seqs = inputs[:n_seqs]
+        inits = inputs[n_seqs : n_seqs + n_outs]
+        non_seqs = inputs[n_seqs + n_outs : n_seqs + n_outs + len(non_sequences)]
+        steps = inputs[n_explicit - 1] if n_steps in explicit else n_steps
+        outer_implicit = op.inputs[n_explicit:] + op.shared_inputs
+        wrt_seqs = [x for x in seqs if x.dtype in float_dtypes]
+        wrt_params = [x for x in non_seqs + outer_implicit if x.dtype in float_dtypes]
+
+        if inverse_fn is None:
+            grads = _checkpoint_grads(
+                fn,
+                seqs,
+                inits,
+                non_seqs,
+                steps,
+                output_grads,
+                wrt_seqs + inits + wrt_params,
+                name,
+                save_every_N,
+            )
+        else:
+            grads = _inverse_grads(
+                fn,
+                inverse_fn,
+                seqs,
+                outputs,
+                non_seqs,
+                steps,
+                output_grads,
+                wrt_seqs,
+                wrt_params,
+                name,
+            )
+        grads_of = dict(zip(wrt_seqs + inits + wrt_params, grads))
+        grads = [
+            grads_of.get(x, DisconnectedType()())
+            for x in inputs[:n_explicit] + outer_implicit
+        ]
+        if outer_implicit:
+            # `op` is given the inner variables of the implicit inputs
+            grads = clone(
+                grads, replace=OrderedDict(zip(outer_implicit, inputs[n_explicit:]))
+            )
+        return list(grads)
+
+    op = OpFromGraph(
+        explicit + implicit,
+        last,
+        inline=True,
+        lop_overrides=lop,
+        on_unused_input="ignore",
+    )
+    outputs = op(*(explicit + implicit), return_list=True)
+    if single_output:
+        outputs = outputs[0]
+    return outputs, updates
+
+
+def _as_list(x):
+    return list(x) if isinstance(x, (list, tuple)) else [x]
+
+
+def _checkpoint_grads(
+    fn, seqs, inits, non_seqs, steps, output_grads, wrt, name, save_every_N
+):
+    # Gradients of the last states with respect to `wrt`, through a scan
+    # with checkpoints every `save_every_N` steps.
+    tt = theano.tensor
+    if save_every_N is None:
+        save_every_N = tt.cast(tt.ceil(tt.sqrt(steps)), "int64")
+    results, _ = _scan_checkpoints(
+        fn, seqs, inits, non_seqs, name + "_grad", steps, [save_every_N], True
+    )
+    last = [r[-1] for r in results]
+    return grad(
+        None,
+        wrt,
+        known_grads=OrderedDict(zip(last, output_grads)),
+        disconnected_inputs="ignore",
+        return_disconnected="Disconnected",
+    )
+
+
+def _inverse_grads(
+    fn,
+    inverse_fn,
+    seqs,
+    last_states,
+    non_seqs,
+    steps,
+    output_grads,
+    wrt_seqs,
+    wrt_params,
+    name,
+):
+    # Gradients of the last states with respect to `wrt_seqs`, the initial
+    # states and `wrt_params`, through a backward scan that recomputes the
+    # states of each step with `inverse_fn`.
+    tt = theano.tensor
+    n_seqs = len(seqs)
+    n_outs = len(last_states)
+    n_params = len(wrt_params)
+
+    def step(*args):
+        xs = list(args[:n_seqs])
+        hs = list(args[n_seqs : n_seqs + n_outs])
+        gs = list(args[n_seqs + n_outs : n_seqs + 2 * n_outs])
+        accs = list(args[n_seqs + 2 * n_outs : n_seqs + 2 * n_outs + n_params])
+        ws = list(args[n_seqs + 2 * n_outs + n_params :])
+        inner = dict(zip(seqs + non_seqs, xs + ws))
+
+        # The recomputed states are inputs of the step: the gradient must
+        # not flow back through `inverse_fn`, or `fn` would only see that
+        # it gives back its own states.
+        h_prev = [disconnected_grad(h) for h in _as_list(inverse_fn(*(xs + hs + ws)))]
+        h_next = _as_list(fn(*(xs + h_prev + ws)))
+        step_wrt = [inner[x] for x in wrt_seqs] + h_prev
+        step_wrt += [inner.get(x, x) for x in wrt_params]
+        step_grads = grad(
+            None,
+            step_wrt,
+            known_grads=OrderedDict(zip(h_next, gs)),
+            disconnected_inputs="ignore",
+            return_disconnected="zero",
+        )
+        g_xs = step_grads[: len(wrt_seqs)]
+        g_hs = step_grads[len(wrt_seqs) : len(wrt_seqs) + n_outs]
+        g_ws = step_grads[len(wrt_seqs) + n_outs :]
+        return h_prev + g_hs + [a + g for a, g in zip(accs, g_ws)] + g_xs
+
+    results, _ = theano.scan(
+        step,
+        sequences=[x[:steps][::-1] for x in seqs],
+        outputs_info=(
+            list(last_states)
+            + list(output_grads)
+            + [tt.zeros_like(x) for x in wrt_params]
+            + [None] * len(wrt_seqs)
+        ),
+        non_sequences=non_seqs,
+        n_steps=steps,
+        name=name + "_inverse_grad",
+    )
+    results = _as_list(results)
+    g_inits = [r[-1] for r in results[n_outs : 2 * n_outs]]
+    g_params = [r[-1] for r in results[2 * n_outs : 2 * n_outs + n_params]]
+    g_seqs = [
+        tt.set_subtensor(tt.zeros_like(x)[:steps], r[::-1])
+        for x, r in zip(wrt_seqs, results[2 * n_outs + n_params :])
+    ]
+    return g_seqs + g_inits + g_params
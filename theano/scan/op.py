@@ -100,6 +100,10 @@ __copyright__ = "(c) 2010, Universite de Montreal"
 # Logging function for sending warning or info
 _logger = logging.getLogger("theano.scan.op")
 
+# Number of steps the output buffers of an `as_while` scan can hold when they
+# are first allocated, if ``config.scan__while_growth`` is True.
+WHILE_INITIAL_STEPS = 16
+
 
 class Scan(Op):
     """
@@ -992,6 +996,13 @@ class Scan(Op):
             for out in self.fn.maker.fgraph.outputs
         ]
 
+        # The flags are read once, so the thunk keeps the behavior it was
+        # compiled with.
+        while_growth = self.as_while and config.scan__while_growth
+        record_steps = (
+            isinstance(profile, ScanProfileStats) and config.profiling__scan_steps
+        )
+
         try:
             if impl == "py":
                 raise MissingGXX
@@ -1069,10 +1080,20 @@ class Scan(Op):
                     outs,
                     self,
                     node,
+                    while_growth,
+                    record_steps,
                 )
 
         except (ImportError, MissingGXX):
-            p = self.perform
+
+            def p(node, args, outs):
+                return self.perform(
+                    node,
+                    args,
+                    outs,
+                    while_growth=while_growth,
+                    record_steps=record_steps,
+                )
 
         # default arguments are stored in the closure of `rval`
 
@@ -1252,7 +1273,15 @@ class Scan(Op):
         )
         return list_inputs[offset:]
 
-    def perform(self, node, inputs, output_storage, params=None):
+    def perform(
+        self,
+        node,
+        inputs,
+        output_storage,
+        params=None,
+        while_growth=False,
+        record_steps=False,
+    ):
         """Compute the scan operation in Python.
 
         The `inputs` are packed like this:
@@ -1274,6 +1303,12 @@ class Scan(Op):
 
             Y sequence outputs y_1, y_2, ... y_<self.n_outs>
 
+        If `while_growth` is True, the outputs of an `as_while` scan that keep
+        all their steps start with a small buffer that is grown as the loop
+        goes (see ``config.scan__while_growth``). If `record_steps` is True,
+        the time of each iteration is recorded in the profile of the inner
+        function (see ``config.profiling__scan_steps``).
+
         """
         # 1. Unzip the number of steps and sequences. If number of steps is
         # negative flip sequences around, and make n_steps positive
@@ -1328,6 +1363,20 @@ class Scan(Op):
         ]
         if not getattr(self, "destroy_map", None):
             self.destroy_map = OrderedDict()
+        # The outputs that are not kept in a ring buffer, as they store all
+        # the steps, can start with a small buffer that is grown as the loop
+        # goes if the loop can stop early.
+        grow = [False] * len(store_steps)
+        if self.as_while and while_growth:
+            for idx in range(self.n_mit_mot, self.n_outs + self.n_nit_sot):
+                grow[idx] = (
+                    store_steps[idx] == n_steps - self.mintaps[idx]
+                    and idx not in self.destroy_map
+                )
+        capacity = [
+            min(store, -mintap + WHILE_INITIAL_STEPS) if g else store
+            for store, mintap, g in zip(store_steps, self.mintaps, grow)
+        ]
         # 2.1 Create storage space for outputs
         for idx in range(self.n_outs):
             if idx in self.destroy_map:
@@ -1342,13 +1391,16 @@ class Scan(Op):
             ):
                 # Put in the values of the initial state
                 output_storage[idx][0] = output_storage[idx][0][: store_steps[idx]]
+                capacity[idx] = store_steps[idx]
                 if idx > self.n_mit_mot:
                     l = -self.mintaps[idx]
                     output_storage[idx][0][:l] = inputs[self.seqs_arg_offset + idx][:l]
                 else:
                     output_storage[idx][0][:] = inputs[self.seqs_arg_offset + idx]
             else:
-                output_storage[idx][0] = inputs[self.seqs_arg_offset + idx].copy()
+                output_storage[idx][0] = inputs[self.seqs_arg_offset + idx][
+                    : capacity[idx]
+                ].copy()
 
         offset = self.nit_sot_arg_offset + self.n_nit_sot
         other_args = inputs[offset:]
@@ -1368,11 +1420,27 @@ class Scan(Op):
         for idx in range(len(other_args)):
             inner_input_storage[idx + offset].storage[0] = other_args[idx]
 
+        profile = getattr(self.fn.maker, "profile", None)
+        record_steps = record_steps and isinstance(profile, ScanProfileStats)
+        step_times = []
+        t_copy = 0
+
         i = 0
         cond = True
         # ############# THE MAIN LOOP ##############
         # for i in range(n_steps):
         while (i < n_steps) and cond:
+            if record_steps:
+                t0_step = time.time()
+            # 2.2 Grow the buffers that are full, doubling their capacity
+            for idx in range(self.n_mit_mot, self.n_outs + self.n_nit_sot):
+                if grow[idx] and pos[idx] >= capacity[idx] and i > 0:
+                    old = output_storage[idx][0]
+                    capacity[idx] = min(store_steps[idx], 2 * capacity[idx])
+                    shape = (capacity[idx],) + old.shape[1:]
+                    output_storage[idx][0] = node.outputs[idx].type.value_zeros(shape)
+                    output_storage[idx][0][: pos[idx]] = old[: pos[idx]]
+                    del old
             # sequences over which scan iterates
             # 3. collect input slices
             for idx in range(self.n_seqs):
@@ -1423,21 +1491,28 @@ class Scan(Op):
                     offset += 1
 
             # 4.2. Collect slices for mitsots, sitsots and nitsots
-            if i != 0:
-                for idx in range(self.n_outs + self.n_nit_sot - self.n_mit_mot):
-                    if (
-                        store_steps[idx + self.n_mit_mot] == 1
-                        or self.vector_outs[idx + self.n_mit_mot]
-                    ):
-                        inner_output_storage[idx + offset].storage[0] = None
-                    else:
-                        _pos0 = idx + self.n_mit_mot
-                        inner_output_storage[idx + offset].storage[0] = output_storage[
-                            _pos0
-                        ][0][pos[_pos0]]
-            else:
-                for idx in range(self.n_outs + self.n_nit_sot - self.n_mit_mot):
+            # The output buffers are used as ring buffers: each step writes
+            # its outputs directly in the next slot, unless that slot still
+            # holds one of the taps read by this step.  The buffers of the
+            # nitsots are only allocated after the first step, once their
+            # shape is known.
+            for idx in range(self.n_outs + self.n_nit_sot - self.n_mit_mot):
+                _pos0 = idx + self.n_mit_mot
+                preallocate = store_steps[_pos0] > -self.mintaps[_pos0] and (
+                    i != 0 or _pos0 < self.n_outs
+                )
+                if not preallocate:
                     inner_output_storage[idx + offset].storage[0] = None
+                elif self.vector_outs[_pos0]:
+                    # Taps of vector outputs are read as 0-d views, so
+                    # write them the same way
+                    inner_output_storage[idx + offset].storage[0] = output_storage[
+                        _pos0
+                    ][0][pos[_pos0] : pos[_pos0] + 1].reshape(())
+                else:
+                    inner_output_storage[idx + offset].storage[0] = output_storage[
+                        _pos0
+                    ][0][pos[_pos0]]
 
             # 4.3. Collect slices for shared outputs
             offset += self.n_outs + self.n_nit_sot - self.n_mit_mot
@@ -1534,6 +1609,8 @@ class Scan(Op):
 
             t_fn += dt_fn
             offset_out = 0
+            if record_steps:
+                t0_copy = time.time()
 
             # 5.3 Copy over the values for mit_mot outputs
             mitmot_inp_offset = 0
@@ -1586,7 +1663,7 @@ class Scan(Op):
             for j in range(begin, end):
 
                 # Copy the output value to `outs`, if necessary
-                if store_steps[j] == 1 or self.vector_outs[j]:
+                if old_inner_output_storage[offset_out + j] is None:
                     output_storage[j][0][pos[j]] = inner_output_storage[
                         offset_out + j
                     ].storage[0]
@@ -1633,21 +1710,19 @@ class Scan(Op):
 
                 if i == 0:
                     jout = j + offset_out
-                    shape = (store_steps[j],) + inner_output_storage[jout].storage[
-                        0
-                    ].shape
+                    shape = (capacity[j],) + inner_output_storage[jout].storage[0].shape
                     dtype = inner_output_storage[jout].storage[0].dtype
                     if (
                         output_storage[j][0] is None
-                        or output_storage[j][0].shape[0] < store_steps[j]
+                        or output_storage[j][0].shape[0] < capacity[j]
                         or output_storage[j][0].shape[1:] != shape[1:]
                         or output_storage[j][0].dtype != dtype
                     ):
                         output_storage[j][0] = node.outputs[j].type.value_zeros(shape)
-                    elif output_storage[j][0].shape[0] != store_steps[j]:
-                        output_storage[j][0] = output_storage[j][0][: store_steps[j]]
+                    elif output_storage[j][0].shape[0] != capacity[j]:
+                        output_storage[j][0] = output_storage[j][0][: capacity[j]]
                     output_storage[j][0][pos[j]] = inner_output_storage[jout].storage[0]
-                elif store_steps[j] == 1 or self.vector_outs[j]:
+                elif old_inner_output_storage[offset_out + j] is None:
                     output_storage[j][0][pos[j]] = inner_output_storage[
                         j + offset_out
                     ].storage[0]
@@ -1682,12 +1757,23 @@ class Scan(Op):
 
             pos = [(idx + 1) % store for idx, store in zip(pos, store_steps)]
             i = i + 1
+            if record_steps:
+                t1_step = time.time()
+                t_copy += t1_step - t0_copy
+                step_times.append(t1_step - t0_step)
 
         # 6. Check if you need to re-order output buffers
+        if record_steps:
+            t0_copy = time.time()
         begin = self.n_mit_mot
         end = self.n_outs + self.n_nit_sot
         for idx in range(begin, end):
-            if store_steps[idx] < i - self.mintaps[idx] and pos[idx] < store_steps[idx]:
+            if grow[idx]:
+                # The buffer holds the steps in order, from its start
+                output_storage[idx][0] = output_storage[idx][0][: i - self.mintaps[idx]]
+            elif (
+                store_steps[idx] < i - self.mintaps[idx] and pos[idx] < store_steps[idx]
+            ):
 
                 pdx = pos[idx]
                 if pdx >= store_steps[idx] // 2:
@@ -1740,6 +1826,9 @@ class Scan(Op):
                     # little trick that I used
                     output_storage[idx][0] = output_storage[idx][0][: -(n_steps - i)]
 
+        if record_steps:
+            t_copy += time.time() - t0_copy
+
         # We never reuse the input or output storage of the
         # inner function so we clear it.
         for i_s in inner_input_storage:
@@ -1760,6 +1849,8 @@ class Scan(Op):
             profile.vm_call_time += t_fn
             if hasattr(self.fn.fn, "update_profile"):
                 self.fn.fn.update_profile(profile)
+            if record_steps:
+                profile.record_steps(step_times, t_copy)
 
         self.t_call = t_call
         self.t_fn = t_fn
@@ -4,13 +4,15 @@ The Optimization provided in this file:
 
 local opt: remove_constants_and_unused_inputs_scan,
            constant_folding_for_scan2,
-           scan_merge_inouts
+           scan_merge_inouts,
+           scan_vectorize_map
            They are wrapped in in2out to create global opt.
 global opt: ScanInplaceOptimizer,
             PushOutNonSeqScan,
             PushOutSeqScan,
             PushOutDot1,
             ScanMerge,
+            ScanFusion,
             ScanSaveMem
 
 How the are registered:
@@ -19,7 +21,9 @@ optdb: scan_eqopt1 (.1), scan_eqopt2(1.6), scan_inplace(75)
 scan_eqopt1 -> scan_seqopt1
 scan_seqopt1 -> in2out(remove_constants_and_unused_inputs_scan)(1),
                 PushOutNonSeqScan(2),
-                PushOutSeqScan(3), PushOutDot1(4)
+                PushOutSeqScan(3), PushOutDot1(4),
+                PushOutScanOutput(5),
+                in2out(scan_vectorize_map)(6)
 scan_eqopt2 -> They are all global optimizer. (in2out convert local to global).
                This is important, as the order is important and all global
                optimizer run before local optimizer in the order they where
@@ -61,6 +65,7 @@ import theano
 from theano import scalar, tensor
 from theano.compile import optdb
 from theano.compile.function.types import deep_copy_op
+from theano.compile.ops import Shape, Shape_i
 from theano.configdefaults import config
 from theano.graph.basic import (
     Constant,
@@ -75,6 +80,7 @@ from theano.graph.fg import InconsistencyError
 from theano.graph.opt import GlobalOptimizer, local_optimizer
 from theano.graph.optdb import EquilibriumDB, SequenceDB
 from theano.graph.toolbox import ReplaceValidate
+from theano.graph.vectorize import vectorize_graph
 from theano.scan.op import Scan
 from theano.scan.utils import (
     clone,
@@ -225,6 +231,73 @@ def remove_constants_and_unused_inputs_scan(fgraph, node):
         return False
 
 
+def group_loop_invariants(inner_inputs, inner_outputs, inner_non_seqs):
+    """
+    Regroup the terms of sums and products that are the same at every step.
+
+    ``x_t * W * 2`` is built as ``(x_t * W) * 2``, whose nodes both depend
+    on the sequence ``x_t``.  It is rewritten as ``x_t * (W * 2)``, so that
+    `PushOutNonSeqScan` can compute ``W * 2`` once, outside of the loop.
+    Only the sums and products whose terms all have the dtype of the result
+    are regrouped, so the casts are not changed.  As floating point sums and
+    products are not associative, the results can change slightly, so
+    `PushOutNonSeqScan` only does it with ``config.scan__group_loop_invariants``.
+
+    Returns the new inner outputs.
+
+    """
+    topo = io_toposort(inner_inputs, inner_outputs)
+    invariant = set(inner_non_seqs)
+    n_clients = {}
+    for nd in topo:
+        if all(x in invariant or isinstance(x, Constant) for x in nd.inputs):
+            invariant.update(nd.outputs)
+        for x in nd.inputs:
+            n_clients[x] = n_clients.get(x, 0) + 1
+    for out in inner_outputs:
+        n_clients[out] = n_clients.get(out, 0) + 1
+
+    def is_invariant(x):
+        return x in invariant or isinstance(x, Constant)
+
+    def is_assoc(nd):
+        return (
+            isinstance(nd.op, tensor.Elemwise)
+            and isinstance(nd.op.scalar_op, (scalar.Add, scalar.Mul))
+            and not nd.op.inplace_pattern
+        )
+
+    def terms(x, op):
+        # Flatten the nested sums or products that are only used here
+        nd = x.owner
+        if (
+            nd is not None
+            and nd.op == op
+            and n_clients.get(x, 0) == 1
+            and not is_invariant(x)
+        ):
+            return sum([terms(i, op) for i in nd.inputs], [])
+        return [x]
+
+    givens = OrderedDict()
+    for nd in topo:
+        if not is_assoc(nd) or is_invariant(nd.outputs[0]):
+            continue
+        out = nd.outputs[0]
+        all_terms = sum([terms(i, nd.op) for i in nd.inputs], [])
+        inv_terms = [t for t in all_terms if is_invariant(t)]
+        var_terms = [t for t in all_terms if not is_invariant(t)]
+        if len(inv_terms) < 2 or any(t.dtype != out.dtype for t in all_terms):
+            continue
+        new_out = nd.op(*(var_terms + [nd.op(*inv_terms)]))
+        if new_out.type == out.type:
+            givens[out] = new_out
+
+    if not givens:
+        return inner_outputs
+    return clone(inner_outputs, replace=givens)
+
+
 # This is a global opt for historical reason
 # It should be possible to change it to a local opt.
 class PushOutNonSeqScan(GlobalOptimizer):
@@ -254,6 +327,10 @@ class PushOutNonSeqScan(GlobalOptimizer):
         """
         # this flag tells if there was any change during the last iterations
         clean_inputs, clean_outputs = reconstruct_graph(node.op.inputs, node.op.outputs)
+        if config.scan__group_loop_invariants:
+            clean_outputs = group_loop_invariants(
+                clean_inputs, clean_outputs, node.op.inner_non_seqs(clean_inputs)
+            )
 
         local_fgraph_topo = io_toposort(clean_inputs, clean_outputs)
         local_fgraph_outs_set = set(clean_outputs)
@@ -1681,7 +1758,19 @@ class ScanMerge(GlobalOptimizer):
     def add_requirements(self, fgraph):
         fgraph.attach_feature(ReplaceValidate())
 
-    def merge(self, nodes):
+    def merge(self, nodes, fused_seqs=None):
+        """
+        Return the replacements of the outputs of `nodes` by a single Scan.
+
+        `fused_seqs` maps ``(i, k)``, the k-th sequence of ``nodes[i]``, to
+        ``(j, group, l)``, the l-th mit-sot (group 1), sit-sot (group 2) or
+        nit-sot (group 3) output of ``nodes[j]``.  Those sequences are
+        removed and replaced in the inner graph by the value of the output
+        computed at the same step.
+
+        """
+        if fused_seqs is None:
+            fused_seqs = {}
 
         if nodes[0].op.as_while:
             as_while = True
@@ -1807,6 +1896,20 @@ class ScanMerge(GlobalOptimizer):
             inner_ins[idx] = new_inner_ins
             inner_outs[idx] = new_inner_outs
 
+        # Replace the fused sequences by the nit-sot outputs they read
+        fused_givens = OrderedDict()
+        fused_outer_pos = set()
+        for (idx, k), (src_idx, group, l) in fused_seqs.items():
+            fused_givens[inner_ins[idx][0][k]] = inner_outs[src_idx][group][l]
+            # The number of steps comes first in outer_ins
+            fused_outer_pos.add(1 + sum([nd.op.n_seqs for nd in nodes[:idx]]) + k)
+        for idx in range(len(nodes)):
+            inner_ins[idx][0] = [
+                x for k, x in enumerate(inner_ins[idx][0]) if (idx, k) not in fused_seqs
+            ]
+        outer_ins = [x for i, x in enumerate(outer_ins) if i not in fused_outer_pos]
+        info["n_seqs"] -= len(fused_seqs)
+
         # Flatten inner_ins and inner_outs so that all seqs are first,
         # then mitmot, etc.
         new_inner_ins = []
@@ -1836,6 +1939,9 @@ class ScanMerge(GlobalOptimizer):
                 else:
                     new_inner_outs += inner_outs[idx][gr_idx]
 
+        if fused_givens:
+            new_inner_outs = clone(new_inner_outs, replace=fused_givens)
+
         new_op = Scan(new_inner_ins, new_inner_outs, info)
         new_outs = new_op(*outer_ins)
 
@@ -1920,6 +2026,184 @@ class ScanMerge(GlobalOptimizer):
                 )
 
 
+def _slice_start(var):
+    """
+    Return the start of `var` if it is ``x[start:stop]``, with a constant
+    `start`, and None otherwise.
+
+    """
+    if var.owner is None or not isinstance(var.owner.op, tensor.Subtensor):
+        return None
+    idx = tensor.subtensor.get_idx_list(var.owner.inputs, var.owner.op.idx_list)
+    if len(idx) != 1 or not isinstance(idx[0], slice) or idx[0].step is not None:
+        return None
+    if idx[0].start is None:
+        return 0
+    try:
+        return int(get_scalar_constant_value(idx[0].start))
+    except tensor.NotScalarConstantError:
+        return None
+
+
+def _length_of(var):
+    """
+    Return `x` if `var` is the length of `x`, ``x.shape[0]``, and None
+    otherwise.
+
+    """
+    if var.owner is None:
+        return None
+    if isinstance(var.owner.op, Shape_i):
+        return var.owner.inputs[0] if var.owner.op.i == 0 else None
+    if not isinstance(var.owner.op, tensor.Subtensor):
+        return None
+    shape = var.owner.inputs[0]
+    if shape.owner is None or not isinstance(shape.owner.op, Shape):
+        return None
+    idx = tensor.subtensor.get_idx_list(var.owner.inputs, var.owner.op.idx_list)
+    try:
+        if len(idx) != 1 or get_scalar_constant_value(idx[0]) != 0:
+            return None
+    except tensor.NotScalarConstantError:
+        return None
+    return shape.owner.inputs[0]
+
+
+class ScanFusion(ScanMerge):
+    """
+    Graph optimizer that fuses a Scan with the Scan producing its sequences.
+
+    When a Scan iterates over the outputs of another Scan that runs for the
+    same number of steps, e.g. two stacked recurrent layers, the two loops
+    are merged, and the sequence is replaced in the inner graph by the value
+    computed at the same step.  If nothing else uses the whole output,
+    `ScanSaveMem` then shrinks it or removes it, so the intermediate tensor
+    is never stored.
+
+    """
+
+    def fused_seqs(self, producer, consumer):
+        """
+        Return the sequences of `consumer` that can be read from `producer`.
+
+        The result maps ``(1, k)``, the k-th sequence of `consumer`, to
+        ``(0, group, l)``, an output of `producer`, as expected by
+        `ScanMerge.merge`.  It is returned with the replacements to apply
+        to the inputs of `consumer` before the merge.
+
+        """
+        givens = OrderedDict()
+        if (
+            producer.op.as_while
+            or consumer.op.as_while
+            or producer.op.truncate_gradient != consumer.op.truncate_gradient
+            or producer.op.mode != consumer.op.mode
+        ):
+            return {}, givens
+
+        # The outputs of `producer` with their group in `ScanMerge.merge`
+        # and the row of the output buffer written at the first step.
+        op = producer.op
+        outputs = OrderedDict()
+        for l, out in enumerate(op.outer_mitsot_outs(producer.outputs)):
+            outputs[out] = (1, l, -min(op.mitsot_taps()[l]))
+        for l, out in enumerate(op.outer_sitsot_outs(producer.outputs)):
+            outputs[out] = (2, l, 1)
+        for l, out in enumerate(op.outer_nitsot_outs(producer.outputs)):
+            outputs[out] = (3, l, 0)
+
+        def read_from(seq, whole=False):
+            # The output of `producer` that `seq` reads from its first step,
+            # going through the slices added by `scan`, like
+            # ``out[1:][:n_steps]``, and the variables on the way. With
+            # `whole`, `seq` must also end with the output.
+            seq_outer = [seq]
+            start = 0
+            while seq not in outputs:
+                start_k = _slice_start(seq)
+                if start_k is None or (
+                    whole and seq.owner.op.idx_list[0].stop is not None
+                ):
+                    return None, []
+                start += start_k
+                seq = seq.owner.inputs[0]
+                seq_outer.append(seq)
+            if outputs[seq][2] != start:
+                return None, []
+            return seq, seq_outer
+
+        # `scan` computes the number of steps of `consumer` from the length
+        # of its sequences. When it is the length of an output of
+        # `producer` without its initial taps, it is the number of steps of
+        # `producer`, which replaces it.
+        nsteps, rep_nsteps = producer.inputs[0], consumer.inputs[0]
+        length_of = _length_of(rep_nsteps)
+        if length_of is not None and read_from(length_of, whole=True)[0] is not None:
+            givens[rep_nsteps] = nsteps
+        if not givens and not equal_computations([nsteps], [rep_nsteps]):
+            try:
+                if get_scalar_constant_value(nsteps) != get_scalar_constant_value(
+                    rep_nsteps
+                ):
+                    return {}, givens
+            except tensor.NotScalarConstantError:
+                return {}, givens
+
+        fused = OrderedDict()
+        fused_outer = set()
+        for k, seq in enumerate(consumer.op.outer_seqs(consumer.inputs)):
+            out, seq_outer = read_from(seq)
+            if out is not None:
+                fused[(1, k)] = (0,) + outputs[out][:2]
+                fused_outer.update(seq_outer)
+        if not fused:
+            return {}, givens
+
+        # The other inputs of `consumer` must not depend on `producer`
+        for inp in consumer.inputs[1:]:
+            if inp in fused_outer:
+                continue
+            if givens:
+                inp = clone(inp, replace=givens)
+            if inp.owner is None:
+                continue
+            if inp.owner is producer or is_in_ancestors(inp.owner, producer):
+                return {}, givens
+        return fused, givens
+
+    def apply(self, fgraph):
+        changed = True
+        while changed:
+            changed = False
+            for consumer in fgraph.toposort():
+                if not isinstance(consumer.op, Scan):
+                    continue
+                producers = OrderedDict()
+                for seq in consumer.op.outer_seqs(consumer.inputs):
+                    while _slice_start(seq) is not None:
+                        seq = seq.owner.inputs[0]
+                    if seq.owner is not None and isinstance(seq.owner.op, Scan):
+                        producers[seq.owner] = None
+                for producer in producers:
+                    fused, givens = self.fused_seqs(producer, consumer)
+                    if fused:
+                        new_consumer = consumer
+                        if givens:
+                            new_consumer = consumer.op.make_node(
+                                *clone(consumer.inputs, replace=givens)
+                            )
+                        proposal = self.merge([producer, new_consumer], fused)
+                        new_outs = dict(zip(new_consumer.outputs, consumer.outputs))
+                        proposal = [(new_outs.get(x, x), y) for x, y in proposal]
+                        fgraph.replace_all_validate_remove(
+                            proposal, remove=[producer, consumer], reason="scan_fusion"
+                        )
+                        changed = True
+                        break
+                if changed:
+                    break
+
+
 def has_duplicates(l):
     """
     Returns true if l has any duplicates (according to __eq__).
@@ -2316,6 +2600,64 @@ class PushOutDot1(GlobalOptimizer):
                         )
 
 
+@local_optimizer([Scan])
+def scan_vectorize_map(fgraph, node):
+    """
+    Replace a Scan without loop-carried dependencies by whole-array ops.
+
+    The steps of a Scan that only has sequences, non-sequences and nit-sot
+    outputs (a `map`) are independent.  Each node of its inner graph that
+    depends on the sequences is replaced by its batched form, that works on
+    a leading step axis (e.g. `Elemwise` broadcasts and `Dot` becomes
+    `BatchedDot`), and the other nodes are computed once in the outer
+    graph.  The batched forms are the rules registered with
+    `theano.graph.vectorize.vectorize_node`.  The Scan is kept when an inner
+    node has no batched form.
+
+    """
+    if not isinstance(node.op, Scan):
+        return False
+    op = node.op
+    if (
+        op.as_while
+        or op.n_mit_mot
+        or op.n_mit_sot
+        or op.n_sit_sot
+        or op.n_shared_outs
+        or not op.n_nit_sot
+        or op.info["gpua"]
+    ):
+        return False
+
+    n_steps = node.inputs[0]
+    replace = OrderedDict()
+    for inner, outer in zip(op.inner_seqs(op.inputs), op.outer_seqs(node.inputs)):
+        replace[inner] = outer[:n_steps]
+    batched_inputs = list(replace)
+    for inner, outer in zip(
+        op.inner_non_seqs(op.inputs), op.outer_non_seqs(node.inputs)
+    ):
+        replace[inner] = outer
+    try:
+        new_outs, batched = vectorize_graph(
+            op.inner_nitsot_outs(op.outputs), replace, batched_inputs
+        )
+    except NotImplementedError:
+        return False
+
+    replacements = []
+    for new_out, is_batched, outer_out in zip(new_outs, batched, node.outputs):
+        if not is_batched:
+            new_out = tensor.alloc(
+                new_out, n_steps, *[new_out.shape[i] for i in range(new_out.ndim)]
+            )
+        new_out = tensor.patternbroadcast(new_out, outer_out.broadcastable)
+        if new_out.type != outer_out.type:
+            return False
+        replacements.append(new_out)
+    return replacements
+
+
 # I've added an equilibrium because later scan optimization in the sequence
 # can make it such that earlier optimizations should apply. However, in
 # general I do not expect the sequence to run more then once
@@ -2343,6 +2685,12 @@ optdb.register(
 
 scan_eqopt1.register("all_pushout_opt", scan_seqopt1, 1, "fast_run", "scan")
 
+# Fuse the Scans that iterate over the outputs of another Scan. This runs
+# before the canonicalization merges the slices added by `scan` and before
+# ShapeOpt, while the number of steps of a Scan iterating over the output
+# of another one is still the length of that output.
+scan_eqopt1.register("scan_fusion", ScanFusion(), 2, "fast_run", "scan")
+
 
 scan_seqopt1.register(
     "scanOp_remove_constants_and_unused_inputs0",
@@ -2374,6 +2722,15 @@ scan_seqopt1.register(
 )
 
 
+# Without any tag, as the batched intermediate results can use much more
+# memory than the loop.  Enable it with optimizer_including=scan_vectorize_map.
+scan_seqopt1.register(
+    "scan_vectorize_map",
+    opt.in2out(scan_vectorize_map, ignore_newtrees=True),
+    6,
+)
+
+
 scan_eqopt2.register(
     "constant_folding_for_scan2",
     opt.in2out(tensor.opt.constant_folding, ignore_newtrees=True),
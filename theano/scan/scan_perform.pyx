@@ -61,10 +61,11 @@ import copy
 import time
 
 from theano.link.utils import raise_with_op
+from theano.scan.op import WHILE_INITIAL_STEPS
 
 
 def get_version():
-    return 0.298
+    return 0.301
 
 @cython.boundscheck(False)
 def perform(
@@ -93,7 +94,9 @@ def perform(
             args,
             outs,
             self,
-            node):
+            node,
+            bint while_growth=False,
+            bint record_steps=False):
     """
     Parameters
     ----------
@@ -168,6 +171,14 @@ def perform(
     self: python object
         The scan op itself. I only use it to attach to it some timing
         informations .. but I don;t need to.
+    while_growth: bool
+        If True and `as_while` is True, the outputs that keep all their
+        steps start with a small buffer that is grown as the loop goes
+        (see ``config.scan__while_growth``).
+    record_steps: bool
+        If True, the time of each iteration and the time spent copying the
+        outputs of the steps are recorded in the profile of `fnct` (see
+        ``config.profiling__scan_steps``).
 
     """
     # 1. Unzip the number of steps and sequences. If number of steps is
@@ -185,6 +196,8 @@ def perform(
     cdef int pos[500] # put a maximum of 500 outputs
     cdef unsigned int len_store_steps = n_mit_mot + n_mit_sot + n_sit_sot + n_nit_sot
     cdef int store_steps[500]
+    cdef int capacity[500]
+    cdef int grow[500]
     cdef unsigned int l
     cdef unsigned int offset
     cdef int tap
@@ -239,6 +252,18 @@ def perform(
     for idx in range(n_outs + n_nit_sot):
         pos[idx] = (-mintaps[idx])%store_steps[idx]
 
+    # The outputs that are not kept in a ring buffer, as they store all
+    # the steps, can start with a small buffer that is grown as the loop
+    # goes if the loop can stop early.
+    for idx in range(n_outs + n_nit_sot):
+        grow[idx] = (as_while and while_growth and idx >= n_mit_mot and
+                     store_steps[idx] == n_steps - mintaps[idx] and
+                     destroy_map[idx] == 0)
+        if grow[idx]:
+            capacity[idx] = min(store_steps[idx],
+                                -mintaps[idx] + WHILE_INITIAL_STEPS)
+        else:
+            capacity[idx] = store_steps[idx]
 
     # 2.1 Create storage space for outputs
     for idx in range(n_outs):
@@ -251,6 +276,7 @@ def perform(
               and outs[idx][0].shape[0] >= store_steps[idx] ):
             # Put in the values of the initial state
             outs[idx][0] = outs[idx][0][:store_steps[idx]]
+            capacity[idx] = store_steps[idx]
             if idx > n_mit_mot:
                 l = - mintaps[idx]
                 outs[idx][0][:l] = args[<unsigned int>(seqs_arg_offset +
@@ -258,7 +284,8 @@ def perform(
             else:
                 outs[idx][0][:] = args[<unsigned int>(seqs_arg_offset + idx)]
         else:
-            outs[idx][0] = args[<unsigned int>(seqs_arg_offset + idx)].copy()
+            outs[idx][0] = args[<unsigned int>(seqs_arg_offset +
+                                               idx)][:capacity[idx]].copy()
 
 
     offset = nit_sot_arg_offset + n_nit_sot
@@ -280,12 +307,25 @@ def perform(
     for idx in range(len(other_args)):
         input_storage[<unsigned int>(idx+offset)].storage[0] = other_args[idx]
 
+    step_times = []
+    t_copy = 0
 
     i = 0
     cond = 1
     ############## THE MAIN LOOP #########################
     #for i in range(n_steps):
     while (i < n_steps) and cond == 1:
+        if record_steps:
+            t0_step = time.time()
+        # 2.2 Grow the buffers that are full, doubling their capacity
+        for idx in range(n_mit_mot, n_outs + n_nit_sot):
+            if grow[idx] and pos[idx] >= capacity[idx] and i > 0:
+                old = outs[idx][0]
+                capacity[idx] = min(store_steps[idx], 2 * capacity[idx])
+                shape = (capacity[idx],) + old.shape[1:]
+                outs[idx][0] = node.outputs[idx].type.value_zeros(shape)
+                outs[idx][0][:pos[idx]] = old[:pos[idx]]
+                del old
         # sequences over which scan iterates
         # 3. collect input slices
         for idx in range(n_seqs):
@@ -334,18 +374,24 @@ def perform(
                 offset += 1
 
         # 4.2. Collect slices for mitsots, sitsots and nitsots
-        if i != 0:
-            for idx in range(n_outs + n_nit_sot - n_mit_mot):
-                if ( store_steps[<unsigned int>(idx+n_mit_mot)] == 1 or
-                    vector_outs[<unsigned int>(idx+n_mit_mot)] == 1):
-                    output_storage[<unsigned int>(idx+offset)].storage[0] = None
-                else:
-                    output_storage[<unsigned int>(idx+offset)].storage[0] =\
-                        outs[<unsigned int>(idx+n_mit_mot)][0][pos[\
-                                            <unsigned int>(idx+n_mit_mot)]]
-        else:
-            for idx in range(n_outs + n_nit_sot - n_mit_mot):
+        # The output buffers are used as ring buffers: each step writes
+        # its outputs directly in the next slot, unless that slot still
+        # holds one of the taps read by this step.  The buffers of the
+        # nitsots are only allocated after the first step, once their
+        # shape is known.
+        for idx in range(n_outs + n_nit_sot - n_mit_mot):
+            jout = idx + n_mit_mot
+            if ( store_steps[jout] <= -mintaps[jout] or
+                (i == 0 and jout >= n_outs) ):
                 output_storage[<unsigned int>(idx+offset)].storage[0] = None
+            elif vector_outs[jout] == 1:
+                # Taps of vector outputs are read as 0-d views, so
+                # write them the same way
+                output_storage[<unsigned int>(idx+offset)].storage[0] =\
+                    outs[jout][0][pos[jout]:<unsigned int>(pos[jout]+1)].reshape(())
+            else:
+                output_storage[<unsigned int>(idx+offset)].storage[0] =\
+                    outs[jout][0][pos[jout]]
 
         # 4.3. Collect slices for shared outputs
         offset += n_outs+n_nit_sot - n_mit_mot
@@ -436,6 +482,8 @@ def perform(
                     offset_out -= 1
 
         offset_out = 0
+        if record_steps:
+            t0_copy = time.time()
 
         # 5.3 Copy over the values for mit_mot outputs
         mitmot_inp_offset = 0
@@ -486,7 +534,7 @@ def perform(
         for j in range(begin, end):
 
             # Copy the output value to `outs`, if necessary
-            if store_steps[j] == 1 or vector_outs[j] == 1:
+            if old_output_storage[offset_out + j] is None:
                 outs[j][0][pos[j]] = output_storage[<unsigned int>(offset_out+j)].storage[0]
             else:
                 # Check whether the initialization of the output storage map
@@ -516,17 +564,17 @@ def perform(
 
             if i == 0:
                 jout = j+offset_out
-                shape = (store_steps[j],) + output_storage[jout].storage[0].shape
+                shape = (capacity[j],) + output_storage[jout].storage[0].shape
                 dtype = output_storage[jout].storage[0].dtype
                 if (outs[j][0] is None or
-                        outs[j][0].shape[0] < store_steps[j] or
+                        outs[j][0].shape[0] < capacity[j] or
                         outs[j][0].shape[1:] != shape[1:] or
                         outs[j][0].dtype != dtype ):
                     outs[j][0] = node.outputs[j].type.value_zeros(shape)
-                elif outs[j][0].shape[0] != store_steps[j]:
-                    outs[j][0] = outs[j][0][:store_steps[j]]
+                elif outs[j][0].shape[0] != capacity[j]:
+                    outs[j][0] = outs[j][0][:capacity[j]]
                 outs[j][0][pos[j]] = output_storage[jout].storage[0]
-            elif store_steps[j] == 1 or vector_outs[j] == 1:
+            elif old_output_storage[offset_out + j] is None:
                 outs[j][0][pos[j]] = output_storage[j+offset_out].storage[0]
             else:
                 # Check whether the initialization of the output storage map
@@ -568,12 +616,21 @@ def perform(
         for idx in range(lenpos):
             pos[idx] = (pos[idx]+1)%store_steps[idx]
         i = i + 1
+        if record_steps:
+            t1_step = time.time()
+            t_copy += t1_step - t0_copy
+            step_times.append(t1_step - t0_step)
 
     # 6. Check if you need to re-order output buffers
+    if record_steps:
+        t0_copy = time.time()
     begin = n_mit_mot
     end   = n_outs + n_nit_sot
     for idx in range(begin, end):
-        if ( store_steps[idx] < i-mintaps[idx] and
+        if grow[idx]:
+            # The buffer holds the steps in order, from its start
+            outs[idx][0] = outs[idx][0][:i-mintaps[idx]]
+        elif ( store_steps[idx] < i-mintaps[idx] and
             pos[idx] < store_steps[idx] ):
 
             pdx = pos[idx]
@@ -620,6 +677,9 @@ def perform(
                 sh0 = outs[idx][0].shape[0]
                 outs[idx][0] = outs[idx][0][:sh0-(n_steps - i)]
 
+    if record_steps:
+        t_copy += time.time() - t0_copy
+
     # We never reuse the input or output storage of the
     # inner function so we clear it.
     for i_s in input_storage:
@@ -638,6 +698,8 @@ def perform(
             profile.call_time += t_call
             if hasattr(fn, 'update_profile'):
                 fn.update_profile(profile)
+            if record_steps:
+                profile.record_steps(step_times, t_copy)
 
     ### Old Profile Mode
     #if hasattr(fnct.maker.mode,'fct_call_time'):
@@ -21,7 +21,7 @@ if not config.cxx:
 
 _logger = logging.getLogger("theano.scan.scan_perform")
 
-version = 0.298  # must match constant returned in function get_version()
+version = 0.301  # must match constant returned in function get_version()
 
 need_reload = False
 
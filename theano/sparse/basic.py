@@ -2939,15 +2939,20 @@ class HStack(Op):
         ]
 
         if _is_sparse_variable(gz):
-            gz = dense_from_sparse(gz)
-
-        split = tensor.Split(len(inputs))(
-            gz, 1, tensor.stack([x.shape[1] for x in inputs])
-        )
-        if not isinstance(split, list):
-            split = [split]
+            # Slice the sparse gradient instead of going through a dense one
+            derivative = []
+            stop = 0
+            for x in inputs:
+                start, stop = stop, stop + csm_shape(x)[1]
+                derivative.append(gz[:, start:stop])
+        else:
+            split = tensor.Split(len(inputs))(
+                gz, 1, tensor.stack([x.shape[1] for x in inputs])
+            )
+            if not isinstance(split, list):
+                split = [split]
 
-        derivative = [SparseFromDense(self.format)(s) for s in split]
+            derivative = [SparseFromDense(self.format)(s) for s in split]
 
         def choose(continuous, derivative):
             if continuous:
@@ -3021,15 +3026,20 @@ class VStack(HStack):
         ]
 
         if _is_sparse_variable(gz):
-            gz = dense_from_sparse(gz)
-
-        split = tensor.Split(len(inputs))(
-            gz, 0, tensor.stack([x.shape[0] for x in inputs])
-        )
-        if not isinstance(split, list):
-            split = [split]
+            # Slice the sparse gradient instead of going through a dense one
+            derivative = []
+            stop = 0
+            for x in inputs:
+                start, stop = stop, stop + csm_shape(x)[0]
+                derivative.append(gz[start:stop])
+        else:
+            split = tensor.Split(len(inputs))(
+                gz, 0, tensor.stack([x.shape[0] for x in inputs])
+            )
+            if not isinstance(split, list):
+                split = [split]
 
-        derivative = [SparseFromDense(self.format)(s) for s in split]
+            derivative = [SparseFromDense(self.format)(s) for s in split]
 
         def choose(continuous, derivative):
             if continuous:
@@ -5,7 +5,7 @@ import theano
 from theano import scalar, tensor
 from theano.configdefaults import config
 from theano.graph.basic import Apply
-from theano.graph.op import COp, _NoPythonCOp
+from theano.graph.op import COp, OpenMPOp, _NoPythonCOp
 from theano.graph.opt import PatternSub, TopoOptimizer, local_optimizer
 from theano.misc.safe_asarray import _asarray
 from theano.sparse import basic as sparse
@@ -20,7 +20,7 @@ from theano.sparse.basic import (
     usmm,
 )
 from theano.tensor import blas
-from theano.tensor.opt import register_canonicalize, register_specialize
+from theano.tensor.opt import assert_op, register_canonicalize, register_specialize
 
 
 _is_sparse_variable = sparse._is_sparse_variable
@@ -40,9 +40,12 @@ def local_csm_properties_csm(fgraph, node):
         (csm,) = node.inputs
         if csm.owner and (csm.owner.op == CSC or csm.owner.op == CSR):
             # csm.owner.inputs could be broadcastable. In that case, we have
-            # to adjust the broadcasting flag here.
+            # to adjust the broadcasting flag here. The shape given to CSM
+            # can also have another integer dtype than the one returned.
             ret_var = [
-                theano.tensor.patternbroadcast(i, o.broadcastable)
+                theano.tensor.patternbroadcast(
+                    theano.tensor.cast(i, o.dtype), o.broadcastable
+                )
                 for i, o in zip(csm.owner.inputs, node.outputs)
             ]
             return ret_var
@@ -968,8 +971,11 @@ def local_usmm_csx(fgraph, node):
     """
     usmm -> usmm_csc_dense
 
+    With OpenMP, the multithreaded UsmmCSxDense is used instead, see
+    `local_csx_dense_dot`.
+
     """
-    if node.op == usmm:
+    if node.op == usmm and not config.openmp:
         alpha, x, y, z = node.inputs
 
         x_is_sparse_variable = _is_sparse_variable(x)
@@ -2071,3 +2077,1276 @@ def local_sampling_dot_csr(fgraph, node):
 
 
 register_specialize(local_sampling_dot_csr, "cxx_only", name="local_sampling_dot_csr")
+
+
+class _CSxOp(OpenMPOp):
+    """
+    Base of the ops working directly on the properties of a csr or csc matrix.
+
+    Both formats store the indices along a "major" axis (the rows of a csr
+    matrix, the columns of a csc matrix), so the same kernels handle them.
+    The major axis is split between threads when OpenMP is enabled.
+
+    """
+
+    def omp_pragma(self, directive, size=None):
+        """Return an OpenMP pragma, used only when `size` is large enough."""
+        self.update_self_openmp()
+        if not self.openmp:
+            return ""
+        if size is None:
+            return f"#pragma omp {directive}"
+        return (
+            f"#pragma omp {directive} if ({size} >= {config.openmp_elemwise_minsize})"
+        )
+
+    def c_support_code(self, **kwargs):
+        return """
+        // Return 1 when the indices of a row are sorted and without duplicates
+        static int csx_row_is_canonical(
+            const npy_int32* ind, npy_int32 begin, npy_int32 end)
+        {
+            for (npy_int32 k = begin + 1; k < end; ++k)
+                if (ind[k - 1] >= ind[k])
+                    return 0;
+            return 1;
+        }
+        """
+
+    @staticmethod
+    def c_contiguous_call(arrays, call, sub):
+        """
+        Return C code calling `call` with contiguous versions of `arrays`.
+
+        `call` is formatted with the names ``arg0``, ``arg1``, ... of the
+        contiguous arrays and must return a non-zero value on failure.
+
+        """
+        n = len(arrays)
+        args = ", ".join(f"PyArray_GETCONTIGUOUS({a})" for a in arrays)
+        call = call.format(**{f"arg{k}": f"args[{k}]" for k in range(n)})
+        return f"""
+        {{
+            PyArrayObject* args[{n}] = {{{args}}};
+            int failed = 0;
+            for (int k = 0; k < {n}; ++k)
+                failed |= args[k] == NULL;
+            if (!failed)
+                failed = {call};
+            for (int k = 0; k < {n}; ++k)
+                Py_XDECREF(args[k]);
+            if (failed) {{
+                {sub['fail']}
+            }}
+        }}
+        """
+
+
+def _csx_index(x):
+    x = tensor.as_tensor_variable(x)
+    if x.type.dtype != "int32":
+        raise TypeError("The indices and indptr of a sparse matrix must be int32", x)
+    return x
+
+
+class ElemwiseSSCSx(_CSxOp):
+    """
+    Element-wise addition or multiplication of two sparse matrices of the
+    same format.
+
+    Parameters
+    ----------
+    x_data, x_indices, x_indptr
+        Properties of the first sparse matrix.
+    y_data, y_indices, y_indptr
+        Properties of the second sparse matrix.
+    n_minor
+        Length of the minor axis, i.e. the number of columns of a csr matrix
+        or the number of rows of a csc matrix.
+
+    Returns
+    -------
+    The data, indices and indptr of the result, without explicit zeros.
+
+    Notes
+    -----
+    Rows with sorted indices are merged directly, the others are accumulated
+    in a workspace of length `n_minor` allocated by each thread that needs it.
+
+    This op is used as an optimization of AddSS and MulSS.
+
+    """
+
+    __props__ = ("binop",)
+
+    def __init__(self, binop, openmp=None):
+        super().__init__(openmp=openmp)
+        if binop not in ("add", "mul"):
+            raise ValueError(f"Unsupported binary operation: {binop}")
+        self.binop = binop
+
+    def make_node(self, x_data, x_indices, x_indptr, y_data, y_indices, y_indptr, n):
+        x_data = tensor.as_tensor_variable(x_data)
+        y_data = tensor.as_tensor_variable(y_data)
+        assert x_data.type.ndim == 1 and y_data.type.ndim == 1
+        n = tensor.as_tensor_variable(n)
+        assert n.type.ndim == 0
+        out_dtype = scalar.upcast(x_data.type.dtype, y_data.type.dtype)
+        inputs = [x_data, _csx_index(x_indices), _csx_index(x_indptr)]
+        inputs += [y_data, _csx_index(y_indices), _csx_index(y_indptr), n]
+        return Apply(
+            self,
+            inputs,
+            [tensor.tensor(out_dtype, (False,)), tensor.ivector(), tensor.ivector()],
+        )
+
+    def perform(self, node, inputs, outputs):
+        x_data, x_indices, x_indptr, y_data, y_indices, y_indptr, n = inputs
+        # A csc matrix has the same properties as the csr matrix of its transpose
+        shape = (len(x_indptr) - 1, int(n))
+        x = scipy.sparse.csr_matrix((x_data, x_indices, x_indptr), shape=shape)
+        y = scipy.sparse.csr_matrix((y_data, y_indices, y_indptr), shape=shape)
+        if self.binop == "add":
+            z = x + y
+        else:
+            z = x.multiply(y)
+        z = z.tocsr()
+        outputs[0][0] = _asarray(z.data, dtype=node.outputs[0].dtype)
+        outputs[1][0] = _asarray(z.indices, dtype="int32")
+        outputs[2][0] = _asarray(z.indptr, dtype="int32")
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_support_code_apply(self, node, name):
+        if any(i.dtype.startswith("complex") for i in node.inputs + node.outputs):
+            raise NotImplementedError("Complex types are not supported")
+        x_type = node.inputs[0].type.dtype_specs()[1]
+        y_type = node.inputs[3].type.dtype_specs()[1]
+        z_type = node.outputs[0].type.dtype_specs()[1]
+        z_typenum = node.outputs[0].type.dtype_specs()[2]
+        expr = "u + v" if self.binop == "add" else "u * v"
+        omp_parallel = self.omp_pragma("parallel", "M")
+        omp_for = self.omp_pragma("for schedule(dynamic, 256)")
+        return (
+            """
+        typedef struct {
+            npy_int32* next;
+            %(z_type)s* xw;
+            %(z_type)s* yw;
+        } %(name)s_workspace;
+
+        // Compute the entries of the row `i` of the result, or only count them
+        // when `zd` is NULL. Return -1 when the workspace can not be allocated
+        // and -2 for out of range indices.
+        static npy_intp %(name)s_row(
+            npy_intp i, npy_intp N,
+            const %(x_type)s* xd, const npy_int32* xi, const npy_int32* xp,
+            const %(y_type)s* yd, const npy_int32* yi, const npy_int32* yp,
+            %(z_type)s* zd, npy_int32* zi, %(name)s_workspace* ws)
+        {
+            const npy_int32 xb = xp[i], xe = xp[i + 1];
+            const npy_int32 yb = yp[i], ye = yp[i + 1];
+            npy_intp nz = 0;
+            if (csx_row_is_canonical(xi, xb, xe)
+                && csx_row_is_canonical(yi, yb, ye)) {
+                npy_int32 a = xb, b = yb;
+                while (a < xe || b < ye) {
+                    npy_int32 col;
+                    %(z_type)s u = 0, v = 0;
+                    if (b == ye || (a < xe && xi[a] < yi[b])) {
+                        col = xi[a];
+                        u = xd[a++];
+                    } else if (a == xe || yi[b] < xi[a]) {
+                        col = yi[b];
+                        v = yd[b++];
+                    } else {
+                        col = xi[a];
+                        u = xd[a++];
+                        v = yd[b++];
+                    }
+                    const %(z_type)s r = %(expr)s;
+                    if (r != 0) {
+                        if (zd) {
+                            zd[nz] = r;
+                            zi[nz] = col;
+                        }
+                        ++nz;
+                    }
+                }
+                return nz;
+            }
+
+            // Unsorted or duplicated indices: accumulate the row in a dense
+            // workspace and chain the columns it touches in a linked list.
+            if (!ws->next) {
+                npy_int32* next = (npy_int32*)malloc(N * sizeof(npy_int32));
+                %(z_type)s* xw = (%(z_type)s*)calloc(N, sizeof(%(z_type)s));
+                %(z_type)s* yw = (%(z_type)s*)calloc(N, sizeof(%(z_type)s));
+                if (!next || !xw || !yw) {
+                    free(next);
+                    free(xw);
+                    free(yw);
+                    return -1;
+                }
+                for (npy_intp k = 0; k < N; ++k)
+                    next[k] = -1;
+                ws->next = next;
+                ws->xw = xw;
+                ws->yw = yw;
+            }
+            npy_int32 head = -2;
+            for (npy_int32 a = xb; a < xe; ++a) {
+                const npy_int32 c = xi[a];
+                if (c < 0 || c >= N)
+                    return -2;
+                ws->xw[c] += xd[a];
+                if (ws->next[c] == -1) {
+                    ws->next[c] = head;
+                    head = c;
+                }
+            }
+            for (npy_int32 b = yb; b < ye; ++b) {
+                const npy_int32 c = yi[b];
+                if (c < 0 || c >= N)
+                    return -2;
+                ws->yw[c] += yd[b];
+                if (ws->next[c] == -1) {
+                    ws->next[c] = head;
+                    head = c;
+                }
+            }
+            while (head != -2) {
+                const npy_int32 c = head;
+                const %(z_type)s u = ws->xw[c], v = ws->yw[c];
+                const %(z_type)s r = %(expr)s;
+                if (r != 0) {
+                    if (zd) {
+                        zd[nz] = r;
+                        zi[nz] = c;
+                    }
+                    ++nz;
+                }
+                head = ws->next[c];
+                ws->next[c] = -1;
+                ws->xw[c] = 0;
+                ws->yw[c] = 0;
+            }
+            return nz;
+        }
+
+        static int %(name)s_run(
+            PyArrayObject* x_data, PyArrayObject* x_ind, PyArrayObject* x_ptr,
+            PyArrayObject* y_data, PyArrayObject* y_ind, PyArrayObject* y_ptr,
+            npy_intp N, PyArrayObject** z_data, PyArrayObject** z_ind,
+            PyArrayObject** z_ptr)
+        {
+            const npy_intp M = PyArray_DIMS(x_ptr)[0] - 1;
+            if (PyArray_DIMS(y_ptr)[0] != M + 1) {
+                PyErr_SetString(PyExc_ValueError,
+                                "The shapes of the sparse matrices differ");
+                return 1;
+            }
+            const %(x_type)s* xd = (%(x_type)s*)PyArray_DATA(x_data);
+            const npy_int32* xi = (npy_int32*)PyArray_DATA(x_ind);
+            const npy_int32* xp = (npy_int32*)PyArray_DATA(x_ptr);
+            const %(y_type)s* yd = (%(y_type)s*)PyArray_DATA(y_data);
+            const npy_int32* yi = (npy_int32*)PyArray_DATA(y_ind);
+            const npy_int32* yp = (npy_int32*)PyArray_DATA(y_ptr);
+
+            npy_intp dims[1] = {M + 1};
+            Py_XDECREF(*z_ptr);
+            *z_ptr = (PyArrayObject*)PyArray_ZEROS(1, dims, NPY_INT32, 0);
+            if (!*z_ptr)
+                return 1;
+            npy_int32* zp = (npy_int32*)PyArray_DATA(*z_ptr);
+            %(z_type)s* zd = NULL;
+            npy_int32* zi = NULL;
+
+            // The first pass counts the entries of each row and the second
+            // one writes them at their final position.
+            int status = 0;
+            for (int pass = 0; pass < 2 && !status; ++pass) {
+                %(omp_parallel)s
+                {
+                    %(name)s_workspace ws = {NULL, NULL, NULL};
+                    %(omp_for)s
+                    for (npy_intp i = 0; i < M; ++i) {
+                        if (status)
+                            continue;
+                        const npy_intp nz = %(name)s_row(
+                            i, N, xd, xi, xp, yd, yi, yp,
+                            pass ? zd + zp[i] : NULL, pass ? zi + zp[i] : NULL,
+                            &ws);
+                        if (nz < 0)
+                            status = (int)-nz;
+                        else if (!pass)
+                            zp[i + 1] = (npy_int32)nz;
+                    }
+                    free(ws.next);
+                    free(ws.xw);
+                    free(ws.yw);
+                }
+                if (pass || status)
+                    continue;
+                npy_intp total = 0;
+                for (npy_intp i = 1; i <= M && !status; ++i) {
+                    total += zp[i];
+                    if (total > NPY_MAX_INT32)
+                        status = 3;
+                    zp[i] = (npy_int32)total;
+                }
+                if (status)
+                    continue;
+                dims[0] = total;
+                Py_XDECREF(*z_data);
+                Py_XDECREF(*z_ind);
+                *z_data = (PyArrayObject*)PyArray_SimpleNew(1, dims, %(z_typenum)s);
+                *z_ind = (PyArrayObject*)PyArray_SimpleNew(1, dims, NPY_INT32);
+                if (!*z_data || !*z_ind)
+                    return 1;
+                zd = (%(z_type)s*)PyArray_DATA(*z_data);
+                zi = (npy_int32*)PyArray_DATA(*z_ind);
+            }
+            if (status == 1)
+                PyErr_NoMemory();
+            else if (status == 2)
+                PyErr_SetString(PyExc_ValueError,
+                                "The sparse matrices have out of range indices");
+            else if (status == 3)
+                PyErr_SetString(PyExc_ValueError,
+                                "The result has too many entries for int32 indices");
+            return status != 0;
+        }
+        """
+            % locals()
+        )
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        x_data, x_ind, x_ptr, y_data, y_ind, y_ptr, n = inputs
+        z_data, z_ind, z_ptr = outputs
+        call = (
+            f"{name}_run({{arg0}}, {{arg1}}, {{arg2}}, {{arg3}}, {{arg4}}, {{arg5}}, "
+            f"((dtype_{n}*)PyArray_DATA({n}))[0], &{z_data}, &{z_ind}, &{z_ptr})"
+        )
+        return self.c_contiguous_call(
+            [x_data, x_ind, x_ptr, y_data, y_ind, y_ptr], call, sub
+        )
+
+
+add_s_s_csx = ElemwiseSSCSx("add")
+mul_s_s_csx = ElemwiseSSCSx("mul")
+
+
+# register a specialization to replace AddSS -> add_s_s_csx
+# and MulSS -> mul_s_s_csx
+@local_optimizer([sparse.AddSS, sparse.MulSS])
+def local_elemwise_s_s_csx(fgraph, node):
+    if isinstance(node.op, sparse.AddSS):
+        op = add_s_s_csx
+    elif isinstance(node.op, sparse.MulSS):
+        op = mul_s_s_csx
+    else:
+        return False
+    x, y = node.inputs
+    if x.type.format != y.type.format:
+        return False
+
+    x_data, x_ind, x_ptr, x_shape = sparse.csm_properties(x)
+    y_data, y_ind, y_ptr, y_shape = sparse.csm_properties(y)
+    x_shape = assert_op(x_shape, tensor.all(tensor.eq(x_shape, y_shape)))
+    n_minor = x_shape[1] if x.type.format == "csr" else x_shape[0]
+    z_data, z_ind, z_ptr = op(x_data, x_ind, x_ptr, y_data, y_ind, y_ptr, n_minor)
+
+    return [sparse.CSM(x.type.format)(z_data, z_ind, z_ptr, x_shape)]
+
+
+register_specialize(local_elemwise_s_s_csx, "cxx_only")
+
+
+class SumCSx(_CSxOp):
+    """
+    Sum of a sparse matrix along one of its axes.
+
+    Parameters
+    ----------
+    data, indices, indptr
+        Properties of the sparse matrix.
+    n_minor
+        Length of the minor axis, i.e. the number of columns of a csr matrix
+        or the number of rows of a csc matrix.
+
+    Returns
+    -------
+    The dense vector of the sums. With ``keep="major"`` it has one sum for
+    each row of a csr matrix (or column of a csc matrix), and with
+    ``keep="minor"`` one sum for each element of the minor axis.
+
+    Notes
+    -----
+    Only the sums over the minor axis, i.e. ``keep="major"``, are computed in
+    parallel, as the other ones scatter the data.
+
+    This op is used as an optimization of SpSum.
+
+    """
+
+    __props__ = ("keep",)
+
+    def __init__(self, keep, openmp=None):
+        super().__init__(openmp=openmp)
+        if keep not in ("major", "minor"):
+            raise ValueError(f"keep must be 'major' or 'minor', got {keep}")
+        self.keep = keep
+
+    def make_node(self, data, indices, indptr, n):
+        data = tensor.as_tensor_variable(data)
+        assert data.type.ndim == 1
+        n = tensor.as_tensor_variable(n)
+        assert n.type.ndim == 0
+        return Apply(
+            self,
+            [data, _csx_index(indices), _csx_index(indptr), n],
+            [tensor.tensor(data.type.dtype, (False,))],
+        )
+
+    def perform(self, node, inputs, outputs):
+        data, indices, indptr, n = inputs
+        x = scipy.sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(indptr) - 1, int(n))
+        )
+        axis = 1 if self.keep == "major" else 0
+        outputs[0][0] = _asarray(x.sum(axis), dtype=data.dtype).ravel()
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_support_code_apply(self, node, name):
+        if node.inputs[0].type.dtype.startswith("complex"):
+            raise NotImplementedError("Complex types are not supported")
+        d_type = node.inputs[0].type.dtype_specs()[1]
+        typenum = node.outputs[0].type.dtype_specs()[2]
+        if self.keep == "major":
+            size = "M"
+            loop = """
+            %s
+            for (npy_intp i = 0; i < M; ++i) {
+                %s acc = 0;
+                for (npy_int32 k = p[i]; k < p[i + 1]; ++k)
+                    acc += d[k];
+                out[i] = acc;
+            }
+            """ % (
+                self.omp_pragma("parallel for schedule(dynamic, 256)", "nnz"),
+                d_type,
+            )
+        else:
+            size = "N"
+            loop = """
+            for (npy_intp k = 0; k < nnz; ++k) {
+                if (ind[k] < 0 || ind[k] >= N) {
+                    PyErr_SetString(PyExc_ValueError,
+                                    "The sparse matrix has out of range indices");
+                    return 1;
+                }
+                out[ind[k]] += d[k];
+            }
+            """
+        return (
+            """
+        static int %(name)s_run(
+            PyArrayObject* data, PyArrayObject* indices, PyArrayObject* indptr,
+            npy_intp N, PyArrayObject** z)
+        {
+            const npy_intp M = PyArray_DIMS(indptr)[0] - 1;
+            const npy_intp nnz = PyArray_DIMS(data)[0];
+            npy_intp dims[1] = {%(size)s};
+            Py_XDECREF(*z);
+            *z = (PyArrayObject*)PyArray_ZEROS(1, dims, %(typenum)s, 0);
+            if (!*z)
+                return 1;
+            const %(d_type)s* d = (%(d_type)s*)PyArray_DATA(data);
+            const npy_int32* ind = (npy_int32*)PyArray_DATA(indices);
+            const npy_int32* p = (npy_int32*)PyArray_DATA(indptr);
+            %(d_type)s* out = (%(d_type)s*)PyArray_DATA(*z);
+            %(loop)s
+            return 0;
+        }
+        """
+            % locals()
+        )
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        data, indices, indptr, n = inputs
+        (z,) = outputs
+        call = (
+            f"{name}_run({{arg0}}, {{arg1}}, {{arg2}}, "
+            f"((dtype_{n}*)PyArray_DATA({n}))[0], &{z})"
+        )
+        return self.c_contiguous_call([data, indices, indptr], call, sub)
+
+
+sum_csx_major = SumCSx("major")
+sum_csx_minor = SumCSx("minor")
+
+
+# register a specialization to replace SpSum -> SumCSx
+@local_optimizer([sparse.SpSum])
+def local_sp_sum_csx(fgraph, node):
+    if not isinstance(node.op, sparse.SpSum):
+        return False
+    (x,) = node.inputs
+    data, ind, ptr, shape = sparse.csm_properties(x)
+    out_dtype = node.outputs[0].type.dtype
+    if node.op.axis is None:
+        # Duplicated entries are summed anyway, so only the data is needed
+        return [tensor.sum(data, dtype=out_dtype)]
+
+    major_axis = 0 if x.type.format == "csr" else 1
+    n_minor = shape[1 - major_axis]
+    if node.op.axis == major_axis:
+        return [sum_csx_minor(data, ind, ptr, n_minor)]
+    return [sum_csx_major(data, ind, ptr, n_minor)]
+
+
+register_specialize(local_sp_sum_csx, "cxx_only")
+
+
+class Remove0CSx(_CSxOp):
+    """
+    Remove the explicit zeros of a sparse matrix.
+
+    Parameters
+    ----------
+    data, indices, indptr
+        Properties of the sparse matrix.
+
+    Returns
+    -------
+    The data, indices and indptr of the sparse matrix without explicit zeros.
+
+    Notes
+    -----
+    The rows are counted then compacted in parallel.
+
+    This op is used as an optimization of Remove0.
+
+    """
+
+    __props__ = ()
+
+    def make_node(self, data, indices, indptr):
+        data = tensor.as_tensor_variable(data)
+        assert data.type.ndim == 1
+        return Apply(
+            self,
+            [data, _csx_index(indices), _csx_index(indptr)],
+            [data.type(), tensor.ivector(), tensor.ivector()],
+        )
+
+    def perform(self, node, inputs, outputs):
+        data, indices, indptr = inputs
+        keep = data != 0
+        # Number of entries kept before each position
+        kept = np.zeros(len(data) + 1, dtype="int32")
+        np.cumsum(keep, out=kept[1:])
+        outputs[0][0] = data[keep]
+        outputs[1][0] = indices[keep]
+        outputs[2][0] = kept[indptr]
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_support_code_apply(self, node, name):
+        if node.inputs[0].type.dtype.startswith("complex"):
+            raise NotImplementedError("Complex types are not supported")
+        d_type = node.inputs[0].type.dtype_specs()[1]
+        typenum = node.inputs[0].type.dtype_specs()[2]
+        omp_for = self.omp_pragma("parallel for schedule(dynamic, 256)", "nnz")
+        return (
+            """
+        static int %(name)s_run(
+            PyArrayObject* data, PyArrayObject* indices, PyArrayObject* indptr,
+            PyArrayObject** z_data, PyArrayObject** z_ind, PyArrayObject** z_ptr)
+        {
+            const npy_intp M = PyArray_DIMS(indptr)[0] - 1;
+            const npy_intp nnz = PyArray_DIMS(data)[0];
+            const %(d_type)s* d = (%(d_type)s*)PyArray_DATA(data);
+            const npy_int32* ind = (npy_int32*)PyArray_DATA(indices);
+            const npy_int32* p = (npy_int32*)PyArray_DATA(indptr);
+
+            npy_intp dims[1] = {M + 1};
+            Py_XDECREF(*z_ptr);
+            *z_ptr = (PyArrayObject*)PyArray_ZEROS(1, dims, NPY_INT32, 0);
+            if (!*z_ptr)
+                return 1;
+            npy_int32* zp = (npy_int32*)PyArray_DATA(*z_ptr);
+            %(omp_for)s
+            for (npy_intp i = 0; i < M; ++i) {
+                npy_int32 count = 0;
+                for (npy_int32 k = p[i]; k < p[i + 1]; ++k)
+                    count += d[k] != 0;
+                zp[i + 1] = count;
+            }
+            for (npy_intp i = 0; i < M; ++i)
+                zp[i + 1] += zp[i];
+
+            dims[0] = zp[M];
+            Py_XDECREF(*z_data);
+            Py_XDECREF(*z_ind);
+            *z_data = (PyArrayObject*)PyArray_SimpleNew(1, dims, %(typenum)s);
+            *z_ind = (PyArrayObject*)PyArray_SimpleNew(1, dims, NPY_INT32);
+            if (!*z_data || !*z_ind)
+                return 1;
+            %(d_type)s* zd = (%(d_type)s*)PyArray_DATA(*z_data);
+            npy_int32* zi = (npy_int32*)PyArray_DATA(*z_ind);
+            %(omp_for)s
+            for (npy_intp i = 0; i < M; ++i) {
+                npy_int32 j = zp[i];
+                for (npy_int32 k = p[i]; k < p[i + 1]; ++k) {
+                    if (d[k] != 0) {
+                        zd[j] = d[k];
+                        zi[j] = ind[k];
+                        ++j;
+                    }
+                }
+            }
+            return 0;
+        }
+        """
+            % locals()
+        )
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        z_data, z_ind, z_ptr = outputs
+        call = (
+            f"{name}_run({{arg0}}, {{arg1}}, {{arg2}}, "
+            f"&{z_data}, &{z_ind}, &{z_ptr})"
+        )
+        return self.c_contiguous_call(inputs, call, sub)
+
+
+remove0_csx = Remove0CSx()
+
+
+# register a specialization to replace Remove0 -> Remove0CSx
+@local_optimizer([sparse.Remove0])
+def local_remove0_csx(fgraph, node):
+    if not isinstance(node.op, sparse.Remove0):
+        return False
+    (x,) = node.inputs
+    data, ind, ptr, shape = sparse.csm_properties(x)
+    z_data, z_ind, z_ptr = remove0_csx(data, ind, ptr)
+    return [sparse.CSM(x.type.format)(z_data, z_ind, z_ptr, shape)]
+
+
+register_specialize(local_remove0_csx, "cxx_only")
+
+
+class EnsureSortedIndicesCSx(_CSxOp):
+    """
+    Sort the indices of each row of a sparse matrix.
+
+    Parameters
+    ----------
+    data, indices, indptr
+        Properties of the sparse matrix.
+
+    Returns
+    -------
+    The data and indices of the sparse matrix, with the indices of each row
+    sorted. The indptr is unchanged.
+
+    Notes
+    -----
+    The rows are sorted in parallel and in place with a heap sort. Rows that
+    are already sorted are left untouched.
+
+    This op is used as an optimization of EnsureSortedIndices.
+
+    """
+
+    __props__ = ("inplace",)
+
+    def __init__(self, inplace=False, openmp=None):
+        super().__init__(openmp=openmp)
+        self.inplace = inplace
+        if self.inplace:
+            self.destroy_map = {0: [0], 1: [1]}
+
+    def __str__(self):
+        if self.inplace:
+            return self.__class__.__name__ + "{inplace}"
+        return self.__class__.__name__ + "{no_inplace}"
+
+    def make_node(self, data, indices, indptr):
+        data = tensor.as_tensor_variable(data)
+        assert data.type.ndim == 1
+        indices = _csx_index(indices)
+        return Apply(
+            self,
+            [data, indices, _csx_index(indptr)],
+            [data.type(), indices.type()],
+        )
+
+    def perform(self, node, inputs, outputs):
+        data, indices, indptr = inputs
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        order = np.lexsort((indices, rows))
+        if self.inplace:
+            data[:] = data[order]
+            indices[:] = indices[order]
+        else:
+            data = data[order]
+            indices = indices[order]
+        outputs[0][0] = data
+        outputs[1][0] = indices
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_support_code_apply(self, node, name):
+        d_type = node.inputs[0].type.dtype_specs()[1]
+        omp_for = self.omp_pragma("parallel for schedule(dynamic, 256)", "nnz")
+        return (
+            """
+        static void %(name)s_swap(npy_int32* ind, %(d_type)s* d, npy_intp a, npy_intp b)
+        {
+            const npy_int32 i = ind[a];
+            const %(d_type)s v = d[a];
+            ind[a] = ind[b];
+            d[a] = d[b];
+            ind[b] = i;
+            d[b] = v;
+        }
+
+        static void %(name)s_sift(
+            npy_int32* ind, %(d_type)s* d, npy_intp root, npy_intp n)
+        {
+            while (2 * root + 1 < n) {
+                npy_intp child = 2 * root + 1;
+                if (child + 1 < n && ind[child] < ind[child + 1])
+                    ++child;
+                if (ind[root] >= ind[child])
+                    return;
+                %(name)s_swap(ind, d, root, child);
+                root = child;
+            }
+        }
+
+        static void %(name)s_sort_row(npy_int32* ind, %(d_type)s* d, npy_intp n)
+        {
+            npy_intp k = 1;
+            while (k < n && ind[k - 1] <= ind[k])
+                ++k;
+            if (k >= n)
+                return;
+            for (npy_intp start = n / 2 - 1; start >= 0; --start)
+                %(name)s_sift(ind, d, start, n);
+            for (npy_intp end = n - 1; end > 0; --end) {
+                %(name)s_swap(ind, d, 0, end);
+                %(name)s_sift(ind, d, 0, end);
+            }
+        }
+
+        static int %(name)s_run(
+            PyArrayObject* data, PyArrayObject* indices, PyArrayObject* indptr,
+            int inplace, PyArrayObject** z_data, PyArrayObject** z_ind)
+        {
+            const npy_intp M = PyArray_DIMS(indptr)[0] - 1;
+            const npy_intp nnz = PyArray_DIMS(data)[0];
+            const npy_int32* p = (npy_int32*)PyArray_DATA(indptr);
+            Py_XDECREF(*z_data);
+            Py_XDECREF(*z_ind);
+            // `data` and `indices` are contiguous, so they are the inputs
+            // themselves unless those had to be copied.
+            if (inplace) {
+                Py_INCREF(data);
+                Py_INCREF(indices);
+                *z_data = data;
+                *z_ind = indices;
+            } else {
+                *z_data = (PyArrayObject*)PyArray_NewCopy(data, NPY_CORDER);
+                *z_ind = (PyArrayObject*)PyArray_NewCopy(indices, NPY_CORDER);
+                if (!*z_data || !*z_ind)
+                    return 1;
+            }
+            %(d_type)s* d = (%(d_type)s*)PyArray_DATA(*z_data);
+            npy_int32* ind = (npy_int32*)PyArray_DATA(*z_ind);
+            %(omp_for)s
+            for (npy_intp i = 0; i < M; ++i)
+                %(name)s_sort_row(ind + p[i], d + p[i], p[i + 1] - p[i]);
+            return 0;
+        }
+        """
+            % locals()
+        )
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        z_data, z_ind = outputs
+        call = (
+            f"{name}_run({{arg0}}, {{arg1}}, {{arg2}}, {int(self.inplace)}, "
+            f"&{z_data}, &{z_ind})"
+        )
+        return self.c_contiguous_call(inputs, call, sub)
+
+
+ensure_sorted_indices_csx = EnsureSortedIndicesCSx()
+
+
+# register a specialization to replace
+# EnsureSortedIndices -> EnsureSortedIndicesCSx
+@local_optimizer([sparse.EnsureSortedIndices])
+def local_ensure_sorted_indices_csx(fgraph, node):
+    if not isinstance(node.op, sparse.EnsureSortedIndices):
+        return False
+    (x,) = node.inputs
+    data, ind, ptr, shape = sparse.csm_properties(x)
+    z_data, z_ind = ensure_sorted_indices_csx(data, ind, ptr)
+    return [sparse.CSM(x.type.format)(z_data, z_ind, ptr, shape)]
+
+
+register_specialize(local_ensure_sorted_indices_csx, "cxx_only")
+
+
+@local_optimizer([EnsureSortedIndicesCSx])
+def local_inplace_ensure_sorted_indices_csx(fgraph, node):
+    """
+    Optimization to insert inplace versions of EnsureSortedIndicesCSx.
+
+    """
+    if isinstance(node.op, EnsureSortedIndicesCSx) and not node.op.inplace:
+        new_op = EnsureSortedIndicesCSx(inplace=True, openmp=node.op.openmp)
+        return new_op(*node.inputs, return_list=True)
+    return False
+
+
+theano.compile.optdb.register(
+    "local_inplace_ensure_sorted_indices_csx",
+    TopoOptimizer(
+        local_inplace_ensure_sorted_indices_csx,
+        failure_callback=TopoOptimizer.warn_inplace,
+    ),
+    60,
+    "fast_run",
+    "inplace",
+)
+
+
+class DotCSxDense(_CSxOp):
+    """
+    Dot product of a sparse matrix in csr or csc format and a dense matrix.
+
+    Parameters
+    ----------
+    a_val, a_ind, a_ptr
+        Properties of the sparse matrix.
+    a_shape
+        Shape of the sparse matrix.
+    b
+        Dense matrix.
+
+    Returns
+    -------
+    The dense matrix `a` . `b`.
+
+    Notes
+    -----
+    With a csr matrix, the rows of the output are split between the threads.
+    With a csc matrix, the threads share the columns of the output instead,
+    so that they never write to the same elements. In both cases, the output
+    rows are updated by blocks of `block_size` columns, which stay in cache
+    while all the entries of the sparse row (or column) are applied.
+
+    This op is used as an optimization of Dot and StructuredDot.
+
+    """
+
+    __props__ = ("format",)
+    block_size = 256
+
+    def __init__(self, format, openmp=None):
+        super().__init__(openmp=openmp)
+        if format not in ("csr", "csc"):
+            raise ValueError(f"Unsupported sparse format: {format}")
+        self.format = format
+
+    def __str__(self):
+        return f"{self.__class__.__name__}{{{self.format}}}"
+
+    def make_node(self, a_val, a_ind, a_ptr, a_shape, b):
+        a_val = tensor.as_tensor_variable(a_val)
+        a_shape = tensor.as_tensor_variable(a_shape)
+        b = tensor.as_tensor_variable(b)
+        assert a_val.type.ndim == 1 and a_shape.type.ndim == 1 and b.type.ndim == 2
+        dtype_out = scalar.upcast(a_val.type.dtype, b.type.dtype)
+        return Apply(
+            self,
+            [a_val, _csx_index(a_ind), _csx_index(a_ptr), a_shape, b],
+            [tensor.tensor(dtype_out, (False, b.type.broadcastable[1]))],
+        )
+
+    def dot_inputs(self, node):
+        """Return the data of the sparse matrix and the dense matrix of `node`."""
+        return node.inputs[0], node.inputs[4]
+
+    def sparse_matrix(self, a_val, a_ind, a_ptr, a_shape):
+        cls = getattr(scipy.sparse, self.format + "_matrix")
+        return cls((a_val, a_ind, a_ptr), shape=tuple(a_shape))
+
+    def perform(self, node, inputs, outputs):
+        a_val, a_ind, a_ptr, a_shape, b = inputs
+        a = self.sparse_matrix(a_val, a_ind, a_ptr, a_shape)
+        outputs[0][0] = _asarray(a * b, dtype=node.outputs[0].type.dtype)
+
+    def c_code_cache_version(self):
+        return (1,)
+
+    def c_support_code_apply(self, node, name):
+        a_val, b = self.dot_inputs(node)
+        if any(v.type.dtype.startswith("complex") for v in node.inputs + node.outputs):
+            raise NotImplementedError("Complex types are not supported")
+        a_type = a_val.type.dtype_specs()[1]
+        b_type = b.type.dtype_specs()[1]
+        z_type = node.outputs[0].type.dtype_specs()[1]
+        block_size = self.block_size
+        omp_for = self.omp_pragma("parallel for schedule(dynamic, 1)", "nnz * N")
+        axpy = """
+                    const %(z_type)s a = alpha * val[j];
+                    if (Sz1 == 1 && Sb1 == 1) {
+                        for (npy_intp n = n0; n < n1; ++n)
+                            zm[n] += a * bk[n];
+                    } else {
+                        for (npy_intp n = n0; n < n1; ++n)
+                            zm[n * Sz1] += a * bk[n * Sb1];
+                    }
+        """ % dict(
+            z_type=z_type
+        )
+        if self.format == "csr":
+            n_major = "M"
+            loops = """
+            %(omp_for)s
+            for (npy_intp m = 0; m < M; ++m) {
+                %(z_type)s* zm = (%(z_type)s*)(Dz + m * Sz0);
+                for (npy_intp n0 = 0; n0 < N; n0 += block) {
+                    const npy_intp n1 = n0 + block < N ? n0 + block : N;
+                    for (npy_int32 j = ptr[m]; j < ptr[m + 1]; ++j) {
+                        const npy_int32 k = ind[j];
+                        if (k < 0 || k >= K) {
+                            status = 1;
+                            break;
+                        }
+                        const %(b_type)s* bk = (const %(b_type)s*)(Db + k * Sb0);
+                        %(axpy)s
+                    }
+                }
+            }
+            """ % dict(
+                omp_for=omp_for, z_type=z_type, b_type=b_type, axpy=axpy
+            )
+        else:
+            n_major = "K"
+            # Use smaller blocks when there are not enough columns for all
+            # the threads
+            split = ""
+            if self.openmp:
+                split = """
+                const npy_intp n_threads = omp_get_max_threads();
+                const npy_intp split = (N + n_threads - 1) / n_threads;
+                if (split < block)
+                    block = split < 16 ? 16 : split;
+                """
+            loops = """
+            %(split)s
+            const npy_intp n_blocks = (N + block - 1) / block;
+            %(omp_for)s
+            for (npy_intp blk = 0; blk < n_blocks; ++blk) {
+                const npy_intp n0 = blk * block;
+                const npy_intp n1 = n0 + block < N ? n0 + block : N;
+                for (npy_intp k = 0; k < K; ++k) {
+                    const %(b_type)s* bk = (const %(b_type)s*)(Db + k * Sb0);
+                    for (npy_int32 j = ptr[k]; j < ptr[k + 1]; ++j) {
+                        const npy_int32 m = ind[j];
+                        if (m < 0 || m >= M) {
+                            status = 1;
+                            break;
+                        }
+                        %(z_type)s* zm = (%(z_type)s*)(Dz + m * Sz0);
+                        %(axpy)s
+                    }
+                }
+            }
+            """ % dict(
+                split=split, omp_for=omp_for, z_type=z_type, b_type=b_type, axpy=axpy
+            )
+        return (
+            """
+        // Add `alpha` * a . b to z, where a is a M x K sparse matrix
+        static int %(name)s_dot(
+            PyArrayObject* a_val, PyArrayObject* a_ind, PyArrayObject* a_ptr,
+            npy_intp M, npy_intp K, PyArrayObject* b, PyArrayObject* z,
+            %(z_type)s alpha)
+        {
+            const npy_intp N = PyArray_DIMS(b)[1];
+            if (PyArray_DIMS(a_ptr)[0] != %(n_major)s + 1
+                || PyArray_DIMS(b)[0] != K
+                || PyArray_DIMS(z)[0] != M || PyArray_DIMS(z)[1] != N) {
+                PyErr_SetString(PyExc_ValueError,
+                                "Shape mismatch in the sparse dot product");
+                return 1;
+            }
+            const npy_intp nnz = PyArray_DIMS(a_val)[0];
+            const %(a_type)s* val = (%(a_type)s*)PyArray_DATA(a_val);
+            const npy_int32* ind = (npy_int32*)PyArray_DATA(a_ind);
+            const npy_int32* ptr = (npy_int32*)PyArray_DATA(a_ptr);
+            const char* Db = PyArray_BYTES(b);
+            char* Dz = PyArray_BYTES(z);
+            const npy_intp Sb0 = PyArray_STRIDES(b)[0];
+            const npy_intp Sz0 = PyArray_STRIDES(z)[0];
+            const npy_intp Sb1 = PyArray_STRIDES(b)[1] / (npy_intp)sizeof(%(b_type)s);
+            const npy_intp Sz1 = PyArray_STRIDES(z)[1] / (npy_intp)sizeof(%(z_type)s);
+            npy_intp block = %(block_size)s;
+            int status = 0;
+            %(loops)s
+            if (status) {
+                PyErr_SetString(PyExc_ValueError,
+                                "The sparse matrix has out of range indices");
+                return 1;
+            }
+            return 0;
+        }
+        """
+            % locals()
+        )
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        a_val, a_ind, a_ptr, a_shape, b = inputs
+        (z,) = outputs
+        typenum = node.outputs[0].type.dtype_specs()[2]
+        fail = sub["fail"]
+        call = f"{name}_dot({{arg0}}, {{arg1}}, {{arg2}}, M, K, {b}, {z}, 1)"
+        return f"""
+        {{
+            const npy_intp M = *(dtype_{a_shape}*)PyArray_GETPTR1({a_shape}, 0);
+            const npy_intp K = *(dtype_{a_shape}*)PyArray_GETPTR1({a_shape}, 1);
+            npy_intp dims[2] = {{M, PyArray_DIMS({b})[1]}};
+            if (!{z} || !PyArray_IS_C_CONTIGUOUS({z})
+                || !PyArray_CompareLists(PyArray_DIMS({z}), dims, 2)) {{
+                Py_XDECREF({z});
+                {z} = (PyArrayObject*)PyArray_ZEROS(2, dims, {typenum}, 0);
+                if (!{z}) {{
+                    {fail}
+                }}
+            }} else {{
+                memset(PyArray_DATA({z}), 0, PyArray_NBYTES({z}));
+            }}
+            {self.c_contiguous_call([a_val, a_ind, a_ptr], call, sub)}
+        }}
+        """
+
+
+class UsmmCSxDense(DotCSxDense):
+    """
+    Performs the expression `alpha` * `x` `y` + `z`, where `x` is a sparse
+    matrix in csr or csc format and `y` is dense.
+
+    Parameters
+    ----------
+    alpha
+        A tensor scalar.
+    x_val, x_ind, x_ptr
+        Properties of the sparse matrix.
+    x_shape
+        Shape of the sparse matrix.
+    y
+        Dense matrix.
+    z
+        Dense matrix.
+
+    Returns
+    -------
+    The dense matrix resulting from `alpha` * `x` `y` + `z`.
+
+    Notes
+    -----
+    It uses the same kernels as DotCSxDense.
+
+    This op is used as an optimization of Usmm.
+
+    """
+
+    __props__ = ("format", "inplace")
+
+    def __init__(self, format, inplace=False, openmp=None):
+        super().__init__(format, openmp=openmp)
+        self.inplace = inplace
+        if inplace:
+            self.destroy_map = {0: [6]}
+
+    def __str__(self):
+        inplace = "inplace" if self.inplace else "no_inplace"
+        return f"{self.__class__.__name__}{{{self.format}, {inplace}}}"
+
+    def make_node(self, alpha, x_val, x_ind, x_ptr, x_shape, y, z):
+        alpha = tensor.as_tensor_variable(alpha)
+        z = tensor.as_tensor_variable(z)
+        assert all(alpha.type.broadcastable) and z.type.ndim == 2
+        node = super().make_node(x_val, x_ind, x_ptr, x_shape, y)
+        dtype_out = scalar.upcast(
+            node.outputs[0].type.dtype, alpha.type.dtype, z.type.dtype
+        )
+        if self.inplace:
+            assert z.type.dtype == dtype_out
+        elif z.type.dtype != dtype_out:
+            z = tensor.cast(z, dtype_out)
+        return Apply(
+            self,
+            [alpha] + node.inputs + [z],
+            [tensor.tensor(dtype_out, (False, False))],
+        )
+
+    def dot_inputs(self, node):
+        return node.inputs[1], node.inputs[5]
+
+    def perform(self, node, inputs, outputs):
+        alpha, x_val, x_ind, x_ptr, x_shape, y, z = inputs
+        x = self.sparse_matrix(x_val, x_ind, x_ptr, x_shape)
+        if not self.inplace:
+            z = z.copy()
+        z += np.asarray(alpha).item() * (x * y)
+        outputs[0][0] = z
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        alpha, x_val, x_ind, x_ptr, x_shape, y, z = inputs
+        (zn,) = outputs
+        z_type = node.outputs[0].type.dtype_specs()[1]
+        fail = sub["fail"]
+        if self.inplace:
+            init = f"""
+            Py_XDECREF({zn});
+            {zn} = {z};
+            Py_INCREF({zn});
+            """
+        else:
+            init = f"""
+            Py_XDECREF({zn});
+            {zn} = (PyArrayObject*)PyArray_NewCopy({z}, NPY_CORDER);
+            if (!{zn}) {{
+                {fail}
+            }}
+            """
+        call = (
+            f"{name}_dot({{arg0}}, {{arg1}}, {{arg2}}, M, K, {y}, {zn}, "
+            f"({z_type})*(dtype_{alpha}*)PyArray_DATA({alpha}))"
+        )
+        return f"""
+        {{
+            const npy_intp M = *(dtype_{x_shape}*)PyArray_GETPTR1({x_shape}, 0);
+            const npy_intp K = *(dtype_{x_shape}*)PyArray_GETPTR1({x_shape}, 1);
+            {init}
+            {self.c_contiguous_call([x_val, x_ind, x_ptr], call, sub)}
+        }}
+        """
+
+
+def _transposed_csx(x):
+    """
+    Return the format and properties of the transpose of the sparse `x`.
+
+    The csr properties of a matrix are the csc properties of its transpose.
+
+    """
+    val, ind, ptr, shape = csm_properties(x)
+    format = "csc" if x.type.format == "csr" else "csr"
+    return format, val, ind, ptr, shape[::-1]
+
+
+@local_optimizer([sparse._dot, sparse._structured_dot, usmm])
+def local_csx_dense_dot(fgraph, node):
+    """
+    Use the multithreaded kernels for products of a csr or csc matrix and a
+    dense matrix.
+
+    dot(x, y) -> DotCSxDense
+    usmm(alpha, x, y, z) -> UsmmCSxDense
+
+    A dense matrix times a sparse one is computed as the transpose of the
+    product of the transposes.
+
+    """
+    if not config.cxx:
+        return False
+    if node.op in (sparse._dot, sparse._structured_dot):
+        alpha, (x, y), z = None, node.inputs, None
+    elif node.op == usmm:
+        alpha, x, y, z = node.inputs
+    else:
+        return False
+    if any(v.type.dtype.startswith("complex") for v in node.inputs + node.outputs):
+        return False
+
+    if _is_sparse_variable(x) and not _is_sparse_variable(y):
+        if x.type.format not in ("csr", "csc"):
+            return False
+        transposed = False
+        format = x.type.format
+        val, ind, ptr, shape = csm_properties(x)
+        dense = y
+    elif _is_sparse_variable(y) and not _is_sparse_variable(x):
+        if y.type.format not in ("csr", "csc"):
+            return False
+        transposed = True
+        format, val, ind, ptr, shape = _transposed_csx(y)
+        dense = x.T
+        if z is not None:
+            z = z.T
+    else:
+        return False
+
+    if alpha is None:
+        if dense.ndim == 1:
+            out = DotCSxDense(format)(val, ind, ptr, shape, dense.dimshuffle(0, "x"))
+            return [out.dimshuffle(0)]
+        out = DotCSxDense(format)(val, ind, ptr, shape, dense)
+    else:
+        out = UsmmCSxDense(format)(alpha, val, ind, ptr, shape, dense, z)
+    if transposed:
+        out = out.T
+    return [out]
+
+
+# The Usmm graphs are formed during specialization, so the dot products are
+# only replaced after it
+theano.compile.optdb.register(
+    "local_csx_dense_dot",
+    TopoOptimizer(local_csx_dense_dot),
+    48.8,
+    "fast_run",
+    "cxx_only",
+)
+
+
+@local_optimizer([UsmmCSxDense])
+def local_inplace_usmm_csx_dense(fgraph, node):
+    """
+    Optimization to insert inplace versions of UsmmCSxDense.
+
+    """
+    if isinstance(node.op, UsmmCSxDense) and not node.op.inplace:
+        if node.inputs[6].type.dtype != node.outputs[0].type.dtype:
+            return False
+        new_op = UsmmCSxDense(node.op.format, inplace=True, openmp=node.op.openmp)
+        return new_op(*node.inputs, return_list=True)
+    return False
+
+
+theano.compile.optdb.register(
+    "local_inplace_usmm_csx_dense",
+    TopoOptimizer(
+        local_inplace_usmm_csx_dense, failure_callback=TopoOptimizer.warn_inplace
+    ),
+    60,
+    "fast_run",
+    "inplace",
+)
@@ -26,6 +26,7 @@ from theano.tensor import (
     nlinalg,
     opt,
     opt_uncanonicalize,
+    vectorize,
     xlogx,
 )
 from theano.tensor.basic import *
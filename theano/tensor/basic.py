@@ -61,6 +61,10 @@ def check_equal_numpy(x, y):
         return builtins.all(
             np.all(a == b) for a, b in zip(x.__getstate__(), y.__getstate__())
         )
+    elif isinstance(x, np.random.Generator) and isinstance(y, np.random.Generator):
+        from theano.tensor.random.type import RandomGeneratorType
+
+        return RandomGeneratorType.values_eq(x, y)
     else:
         return x == y
 
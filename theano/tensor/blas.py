@@ -160,6 +160,7 @@ from theano.graph.utils import MethodNotDefined, TestValueError
 from theano.printing import FunctionPrinter, debugprint, pprint
 from theano.scalar import bool as bool_t
 from theano.tensor import basic as tt
+from theano.tensor.blas_calibration import CalibratedBLAS
 from theano.tensor.blas_headers import blas_header_text, blas_header_version
 from theano.tensor.opt import in2out, local_dimshuffle_lift
 from theano.tensor.type import values_eq_approx_remove_inf_nan
@@ -830,7 +831,7 @@ class GemmRelated(COp):
         return (13, blas_header_version())
 
 
-class Gemm(GemmRelated):
+class Gemm(CalibratedBLAS, GemmRelated):
     """In-place version of matrix-matrix multiplication (with accumulation).
 
     When a and b are scalars and x, y, and z are matrices, then
@@ -860,6 +861,7 @@ class Gemm(GemmRelated):
     E_float = "gemm requires floating-point dtypes"
 
     __props__ = ("inplace",)
+    calibration_name = "gemm"
     params_type = ParamsType(
         inplace=bool_t,
     )
@@ -2106,10 +2108,52 @@ class BatchedDot(COp):
 
     def c_support_code(self, **kwargs):
         batch_gemm_defn = """
+        /* Batched product of small matrices, where the overhead of a BLAS
+         * call per matrix dominates. The strides are in elements.
+         */
+        template<typename dtype>
+        void small_batch_gemm(npy_intp batch, int M, int N, int K,
+                              const dtype* x, npy_intp sx0, npy_intp sx1, npy_intp sx2,
+                              const dtype* y, npy_intp sy0, npy_intp sy1, npy_intp sy2,
+                              dtype* z, npy_intp sz0, npy_intp sz1, npy_intp sz2) {
+            for (npy_intp b = 0; b < batch; b++) {
+                const dtype* xb = x + b * sx0;
+                const dtype* yb = y + b * sy0;
+                dtype* zb = z + b * sz0;
+                if (sy2 == 1 && sz2 == 1) {
+                    // The rows of y and z are contiguous: accumulate whole rows
+                    // of z so that the compiler can vectorize the inner loop.
+                    for (int m = 0; m < M; m++) {
+                        const dtype* xr = xb + m * sx1;
+                        dtype* zr = zb + m * sz1;
+                        for (int n = 0; n < N; n++)
+                            zr[n] = 0;
+                        for (int k = 0; k < K; k++) {
+                            const dtype xv = xr[k * sx2];
+                            const dtype* yr = yb + k * sy1;
+                            for (int n = 0; n < N; n++)
+                                zr[n] += xv * yr[n];
+                        }
+                    }
+                } else {
+                    for (int m = 0; m < M; m++) {
+                        const dtype* xr = xb + m * sx1;
+                        for (int n = 0; n < N; n++) {
+                            const dtype* yc = yb + n * sy2;
+                            dtype acc = 0;
+                            for (int k = 0; k < K; k++)
+                                acc += xr[k * sx2] * yc[k * sy1];
+                            zb[m * sz1 + n * sz2] = acc;
+                        }
+                    }
+                }
+            }
+        }
+
         template<typename dtype>
         bool batch_gemm(void (*gemm)(char*, char*, const int*, const int*, const int*, const dtype*, const dtype*, const int*, const dtype*, const int*, const dtype*, dtype*, const int*),
                         int type_size, PyArrayObject* xs, PyArrayObject* ys,
-                        PyArrayObject* zs) {
+                        PyArrayObject* zs, int small_size) {
             npy_intp *Nx = PyArray_DIMS(xs), *Sx = PyArray_STRIDES(xs);
             npy_intp *Ny = PyArray_DIMS(ys), *Sy = PyArray_STRIDES(ys);
             npy_intp *Nz = PyArray_DIMS(zs), *Sz = PyArray_STRIDES(zs);
@@ -2134,6 +2178,15 @@ class BatchedDot(COp):
                 return 1;
             }
 
+            if (Nz[1] <= small_size && Nz[2] <= small_size && Nx[2] <= small_size) {
+                small_batch_gemm<dtype>(
+                    Nz[0], Nz[1], Nz[2], Nx[2],
+                    (dtype*)PyArray_DATA(xs), Sx[0] / type_size, Sx[1] / type_size, Sx[2] / type_size,
+                    (dtype*)PyArray_DATA(ys), Sy[0] / type_size, Sy[1] / type_size, Sy[2] / type_size,
+                    (dtype*)PyArray_DATA(zs), Sz[0] / type_size, Sz[1] / type_size, Sz[2] / type_size);
+                return 0;
+            }
+
             /* encode the stride structure of _x,_y,_z into a single integer. */
             int unit = 0;
             unit |= ((Sx[2] == type_size || Nx[2] == 1) ? 0x0 : (Sx[1] == type_size || Nx[1]==1) ? 0x1 : 0x2) << 8;
@@ -2335,6 +2388,7 @@ class BatchedDot(COp):
                 )
             )
         upcast = "\n".join(upcast) % locals()
+        small_size = int(config.blas__batched_dot_small_size)
 
         return (
             """
@@ -2391,12 +2445,12 @@ class BatchedDot(COp):
         switch (type_num)
         {
             case NPY_FLOAT:
-            if (batch_gemm<float>(sgemm_, type_size, xs, ys, zs)) {
+            if (batch_gemm<float>(sgemm_, type_size, xs, ys, zs, %(small_size)s)) {
                 %(fail)s;
             }
             break;
             case NPY_DOUBLE:
-            if (batch_gemm<double>(dgemm_, type_size, xs, ys, zs)) {
+            if (batch_gemm<double>(dgemm_, type_size, xs, ys, zs, %(small_size)s)) {
                 %(fail)s;
             }
             break;
@@ -2408,7 +2462,7 @@ class BatchedDot(COp):
     def c_code_cache_version(self):
         from theano.tensor.blas_headers import blas_header_version
 
-        return (4, blas_header_version())
+        return (5, config.blas__batched_dot_small_size, blas_header_version())
 
     def grad(self, inp, grads):
         x, y = inp
@@ -21,6 +21,7 @@ from theano.tensor.blas import (
     local_optimizer,
     optdb,
 )
+from theano.tensor.blas_calibration import CalibratedBLAS
 from theano.tensor.opt import in2out
 
 
@@ -329,10 +330,11 @@ def ger_c_code(A, a, x, y, Z, fail, params):
     )
 
 
-class CGer(BaseBLAS, Ger):
+class CGer(CalibratedBLAS, BaseBLAS, Ger):
     params_type = ParamsType(
         destructive=bool_t,
     )
+    calibration_name = "ger"
 
     def c_code(self, node, name, inp, out, sub):
         A, a, x, y = inp
@@ -612,10 +614,11 @@ def gemv_c_code(y, A, x, z, alpha, beta, fail, force_init_beta=False, params=Non
     return code % locals()
 
 
-class CGemv(BaseBLAS, Gemv):
+class CGemv(CalibratedBLAS, BaseBLAS, Gemv):
     params_type = ParamsType(
         inplace=bool_t,
     )
+    calibration_name = "gemv"
 
     def __init__(self, inplace):
         super().__init__(inplace)
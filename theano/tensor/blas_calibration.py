@@ -0,0 +1,240 @@
+"""
+Per size calibration of the BLAS implementations of `Gemm`, `Gemv` and `Ger`.
+
+Two BLAS providers are available for these ops: their C code, which calls
+the BLAS given by ``config.blas__ldflags``, and their Python code, which
+calls the BLAS bundled with NumPy and SciPy (see `blas_scipy`).  Which one
+is the fastest depends on the libraries, on the machine and on the size of
+the problem: the C code avoids the Python overhead on small problems, but
+the bundled BLAS can be better tuned for big ones.
+
+The functions in this module time both providers on the current machine for
+a few sizes, and record the fastest per op, dtype and size class in a JSON
+file in the compiledir.  When the Theano flag ``blas__autotune`` is True,
+the thunks of `Gemm`, `CGemv` and `CGer` look up the size class of their
+inputs on every call and run the recorded provider (see
+`CalibratedBLAS`).  Sizes that were not calibrated use the C code.
+
+Choosing between several native BLAS libraries is still done with
+``config.blas__ldflags``, as they export the same symbols and can not be
+loaded in the same process.
+
+"""
+
+import logging
+
+import numpy as np
+
+from theano.configdefaults import config
+from theano.graph.op import COp, Op
+from theano.graph.utils import MethodNotDefined
+from theano.tensor.calibration import CalibrationTable, time_function
+
+
+_logger = logging.getLogger("theano.tensor.blas_calibration")
+
+PROVIDERS = ("c", "py")
+
+# A size falls in the first class whose bound is greater or equal to it,
+# or in the class ``len(SIZE_CLASS_BOUNDS)`` when it is bigger than all.
+SIZE_CLASS_BOUNDS = (16, 64, 256, 1024)
+
+
+def _parse_entry(entry):
+    # JSON keys are strings
+    return {int(c): str(p) for c, p in entry.items() if p in PROVIDERS}
+
+
+# Mapping from `calibration_key` to a dict from size class to provider.
+calibration = CalibrationTable("blas", _parse_entry)
+
+
+def calibration_key(op_name, dtype):
+    """Return the key identifying the BLAS function `op_name` on `dtype` data."""
+    return f"{op_name}|{dtype}"
+
+
+def size_class(size):
+    """Return the size class of a problem whose biggest dimension is `size`."""
+    for i, bound in enumerate(SIZE_CLASS_BOUNDS):
+        if size <= bound:
+            return i
+    return len(SIZE_CLASS_BOUNDS)
+
+
+def blas_size(inputs):
+    """Return the biggest dimension of the matrices in `inputs`."""
+    return max((max(i.shape) for i in inputs if np.ndim(i) == 2), default=0)
+
+
+def make_dispatch_thunk(op_name, op, node, storage_map, compute_map, no_recycling):
+    """
+    Return a thunk running the calibrated provider of `node`.
+
+    The thunk measures its inputs on every call and runs the C or the Python
+    implementation of `op` depending on the recorded size class.  None is
+    returned when the calibration of `op_name` on the dtype of `node` only
+    chooses the C code, as the plain C thunk is then faster, or when the C
+    code is not available.
+
+    """
+    dtype = node.outputs[0].dtype
+    entry = calibration.get().get(calibration_key(op_name, dtype))
+    if not entry or all(p == "c" for p in entry.values()):
+        return None
+
+    try:
+        c_thunk = COp.make_thunk(
+            op, node, storage_map, compute_map, no_recycling, impl="c"
+        )
+    except (NotImplementedError, MethodNotDefined):
+        return None
+    py_thunk = Op.make_thunk(
+        op, node, storage_map, compute_map, no_recycling, impl="py"
+    )
+    input_storage = [storage_map[r] for r in node.inputs]
+    providers = [entry.get(c, "c") for c in range(len(SIZE_CLASS_BOUNDS) + 1)]
+
+    def rval():
+        size = blas_size([s[0] for s in input_storage])
+        if providers[size_class(size)] == "py":
+            return py_thunk()
+        return c_thunk()
+
+    rval.inputs = c_thunk.inputs
+    rval.outputs = c_thunk.outputs
+    rval.lazy = False
+    return rval
+
+
+class CalibratedBLAS:
+    """
+    Mixin for the BLAS `COp`s whose provider can be calibrated.
+
+    When ``config.blas__autotune`` is True, `make_thunk` returns the thunk of
+    `make_dispatch_thunk` for the calibration of `calibration_name`.  The
+    mixin must come before the `COp` in the bases of the op.
+
+    """
+
+    calibration_name = None
+
+    def make_thunk(self, node, storage_map, compute_map, no_recycling, impl=None):
+        if impl is None and config.blas__autotune and config.cxx:
+            thunk = make_dispatch_thunk(
+                self.calibration_name,
+                self,
+                node,
+                storage_map,
+                compute_map,
+                no_recycling,
+            )
+            if thunk is not None:
+                return thunk
+        return super().make_thunk(node, storage_map, compute_map, no_recycling, impl)
+
+
+def _make_graph(op_name, dtype):
+    # Return the inputs and the output of a non-inplace `op_name`, and a
+    # function returning input values for a given size.
+    from theano.tensor import blas, blas_c
+    from theano.tensor.type import TensorType
+
+    scalar = TensorType(dtype, ())
+    vector = TensorType(dtype, (False,))
+    matrix = TensorType(dtype, (False, False))
+
+    if op_name == "gemm":
+        inputs = [matrix(), scalar(), matrix(), matrix(), scalar()]
+        out = blas.gemm_no_inplace(*inputs)
+
+        def values(rng, n):
+            return [rng.rand(n, n), 0.5, rng.rand(n, n), rng.rand(n, n), 0.7]
+
+    elif op_name == "gemv":
+        inputs = [vector(), scalar(), matrix(), vector(), scalar()]
+        out = blas_c.cgemv_no_inplace(*inputs)
+
+        def values(rng, n):
+            return [rng.rand(n), 0.5, rng.rand(n, n), rng.rand(n), 0.7]
+
+    elif op_name == "ger":
+        inputs = [matrix(), scalar(), vector(), vector()]
+        out = blas_c.cger_no_inplace(*inputs)
+
+        def values(rng, n):
+            return [rng.rand(n, n), 0.5, rng.rand(n), rng.rand(n)]
+
+    else:
+        raise ValueError(f"Unknown BLAS function {op_name}")
+
+    def typed_values(n):
+        rng = np.random.RandomState(n)
+        return [np.asarray(v, dtype=dtype) for v in values(rng, n)]
+
+    return inputs, out, typed_values
+
+
+def calibrate(op_name, dtype="float64", sizes=None, n_repeat=10, save=True):
+    """
+    Time the C and Python implementations of a BLAS op and record the best.
+
+    Parameters
+    ----------
+    op_name : str
+        One of "gemm", "gemv" or "ger".
+    dtype : str
+        The dtype of the inputs, "float32" or "float64".
+    sizes : list of int
+        The sizes of the square matrices to time.  The provider chosen for
+        a size class is the fastest one on the sizes of that class.
+    n_repeat : int
+        The best of `n_repeat` calls is kept for each measure.
+    save : bool
+        If True, the result is added to the calibration file of the
+        compiledir and used immediately.
+
+    Returns
+    -------
+    dict
+        The new calibration entry, mapping the size classes of `sizes` to
+        "c" or "py".
+
+    """
+    import theano
+
+    if not config.blas__ldflags:
+        raise RuntimeError(
+            "The Theano flag blas__ldflags is empty, the C code of the BLAS "
+            "ops is not available."
+        )
+    if sizes is None:
+        sizes = [8, 32, 128, 512, 2048]
+
+    with config.change_flags(blas__autotune=False):
+        inputs, out, values = _make_graph(op_name, dtype)
+        fns = {
+            provider: theano.function(
+                inputs,
+                out,
+                mode=theano.compile.mode.Mode(linker=provider, optimizer=None),
+            )
+            for provider in PROVIDERS
+        }
+
+        times = {}
+        for size in sizes:
+            args = values(size)
+            for provider, fn in fns.items():
+                t = time_function(fn, args, n_repeat)
+                _logger.debug(f"{op_name} {dtype} size {size}: {provider} {t:.3g}s")
+                key = (size_class(size), provider)
+                times[key] = times.get(key, 0) + t
+
+    entry = {}
+    for c in sorted({size_class(size) for size in sizes}):
+        entry[c] = min(PROVIDERS, key=lambda p: times[(c, p)])
+
+    if save:
+        calibration.save({calibration_key(op_name, dtype): entry})
+    return entry
@@ -0,0 +1,124 @@
+"""
+Tables of measures made on the current machine, saved in the compiledir.
+
+Some implementation choices, like the minimum size from which a loop is run
+with OpenMP (see `elemwise_openmp`) or the BLAS used for a given problem
+size (see `blas_calibration`), depend on the machine.  They are measured
+once by a `calibrate` function and recorded in a `CalibrationTable`, which
+maps keys to entries and is kept as a JSON file in the compiledir.
+
+"""
+
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from theano.configdefaults import config
+
+
+_logger = logging.getLogger("theano.tensor.calibration")
+
+# Mapping from the name of each `CalibrationTable` to the table.
+tables = {}
+
+
+class CalibrationTable:
+    """
+    A calibration table, kept as a JSON file in the compiledir.
+
+    The table maps string keys to entries, which are dicts.  It is read
+    from its file on first use.
+
+    Parameters
+    ----------
+    name : str
+        The name of the table.  The file of the table is
+        ``<name>_calibration.json``.
+    parse_entry : callable
+        Function converting an entry read from the JSON file to the entry
+        used in the table.  It can raise KeyError, TypeError or ValueError
+        on invalid entries.
+
+    """
+
+    def __init__(self, name, parse_entry):
+        if name in tables:
+            raise ValueError(f"There is already a calibration table named {name}")
+        self.name = name
+        self.filename = f"{name}_calibration.json"
+        self.parse_entry = parse_entry
+        # None means that the file was not read yet.
+        self._table = None
+        tables[name] = self
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name})"
+
+    def path(self):
+        """Return the path of the file of the table in the current compiledir."""
+        return os.path.join(config.compiledir, self.filename)
+
+    def load(self, path=None):
+        """
+        Read a calibration file.
+
+        Missing or unreadable files are treated as an empty calibration.
+
+        """
+        if path is None:
+            path = self.path()
+        try:
+            with open(path) as f:
+                table = json.load(f)
+            return {key: self.parse_entry(entry) for key, entry in table.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+            _logger.warning(f"Ignoring the {self.name} calibration file {path}: {e}")
+            return {}
+
+    def save(self, table, path=None):
+        """
+        Write the entries of `table`, merged with the ones already in `path`.
+
+        An entry already in the file is updated with the new one.  The file
+        is written to a temporary file that is then renamed, so concurrent
+        processes never read a partially written file.  The merged table is
+        then used and returned.
+
+        """
+        if path is None:
+            path = self.path()
+        merged = self.load(path)
+        for key, entry in table.items():
+            merged[key] = {**merged.get(key, {}), **entry}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(merged, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+        self.set(merged)
+        return merged
+
+    def get(self):
+        """Return the table in use, reading it on first use."""
+        if self._table is None:
+            self._table = self.load()
+        return self._table
+
+    def set(self, table):
+        """Replace the table in use (without writing it to disk)."""
+        self._table = dict(table)
+
+
+def time_function(fn, args, n_repeat):
+    """Return the best time of `n_repeat` calls of ``fn(*args)``, after a warm up."""
+    fn(*args)
+    best = np.inf
+    for _ in range(n_repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
@@ -15,6 +15,7 @@ from theano.misc.safe_asarray import _asarray
 from theano.printing import FunctionPrinter, pprint
 from theano.scalar import get_scalar_type
 from theano.tensor import elemwise_cgen as cgen
+from theano.tensor.elemwise_openmp import omp_parallel_for, openmp_params
 from theano.utils import uniq
 
 
@@ -390,6 +391,7 @@ second dimension
 
     """
 
+    _f16_ok = True
     __props__ = ("scalar_op", "inplace_pattern")
 
     def __init__(
@@ -1035,13 +1037,36 @@ second dimension
             fail = theano.link.c.basic.failure_code(sub, use_goto=False)
         else:
             fail = sub["fail"]
-        task_code = self.scalar_op.c_code(
-            node.tag.fake_node,
+        omp_params = self._openmp_params(node)
+        # float16 values are converted to float32 when they are loaded and
+        # back to float16 when they are stored, the computation is done on
+        # the float32 copies.
+        uses_float16 = self._uses_float16(node)
+        scalar_inames = [f"{s}_i" for s in _inames]
+        scalar_onames = [f"{s}_i" for s in onames]
+        half_load = []
+        half_store = []
+        if uses_float16:
+            for j, (iname, input) in enumerate(zip(_inames, node.inputs)):
+                if input.type.dtype == "float16":
+                    scalar_inames[j] = f"{iname}_f32"
+                    half_load.append(
+                        f"npy_float32 {iname}_f32 = theano_half_to_float({iname}_i);"
+                    )
+            for j, (oname, output) in enumerate(zip(onames, node.outputs)):
+                if output.type.dtype == "float16":
+                    scalar_onames[j] = f"{oname}_f32"
+                    half_load.append(f"npy_float32 {oname}_f32;")
+                    half_store.append(f"{oname}_i = theano_float_to_half({oname}_f32);")
+        fake_node = self._c_fake_node(node)
+        task_code = fake_node.op.c_code(
+            fake_node,
             nodename + "_scalar_",
-            [f"{s}_i" for s in _inames],
-            [f"{s}_i" for s in onames],
+            scalar_inames,
+            scalar_onames,
             dict(sub, fail=fail),
         )
+        task_code = "\n".join(uniq(half_load) + [task_code] + half_store)
         code = (
             """
         {
@@ -1114,6 +1139,7 @@ second dimension
                     loop_tasks=all_code,
                     sub=sub,
                     openmp=self.openmp,
+                    openmp_params=omp_params,
                 )
         else:
             loop = cgen.make_reordered_loop(
@@ -1123,6 +1149,7 @@ second dimension
                 inner_task=code,
                 sub=sub,
                 openmp=self.openmp,
+                openmp_params=omp_params,
             )
 
         # If all inputs and outputs are contiguous
@@ -1136,6 +1163,9 @@ second dimension
         ):
             contig = None
             try:
+                if uses_float16:
+                    # The specialized versions do not support float16.
+                    raise theano.graph.utils.MethodNotDefined()
                 contig = self.scalar_op.c_code_contiguous(
                     node, nodename + "_scalar_contig_", _inames, onames, sub
                 )
@@ -1178,8 +1208,7 @@ second dimension
                                 % locals()
                             )
                     if self.openmp:
-                        contig += """#pragma omp parallel for if(n>={int(config.openmp_elemwise_minsize)})
-                        """
+                        contig += omp_parallel_for("n", *omp_params)
                     contig += (
                         """
                     for(int i=0; i<n; i++){
@@ -1217,16 +1246,54 @@ second dimension
                 )
         return decl, checks, alloc, loop
 
-    def c_code(self, node, nodename, inames, onames, sub):
-        if (
+    def _openmp_params(self, node):
+        """Return the ``(minsize, num_threads)`` of the OpenMP loops of `node`."""
+        dtype = (node.inputs or node.outputs)[0].dtype
+        return openmp_params(self.scalar_op, dtype)
+
+    def _uses_float16(self, node):
+        return (
             any(i.dtype == "float16" for i in node.inputs)
             or any(o.dtype == "float16" for o in node.outputs)
             or
             # This is for Composite
             getattr(self.scalar_op, "inner_float16", False)
-        ):
-            # Disable C code for float16 vars
-            raise NotImplementedError()
+        )
+
+    def _c_fake_node(self, node):
+        """
+        Return the scalar `Apply` node whose C code computes one element.
+
+        When float16 is involved, this is a node of the float32 version of
+        the scalar op, working on float32 instead of float16 values.
+
+        """
+        if not hasattr(node.tag, "fake_node"):
+            self.prepare_node(node, None, None, "c")
+        if not self._uses_float16(node):
+            return node.tag.fake_node
+        if not hasattr(node.tag, "fake_node_float32"):
+
+            def float32_variable(var):
+                dtype = var.type.dtype
+                if dtype == "float16":
+                    dtype = "float32"
+                return get_scalar_type(dtype=dtype).make_variable()
+
+            if hasattr(self.scalar_op, "clone_float32"):
+                scalar_op = self.scalar_op.clone_float32()
+            else:
+                scalar_op = self.scalar_op
+            fake_node = Apply(
+                scalar_op,
+                [float32_variable(input) for input in node.inputs],
+                [float32_variable(output) for output in node.outputs],
+            )
+            scalar_op.prepare_node(fake_node, None, None, "c")
+            node.tag.fake_node_float32 = fake_node
+        return node.tag.fake_node_float32
+
+    def c_code(self, node, nodename, inames, onames, sub):
         code = "\n".join(self._c_all(node, nodename, inames, onames, sub))
         return code
 
@@ -1237,28 +1304,36 @@ second dimension
         return self.scalar_op.c_support_code(**kwargs)
 
     def c_support_code_apply(self, node, nodename):
-        support_code = self.scalar_op.c_support_code_apply(node, nodename + "_scalar_")
+        support_code = self._c_fake_node(node).op.c_support_code_apply(
+            node, nodename + "_scalar_"
+        )
         return support_code
 
     def c_code_cache_version_apply(self, node):
-        version = [13]  # the version corresponding to the c code in this Op
+        version = [14]  # the version corresponding to the c code in this Op
 
         # now we insert versions for the ops on which we depend...
-        scalar_node = Apply(
-            self.scalar_op,
-            [
-                get_scalar_type(dtype=input.type.dtype).make_variable()
-                for input in node.inputs
-            ],
-            [
-                get_scalar_type(dtype=output.type.dtype).make_variable()
-                for output in node.outputs
-            ],
-        )
+        if self._uses_float16(node):
+            scalar_node = self._c_fake_node(node)
+        else:
+            scalar_node = Apply(
+                self.scalar_op,
+                [
+                    get_scalar_type(dtype=input.type.dtype).make_variable()
+                    for input in node.inputs
+                ],
+                [
+                    get_scalar_type(dtype=output.type.dtype).make_variable()
+                    for output in node.outputs
+                ],
+            )
         version.append(self.scalar_op.c_code_cache_version_apply(scalar_node))
         for i in node.inputs + node.outputs:
             version.append(get_scalar_type(dtype=i.type.dtype).c_code_cache_version())
         version.append(("openmp", self.openmp))
+        if self.openmp:
+            # The thresholds are hard-coded in the generated code.
+            version.append(("openmp_params",) + tuple(self._openmp_params(node)))
         if all(version):
             return tuple(version)
         else:
@@ -1317,6 +1392,7 @@ class CAReduce(COp):
 
     """
 
+    _f16_ok = True
     __props__ = ("scalar_op", "axis")
 
     def __init__(self, scalar_op, axis=None):
@@ -1492,11 +1568,15 @@ class CAReduce(COp):
         idtype = input.type.dtype_specs()[1]
         odtype = output.type.dtype_specs()[1]
 
-        if hasattr(self, "acc_dtype") and self.acc_dtype is not None:
-            if self.acc_dtype == "float16":
-                raise theano.graph.utils.MethodNotDefined("no c_code for " "float16")
+        acc_dtype = getattr(self, "acc_dtype", None)
+        if acc_dtype is None and output.type.dtype == "float16":
+            acc_dtype = "float16"
+        if acc_dtype == "float16":
+            # float16 is only a storage format, we accumulate in float32.
+            acc_dtype = "float32"
+        if acc_dtype is not None:
             acc_type = TensorType(
-                broadcastable=node.outputs[0].broadcastable, dtype=self.acc_dtype
+                broadcastable=node.outputs[0].broadcastable, dtype=acc_dtype
             )
             adtype = acc_type.dtype_specs()[1]
         else:
@@ -1573,7 +1653,7 @@ class CAReduce(COp):
         elif self.scalar_op in [scalar.scalar_maximum, scalar.scalar_minimum]:
             if self.scalar_op == scalar.scalar_maximum:
                 scal_name = "maximum"
-                if input.type.dtype in ["float32", "float64"]:
+                if input.type.dtype in ["float16", "float32", "float64"]:
                     identity = "-__builtin_inf()"
                 elif input.type.dtype.startswith("uint") or input.type.dtype == "bool":
                     # numpy does not define NPY_MIN_UINT* and NPY_MIN_BOOL
@@ -1582,7 +1662,7 @@ class CAReduce(COp):
                     identity = "NPY_MIN_" + str(input.type.dtype).upper()
             if self.scalar_op == scalar.scalar_minimum:
                 scal_name = "minimum"
-                if input.type.dtype in ["float32", "float64"]:
+                if input.type.dtype in ["float16", "float32", "float64"]:
                     identity = "__builtin_inf()"
                 elif input.type.dtype == "bool":
                     # numpy does not define NPY_MAX_BOOL
@@ -1619,21 +1699,27 @@ class CAReduce(COp):
             % dict(dtype=adtype, name=aname, identity=identity)
         )
 
-        task1_decl = "%(dtype)s& %(name)s_i = *%(name)s_iter;\n" % dict(
-            dtype=idtype, name=inames[0]
-        )
+        if node.inputs[0].type.dtype == "float16":
+            task1_decl = (
+                "npy_float32 %(name)s_i = theano_half_to_float(*%(name)s_iter);\n"
+                % dict(name=inames[0])
+            )
+        else:
+            task1_decl = "%(dtype)s& %(name)s_i = *%(name)s_iter;\n" % dict(
+                dtype=idtype, name=inames[0]
+            )
+
+        def scalar_type(var):
+            # The float16 values are computed in float32
+            if var.type.dtype == "float16":
+                return scalar.float32
+            return get_scalar_type(dtype=var.type.dtype)
 
         task1_code = self.scalar_op.c_code(
             Apply(
                 self.scalar_op,
-                [
-                    get_scalar_type(dtype=iv.type.dtype).make_variable()
-                    for iv in (node.inputs * 2)
-                ],
-                [
-                    get_scalar_type(dtype=ov.type.dtype).make_variable()
-                    for ov in node.outputs
-                ],
+                [scalar_type(iv).make_variable() for iv in (node.inputs * 2)],
+                [scalar_type(ov).make_variable() for ov in node.outputs],
             ),
             None,
             [f"{aname}_i", f"{inames[0]}_i"],
@@ -1690,7 +1776,7 @@ class CAReduce(COp):
 
     def c_code_cache_version_apply(self, node):
         # the version corresponding to the c code in this Op
-        version = [8]
+        version = [9]
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(
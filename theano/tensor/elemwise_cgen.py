@@ -1,4 +1,5 @@
 from theano.configdefaults import config
+from theano.tensor.elemwise_openmp import omp_parallel_for
 
 
 def make_declare(loop_orders, dtypes, sub):
@@ -177,7 +178,7 @@ def make_alloc(loop_orders, dtype, sub, fortran="0"):
     )
 
 
-def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None):
+def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None, openmp_params=None):
     """
     Make a nested loop over several arrays and associate specific code
     to each level of nesting.
@@ -200,8 +201,13 @@ def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None):
     sub : dictionary
         Maps 'lv#' to a suitable variable name.
         The 'lvi' variable corresponds to the ith element of loop_orders.
+    openmp_params : tuple of int
+        The ``(minsize, num_threads)`` of the OpenMP parallelization.
+        Defaults to ``(config.openmp_elemwise_minsize, 0)``.
 
     """
+    if openmp_params is None:
+        openmp_params = (config.openmp_elemwise_minsize, 0)
 
     def loop_over(preloop, code, indices, i):
         iterv = f"ITER_{int(i)}"
@@ -215,8 +221,7 @@ def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None):
             if index != "x":
                 suitable_n = f"{var}_n{index}"
         if openmp:
-            openmp_elemwise_minsize = config.openmp_elemwise_minsize
-            forloop = f"""#pragma omp parallel for if( {suitable_n} >={openmp_elemwise_minsize})\n"""
+            forloop = omp_parallel_for(suitable_n, *openmp_params)
         else:
             forloop = ""
         forloop += f"""for (int {iterv} = 0; {iterv}<{suitable_n}; {iterv}++)"""
@@ -255,7 +260,13 @@ def make_loop(loop_orders, dtypes, loop_tasks, sub, openmp=None):
 
 
 def make_reordered_loop(
-    init_loop_orders, olv_index, dtypes, inner_task, sub, openmp=None
+    init_loop_orders,
+    olv_index,
+    dtypes,
+    inner_task,
+    sub,
+    openmp=None,
+    openmp_params=None,
 ):
     """A bit like make_loop, but when only the inner-most loop executes code.
 
@@ -265,8 +276,11 @@ def make_reordered_loop(
     will be on its rows; if it's f_contiguous, it will be on its columns.
 
     The output tensor's index among the loop variables is indicated by olv_index.
+    openmp_params is as in make_loop.
 
     """
+    if openmp_params is None:
+        openmp_params = (config.openmp_elemwise_minsize, 0)
 
     # Number of variables
     nvars = len(init_loop_orders)
@@ -415,8 +429,7 @@ def make_reordered_loop(
             update = pointer_update
         if i == 0:
             if openmp:
-                openmp_elemwise_minsize = config.openmp_elemwise_minsize
-                forloop += f"""#pragma omp parallel for if( {total} >={openmp_elemwise_minsize})\n"""
+                forloop += omp_parallel_for(total, *openmp_params)
         forloop += f"for(int {iterv} = 0; {iterv}<{total}; {iterv}++)"
 
         loop = f"""
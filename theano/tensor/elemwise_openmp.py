@@ -0,0 +1,174 @@
+"""
+Per scalar op calibration of the OpenMP parallelization of `Elemwise`.
+
+`config.openmp_elemwise_minsize` is one threshold shared by every scalar op
+on every machine.  Cheap scalar ops (e.g. ``add``) only benefit from
+threads on much bigger arrays than costly ones (e.g. ``exp``), and the
+best number of threads depends on the machine.  The functions in this
+module time each scalar op serially and in parallel on the current
+machine, and record the crossover size and the best thread count in a
+JSON file in the compiledir.
+
+When the Theano flag ``openmp_elemwise_autotune`` is True, `Elemwise`
+uses the recorded values of its scalar op and dtype (see `openmp_params`)
+and falls back to ``openmp_elemwise_minsize`` for the others.
+
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from theano.configdefaults import config
+from theano.tensor.calibration import CalibrationTable, time_function
+
+
+_logger = logging.getLogger("theano.tensor.elemwise_openmp")
+
+
+def _parse_entry(entry):
+    return {"minsize": int(entry["minsize"]), "num_threads": int(entry["num_threads"])}
+
+
+# Mapping from `calibration_key` to a dict with the keys "minsize" and
+# "num_threads".
+calibration = CalibrationTable("openmp_elemwise", _parse_entry)
+
+
+def calibration_key(scalar_op, dtype):
+    """Return the key identifying `scalar_op` working on `dtype` data."""
+    return f"{scalar_op}|{dtype}"
+
+
+def openmp_params(scalar_op, dtype):
+    """
+    Return the ``(minsize, num_threads)`` to use for `scalar_op` on `dtype`.
+
+    `minsize` is the minimum number of iterations for which the loop is
+    run in parallel.  `num_threads` is the number of OpenMP threads to use,
+    0 meaning the OpenMP default (i.e. ``OMP_NUM_THREADS``).
+
+    """
+    if config.openmp_elemwise_autotune:
+        entry = calibration.get().get(calibration_key(scalar_op, dtype))
+        if entry is not None:
+            return entry["minsize"], entry["num_threads"]
+    return int(config.openmp_elemwise_minsize), 0
+
+
+def omp_parallel_for(size, minsize, num_threads=0):
+    """Return the OpenMP pragma that parallelizes a loop of `size` iterations."""
+    pragma = f"#pragma omp parallel for if({size} >= {int(minsize)})"
+    if num_threads:
+        pragma += f" num_threads({int(num_threads)})"
+    return pragma + "\n"
+
+
+def calibrate(
+    scalar_op,
+    dtype="float64",
+    sizes=None,
+    thread_counts=None,
+    n_repeat=10,
+    save=True,
+):
+    """
+    Time `scalar_op` serially and with OpenMP and record the crossover.
+
+    Parameters
+    ----------
+    scalar_op : theano.scalar.ScalarOp
+        The scalar op to calibrate.
+    dtype : str
+        The dtype of the inputs.
+    sizes : list of int
+        The vector sizes to time, in increasing order.  The recorded
+        `minsize` is the smallest of these sizes from which the parallel
+        version is always faster than the serial one.
+    thread_counts : list of int
+        The thread counts to try on the biggest size.  0 means the
+        OpenMP default.
+    n_repeat : int
+        The best of `n_repeat` calls is kept for each measure.
+    save : bool
+        If True, the result is added to the calibration file of the
+        compiledir and used immediately.
+
+    Returns
+    -------
+    dict
+        The new calibration entry, with the keys "minsize" and
+        "num_threads".
+
+    """
+    import theano
+    from theano.graph.op import OpenMPOp
+    from theano.tensor.elemwise import Elemwise
+    from theano.tensor.type import TensorType
+
+    if sizes is None:
+        sizes = [2 ** i for i in range(10, 24, 2)]
+    sizes = sorted(sizes)
+    if thread_counts is None:
+        n_cpus = os.cpu_count() or 1
+        thread_counts = sorted({0} | {n for n in (2, 4, 8, 16) if n <= n_cpus})
+
+    if not OpenMPOp.test_gxx_support():
+        raise RuntimeError("The C++ compiler does not support OpenMP.")
+
+    key = calibration_key(scalar_op, dtype)
+    mode = theano.compile.mode.Mode(linker="c", optimizer=None)
+    inputs = [TensorType(dtype, (False,))() for _ in range(scalar_op.nin)]
+
+    def compile_fn(openmp, minsize, num_threads):
+        saved = calibration.get()
+        calibration.set(
+            dict(saved, **{key: {"minsize": minsize, "num_threads": num_threads}})
+        )
+        try:
+            with config.change_flags(openmp_elemwise_autotune=True):
+                out = Elemwise(scalar_op, openmp=openmp)(*inputs)
+                return theano.function(inputs, out, mode=mode)
+        finally:
+            calibration.set(saved)
+
+    def values(size):
+        rng = np.random.RandomState(size)
+        # Values in (0.5, 1.5) are valid for most scalar ops (log, sqrt, ...)
+        return [
+            np.asarray(rng.uniform(0.5, 1.5, size=size), dtype=dtype) for _ in inputs
+        ]
+
+    serial_fn = compile_fn(False, 0, 0)
+    parallel_fn = compile_fn(True, 0, 0)
+
+    minsize = None
+    for size in sizes:
+        args = values(size)
+        serial = time_function(serial_fn, args, n_repeat)
+        parallel = time_function(parallel_fn, args, n_repeat)
+        _logger.debug(
+            f"{key} size {size}: serial {serial:.3g}s, parallel {parallel:.3g}s"
+        )
+        if parallel < serial:
+            if minsize is None:
+                minsize = size
+        else:
+            minsize = None
+    if minsize is None:
+        # Never worth it on the sizes we tried.
+        minsize = sizes[-1] * 2
+
+    args = values(sizes[-1])
+    num_threads = 0
+    best = np.inf
+    for n in thread_counts:
+        t = time_function(compile_fn(True, 0, n), args, n_repeat)
+        if t < best:
+            best, num_threads = t, n
+
+    entry = {"minsize": int(minsize), "num_threads": int(num_threads)}
+    if save:
+        calibration.save({key: entry})
+    return entry
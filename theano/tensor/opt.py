@@ -680,6 +680,227 @@ def local_0_dot_x(fgraph, node):
             )
 
 
+def _dot_chain(fgraph, var, root=True, start=0):
+    """
+    Return the matrices whose product, in order, is `var`, and its tree.
+
+    The chain follows the matrix-matrix `Dot` nodes whose intermediate
+    results are not used elsewhere. The tree is the index of the matrix
+    (counting from `start`) for a single matrix, and a pair of trees for a
+    product.
+
+    """
+    node = var.owner
+    if (
+        node is None
+        or not isinstance(node.op, Dot)
+        or not all(i.ndim == 2 for i in node.inputs)
+        or (not root and len(fgraph.clients[var]) > 1)
+    ):
+        return [var], start
+    x, y = node.inputs
+    x_matrices, x_tree = _dot_chain(fgraph, x, False, start)
+    y_matrices, y_tree = _dot_chain(fgraph, y, False, start + len(x_matrices))
+    return x_matrices + y_matrices, (x_tree, y_tree)
+
+
+def _dot_chain_cost(tree, dims):
+    """
+    Return the number of multiplications of the products in `tree`.
+
+    The ith matrix has shape ``(dims[i], dims[i + 1])``.
+
+    """
+
+    def cost(tree):
+        # Return the cost and the indices of the first and last matrices.
+        if isinstance(tree, int):
+            return 0, tree, tree
+        x_cost, first, mid = cost(tree[0])
+        y_cost, _, last = cost(tree[1])
+        return (
+            x_cost + y_cost + dims[first] * dims[mid + 1] * dims[last + 1],
+            first,
+            last,
+        )
+
+    return cost(tree)[0]
+
+
+def _dot_chain_order(dims):
+    """
+    Return the tree of the cheapest order of a chain of matrix products.
+
+    This is the classic dynamic programming solution to the matrix chain
+    multiplication problem. The ith matrix has shape
+    ``(dims[i], dims[i + 1])``.
+
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[None] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if split[i][j] is None or c < cost[i][j]:
+                    cost[i][j] = c
+                    split[i][j] = k
+
+    def tree(i, j):
+        if i == j:
+            return i
+        k = split[i][j]
+        return (tree(i, k), tree(k + 1, j))
+
+    return tree(0, n - 1)
+
+
+def _dot_chain_build(matrices, tree, old_out):
+    """Return the product of `matrices` in the order of `tree`.
+
+    The stack trace of `old_out` is copied to every new product.
+
+    """
+    if isinstance(tree, int):
+        return matrices[tree]
+    new_out = tt.dot(
+        _dot_chain_build(matrices, tree[0], old_out),
+        _dot_chain_build(matrices, tree[1], old_out),
+    )
+    copy_stack_trace(old_out, new_out)
+    return new_out
+
+
+def _dot_chain_match(fgraph, node):
+    """
+    Return the matrices and tree of the chain ending at `node`, and its dims.
+
+    The ith matrix has shape ``(sym_dims[i], sym_dims[i + 1])``, and `dims`
+    holds the constant values of `sym_dims`, or None. None is returned if
+    `node` is not the last product of a chain of at least 3 matrices that
+    can be reordered.
+
+    """
+    if not isinstance(node.op, Dot):
+        return None
+    out = node.outputs[0]
+    if getattr(out.tag, "dot_chain_ordered", False):
+        return None
+    # Only handle whole chains, from their last product.
+    clients = fgraph.clients[out]
+    if (
+        len(clients) == 1
+        and clients[0][0] != "output"
+        and isinstance(clients[0][0].op, Dot)
+        and all(i.ndim == 2 for i in clients[0][0].inputs)
+    ):
+        return None
+
+    matrices, tree = _dot_chain(fgraph, out)
+    if len(matrices) < 3:
+        return None
+    # Changing the order of upcasts could change the result.
+    if any(m.dtype != out.dtype for m in matrices):
+        return None
+
+    shape_feature = getattr(fgraph, "shape_feature", None)
+
+    def shape(var):
+        if shape_feature is not None:
+            return shape_feature.shape_of[var]
+        return [var.shape[0], var.shape[1]]
+
+    sym_dims = [shape(m)[0] for m in matrices] + [shape(matrices[-1])[1]]
+    dims = []
+    for i, d in enumerate(sym_dims):
+        candidates = [d]
+        if 0 < i < len(matrices):
+            candidates.append(shape(matrices[i - 1])[1])
+        for candidate in candidates:
+            try:
+                dims.append(int(get_scalar_constant_value(candidate)))
+                break
+            except NotScalarConstantError:
+                pass
+        else:
+            dims.append(None)
+    return matrices, tree, sym_dims, dims
+
+
+@register_stabilize
+@local_optimizer([Dot])
+def local_dot_chain_reorder(fgraph, node):
+    """
+    Reorder chains of matrix products to minimize the number of operations.
+
+    ``dot(dot(A, B), C)`` and ``dot(A, dot(B, C))`` compute the same result,
+    but their costs depend on the shapes. For instance if A is
+    (1000, 10), B (10, 1000) and C (1000, 10), the first costs 2e7
+    multiplications and the second 2e5. `matrix_dot` and chained `dot`
+    always build the products from left to right.
+
+    The shapes come from the `ShapeFeature`. Only the chains whose shapes
+    are all known at compile time are rebuilt, in the optimal order (see
+    `local_dot_chain_reorder_ifelse` for the others).
+
+    This runs before the `Dot` are replaced by `Dot22` and `Gemm`.
+
+    """
+    match = _dot_chain_match(fgraph, node)
+    if match is None:
+        return False
+    matrices, tree, sym_dims, dims = match
+    if any(d is None for d in dims):
+        return False
+
+    new_tree = _dot_chain_order(dims)
+    if _dot_chain_cost(new_tree, dims) >= _dot_chain_cost(tree, dims):
+        return False
+    return [_dot_chain_build(matrices, new_tree, node.outputs[0])]
+
+
+@local_optimizer([Dot])
+def local_dot_chain_reorder_ifelse(fgraph, node):
+    """
+    Choose the order of chains of 3 matrices with symbolic shapes at run time.
+
+    Both orders are built, and a lazy `ifelse` runs the cheapest one. The
+    `ifelse` prevents the fusion of the root product with its clients, e.g.
+    in `Gemm`, so this is not enabled by default. Include it by name.
+
+    """
+    match = _dot_chain_match(fgraph, node)
+    if match is None:
+        return False
+    matrices, tree, sym_dims, dims = match
+    if len(matrices) != 3 or all(d is not None for d in dims):
+        return False
+
+    from theano.ifelse import ifelse
+
+    out = node.outputs[0]
+    d0, d1, d2, d3 = sym_dims
+    left = _dot_chain_build(matrices, ((0, 1), 2), out)
+    right = _dot_chain_build(matrices, (0, (1, 2)), out)
+    # Do not reorder them again
+    left.tag.dot_chain_ordered = True
+    right.tag.dot_chain_ordered = True
+    new_out = ifelse(
+        tt.le(d0 * d1 * d2 + d0 * d2 * d3, d1 * d2 * d3 + d0 * d1 * d3),
+        left,
+        right,
+    )
+    copy_stack_trace(out, new_out)
+    return [new_out]
+
+
+compile.optdb["stabilize"].register(
+    "local_dot_chain_reorder_ifelse", local_dot_chain_reorder_ifelse
+)
+
+
 def apply_local_dimshuffle_lift(fgraph, var):
     # return var
     # lift recursively
@@ -73,7 +73,7 @@ halfnormal = HalfNormalRV()
 
 
 class GammaRV(RandomVariable):
-    name = "halfnormal"
+    name = "gamma"
     ndim_supp = 0
     ndims_params = [0, 0]
     dtype = "floatX"
@@ -226,7 +226,7 @@ cauchy = CauchyRV()
 
 
 class HalfCauchyRV(RandomVariable):
-    name = "cauchy"
+    name = "halfcauchy"
     ndim_supp = 0
     ndims_params = [0, 0]
     dtype = "floatX"
@@ -399,7 +399,10 @@ class PolyaGammaRV(RandomVariable):
 
     @classmethod
     def rng_fn(cls, rng, b, c, size):
-        pg = PyPolyaGamma(rng.randint(2 ** 16))
+        if isinstance(rng, np.random.Generator):
+            pg = PyPolyaGamma(rng.integers(2 ** 16))
+        else:
+            pg = PyPolyaGamma(rng.randint(2 ** 16))
 
         if not size and b.shape == c.shape == ():
             return pg.pgdraw(b, c)
@@ -436,6 +439,12 @@ class RandIntRV(RandomVariable):
             low, high = 0, low
         return super().__call__(low, high, size=size, **kwargs)
 
+    @classmethod
+    def rng_fn(cls, rng, low, high, size):
+        if isinstance(rng, np.random.Generator):
+            return rng.integers(low, high, size=size)
+        return rng.randint(low, high, size=size)
+
 
 randint = RandIntRV()
 
@@ -1,5 +1,5 @@
 from collections.abc import Sequence
-from copy import copy
+from copy import deepcopy
 
 import numpy as np
 
@@ -18,7 +18,7 @@ from theano.tensor.basic import (
     get_vector_length,
     int_dtypes,
 )
-from theano.tensor.random.type import RandomStateType
+from theano.tensor.random.type import RandomType
 from theano.tensor.random.utils import params_broadcast_shapes
 from theano.tensor.type import TensorType
 from theano.tensor.type_other import NoneConst
@@ -160,7 +160,7 @@ class RandomVariable(Op):
 
     def rng_fn(self, rng, *args, **kwargs):
         """Sample a numeric random variate."""
-        return getattr(np.random.RandomState, self.name)(rng, *args, **kwargs)
+        return getattr(rng, self.name)(*args, **kwargs)
 
     def __str__(self):
         return "{}_rv".format(self.name)
@@ -330,9 +330,9 @@ class RandomVariable(Op):
 
         Parameters
         ----------
-        rng: RandomStateType
-            Existing Theano `RandomState` object to be used.  Creates a
-            new one, if `None`.
+        rng: RandomType
+            Existing Theano `RandomState` or `Generator` object to be used.
+            Creates a new `RandomState`, if `None`.
         size: int or Sequence
             Numpy-like size of the output (i.e. replications).
         dtype: str
@@ -369,8 +369,8 @@ class RandomVariable(Op):
 
         if rng is None:
             rng = theano.shared(np.random.RandomState())
-        elif not isinstance(rng.type, RandomStateType):
-            raise TypeError("The type of rng should be an instance of RandomStateType")
+        elif not isinstance(rng.type, RandomType):
+            raise TypeError("The type of rng should be an instance of RandomType")
 
         bcast = self.compute_bcast(dist_params, size)
         dtype = self.dtype or dtype
@@ -412,7 +412,7 @@ class RandomVariable(Op):
         # Draw from `rng` if `self.inplace` is `True`, and from a copy of `rng`
         # otherwise.
         if not self.inplace:
-            rng = copy(rng)
+            rng = deepcopy(rng)
 
         rng_var_out[0] = rng
 
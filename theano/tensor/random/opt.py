@@ -1,13 +1,17 @@
 import theano.tensor as tt
+from theano import scalar as scal
 from theano.compile import optdb
 from theano.compile.ops import Shape
 from theano.configdefaults import config
 from theano.graph.op import compute_test_value
 from theano.graph.opt import local_optimizer
-from theano.tensor.elemwise import DimShuffle
+from theano.graph.vectorize import vectorize_node
+from theano.tensor.elemwise import DimShuffle, Elemwise
 from theano.tensor.extra_ops import broadcast_to
-from theano.tensor.opt import in2out
+from theano.tensor.opt import in2out, register_specialize
+from theano.tensor.random.basic import CauchyRV, NormalRV, UniformRV, bernoulli
 from theano.tensor.random.op import RandomVariable
+from theano.tensor.random.philox import PHILOX_RVS, PhiloxRV
 from theano.tensor.random.utils import broadcast_params
 from theano.tensor.subtensor import (
     AdvancedSubtensor,
@@ -40,6 +44,32 @@ optdb.register(
 )
 
 
+@local_optimizer([RandomVariable])
+def local_philox_rv(fgraph, node):
+    """Replace the univariate `RandomVariable`s by their `PhiloxRV`.
+
+    This is only done when the flag ``random__philox`` is set, because the
+    samples are not the ones NumPy would draw.
+
+    """
+    op = node.op
+
+    if not config.random__philox or type(op) not in PHILOX_RVS:
+        return False
+
+    _, ndim_supp, ndims_params, dtype, inplace = op._props()
+    new_op = PhiloxRV(PHILOX_RVS[type(op)], ndim_supp, ndims_params, dtype, inplace)
+    return new_op.make_node(*node.inputs).outputs
+
+
+optdb.register(
+    "random_philox",
+    in2out(local_philox_rv, ignore_newtrees=True),
+    98,
+    "fast_run",
+)
+
+
 def lift_rv_shapes(node):
     """Lift `RandomVariable`'s shape-related parameters.
 
@@ -354,3 +384,173 @@ def local_subtensor_rv_lift(fgraph, node):
         compute_test_value(new_node)
 
     return [new_rv]
+
+
+def _single_client_rv(fgraph, node):
+    """Find an input of `node` drawn by a univariate `RandomVariable`.
+
+    The sample must only be used by `node`.  Return its position and the
+    `RandomVariable`'s node, or ``(None, None)``.
+
+    """
+    for i, x in enumerate(node.inputs):
+        rv_node = x.owner
+        if (
+            rv_node
+            and isinstance(rv_node.op, RandomVariable)
+            and rv_node.op.ndim_supp == 0
+            and x is rv_node.outputs[1]
+            and [n for n, _ in fgraph.clients[x]] == [node]
+        ):
+            return i, rv_node
+    return None, None
+
+
+def _replace_rv(fgraph, node, rv_node, new_rv_node, new_out):
+    """Return the replacements of `node`'s output and of the old rng output."""
+    if new_out.type != node.outputs[0].type:
+        return False
+
+    if config.compute_test_value != "off":
+        compute_test_value(new_rv_node)
+
+    replacements = {node.outputs[0]: new_out}
+    old_rng = rv_node.outputs[0]
+    if fgraph.clients[old_rng]:
+        replacements[old_rng] = new_rv_node.outputs[0]
+    return replacements
+
+
+@register_specialize
+@local_optimizer([Elemwise])
+def local_rv_affine_lift(fgraph, node):
+    """Fold affine transforms of normal, Cauchy and uniform samples.
+
+    For example, ``normal(0, 1, size) * sigma + mu`` becomes
+    ``normal(mu, abs(sigma), size)`` and ``uniform(0, 1) * 2 - 1`` becomes
+    ``uniform(-1, 1)``, which draws the result directly instead of
+    computing it from a full-size standard sample.
+
+    The distribution of the result is the same.  For normal and Cauchy
+    samples scaled by negative values, the samples themselves change sign.
+    Since the samples drawn from a given seed change, this is only applied
+    when ``config.random__lift_transforms`` is enabled.
+
+    """
+    if not config.random__lift_transforms or not isinstance(node.op, Elemwise):
+        return False
+
+    scalar_op = node.op.scalar_op
+    if not isinstance(
+        scalar_op, (scal.Add, scal.Mul, scal.Sub, scal.Neg, scal.TrueDiv)
+    ):
+        return False
+
+    idx, rv_node = _single_client_rv(fgraph, node)
+    if rv_node is None or type(rv_node.op) not in (NormalRV, CauchyRV, UniformRV):
+        return False
+
+    rng, size, dtype, a, b = rv_node.inputs
+    others = node.inputs[:idx] + node.inputs[idx + 1 :]
+    is_uniform = isinstance(rv_node.op, UniformRV)
+
+    if isinstance(scalar_op, scal.Add):
+        c = others[0] if len(others) == 1 else tt.add(*others)
+        new_a, new_b = a + c, (b + c if is_uniform else b)
+    elif isinstance(scalar_op, scal.Mul):
+        c = others[0] if len(others) == 1 else tt.mul(*others)
+        new_a, new_b = a * c, (b * c if is_uniform else b * abs(c))
+    elif isinstance(scalar_op, scal.Neg):
+        new_a, new_b = -a, (-b if is_uniform else b)
+    elif isinstance(scalar_op, scal.Sub):
+        (c,) = others
+        if idx == 0:
+            new_a, new_b = a - c, (b - c if is_uniform else b)
+        else:
+            new_a, new_b = c - a, (c - b if is_uniform else b)
+    else:
+        (c,) = others
+        if idx != 0:
+            return False
+        new_a, new_b = a / c, (b / c if is_uniform else b / abs(c))
+
+    new_rv_node = rv_node.op.make_node(rng, size, dtype, new_a, new_b)
+    return _replace_rv(fgraph, node, rv_node, new_rv_node, new_rv_node.outputs[1])
+
+
+@register_specialize
+@local_optimizer([Elemwise])
+def local_uniform_comparison_lift(fgraph, node):
+    """Replace comparisons of uniform samples by Bernoulli samples.
+
+    For example, ``uniform(0, 1, size) < p`` becomes
+    ``cast(bernoulli(p, size), "bool")``, which does not need the
+    full-size uniform sample.  Since the samples drawn from a given seed
+    change, this is only applied when ``config.random__lift_transforms`` is
+    enabled.
+
+    """
+    if not config.random__lift_transforms or not isinstance(node.op, Elemwise):
+        return False
+
+    scalar_op = node.op.scalar_op
+    if not isinstance(scalar_op, (scal.LT, scal.LE, scal.GT, scal.GE)):
+        return False
+
+    idx, rv_node = _single_client_rv(fgraph, node)
+    if rv_node is None or type(rv_node.op) is not UniformRV:
+        return False
+
+    rng, size, dtype, low, high = rv_node.inputs
+    p = node.inputs[1 - idx]
+    # Whether the result is true when the sample is below `p`
+    below = isinstance(scalar_op, (scal.LT, scal.LE)) == (idx == 0)
+    if below:
+        prob = (p - low) / (high - low)
+    else:
+        prob = (high - p) / (high - low)
+    prob = tt.clip(prob, 0, 1)
+
+    new_rv_node = bernoulli.make_node(rng, size, None, prob)
+    new_out = tt.cast(new_rv_node.outputs[1], "bool")
+    return _replace_rv(fgraph, node, rv_node, new_rv_node, new_out)
+
+
+@vectorize_node.register(RandomVariable)
+def vectorize_RandomVariable(op, node, inputs, batched):
+    """Draw a batch of `RandomVariable`s by adding a leading dimension to `size`.
+
+    The distribution parameters get as many broadcastable dimensions as needed
+    to line their per-example dimensions up with the new ``size``.
+
+    """
+    rng, size, dtype, *dist_params = inputs
+    if any(batched[:3]):
+        raise NotImplementedError("Batched `rng`, `size` or `dtype`")
+
+    try:
+        size_len = tt.get_vector_length(size)
+    except ValueError:
+        raise NotImplementedError("`size` has an unknown length")
+
+    params_batched = batched[3:]
+    # Number of replication dimensions of each parameter for one example
+    params_reps = [
+        p.ndim - int(b) - ndim_param
+        for p, b, ndim_param in zip(dist_params, params_batched, op.ndims_params)
+    ]
+    n_reps = size_len if size_len > 0 else max(params_reps, default=0)
+
+    new_params = []
+    for p, b, reps in zip(dist_params, params_batched, params_reps):
+        new_dims = ["x"] * (n_reps - reps)
+        if b:
+            new_params.append(p.dimshuffle(0, *new_dims, *range(1, p.ndim)))
+        else:
+            new_params.append(p.dimshuffle("x", *new_dims, *range(p.ndim)))
+
+    if size_len > 0:
+        batch_size = [p for p, b in zip(dist_params, params_batched) if b][0].shape[0]
+        size = tt.join(0, tt.stack([batch_size]), size)
+
+    return op.make_node(rng, size, dtype, *new_params).outputs
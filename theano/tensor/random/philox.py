@@ -0,0 +1,486 @@
+"""
+C implementation of the univariate `RandomVariable`s over the Philox4x32-10
+counter-based generator.
+
+The sample ``i`` of a draw only depends on the key taken from the
+`RandomState` or `Generator` and on ``i``, so the C code can compute the samples in any
+order, in parallel with OpenMP, and still give the same values as the
+Python implementation, whatever the number of threads.  These samples are
+not the ones NumPy would draw from the same generator, which is why
+the replacement of the NumPy-based `RandomVariable`s by `PhiloxRV` is only
+done when the flag ``random__philox`` is set.
+
+"""
+
+import numpy as np
+
+from theano.configdefaults import config
+from theano.graph.op import OpenMPOp
+from theano.tensor.random.basic import (
+    BernoulliRV,
+    CauchyRV,
+    ExponentialRV,
+    GammaRV,
+    HalfCauchyRV,
+    HalfNormalRV,
+    NormalRV,
+    UniformRV,
+)
+from theano.tensor.random.op import RandomVariable
+
+
+PHILOX_M0 = np.uint64(0xD2511F53)
+PHILOX_M1 = np.uint64(0xCD9E8D57)
+PHILOX_W0 = np.uint64(0x9E3779B9)
+PHILOX_W1 = np.uint64(0xBB67AE85)
+MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def philox4x32(counter, key, rounds=10):
+    """Apply Philox4x32 to a batch of counters.
+
+    Parameters
+    ----------
+    counter : tuple of 4 arrays
+        The four 32 bits words of the counters, broadcasted together.
+    key : tuple of 2 ints
+        The two 32 bits words of the key.
+    rounds : int
+        The number of rounds.
+
+    Returns
+    -------
+    tuple of 4 uint64 arrays
+        The four 32 bits words of the results.
+
+    """
+    x0, x1, x2, x3 = np.broadcast_arrays(
+        *[np.asarray(c, dtype=np.uint64) & MASK32 for c in counter]
+    )
+    k0, k1 = np.uint64(key[0]), np.uint64(key[1])
+    for _ in range(rounds):
+        p0 = PHILOX_M0 * x0
+        p1 = PHILOX_M1 * x2
+        x0, x1, x2, x3 = (
+            (p1 >> np.uint64(32)) ^ x1 ^ k0,
+            p1 & MASK32,
+            (p0 >> np.uint64(32)) ^ x3 ^ k1,
+            p0 & MASK32,
+        )
+        k0 = (k0 + PHILOX_W0) & MASK32
+        k1 = (k1 + PHILOX_W1) & MASK32
+    return x0, x1, x2, x3
+
+
+def philox_uniforms(index, attempt, key):
+    """Return two uniforms in ``[0, 1)`` for each sample of `index`.
+
+    The uniforms have 53 random bits and are those of the counter
+    ``(index, attempt)``.
+
+    """
+    index = np.asarray(index, dtype=np.uint64)
+    counter = (index & MASK32, index >> np.uint64(32), attempt, 0)
+    x0, x1, x2, x3 = philox4x32(counter, key)
+    five, six = np.uint64(5), np.uint64(6)
+    u0 = ((x0 >> five) * 67108864.0 + (x1 >> six)) / 9007199254740992.0
+    u1 = ((x2 >> five) * 67108864.0 + (x3 >> six)) / 9007199254740992.0
+    return u0, u1
+
+
+def _box_muller(u0, u1):
+    return np.sqrt(-2.0 * np.log(1.0 - u0)) * np.cos(2.0 * np.pi * u1)
+
+
+def _uniform(index, key, low, high):
+    u0, _ = philox_uniforms(index, 0, key)
+    return low + (high - low) * u0
+
+
+def _normal(index, key, loc, scale):
+    return loc + scale * _box_muller(*philox_uniforms(index, 0, key))
+
+
+def _halfnormal(index, key, loc, scale):
+    return loc + scale * np.abs(_box_muller(*philox_uniforms(index, 0, key)))
+
+
+def _exponential(index, key, scale):
+    u0, _ = philox_uniforms(index, 0, key)
+    return -scale * np.log(1.0 - u0)
+
+
+def _cauchy(index, key, loc, scale):
+    u0, _ = philox_uniforms(index, 0, key)
+    return loc + scale * np.tan(np.pi * (u0 - 0.5))
+
+
+def _halfcauchy(index, key, loc, scale):
+    u0, _ = philox_uniforms(index, 0, key)
+    return loc + scale * np.abs(np.tan(np.pi * (u0 - 0.5)))
+
+
+def _gamma(index, key, shape, scale):
+    # Marsaglia and Tsang's method, with the boost ``u ** (1 / shape)`` for
+    # ``shape < 1``.  Each attempt uses the counters ``2 * k + 1`` and
+    # ``2 * k + 2``, so that the samples stay independent of each other.
+    res = np.full(index.shape, np.nan)
+    valid = shape > 0
+    boosted = np.where(shape < 1, shape + 1.0, shape)
+    d = boosted - 1.0 / 3.0
+    c = 1.0 / np.sqrt(9.0 * np.where(valid, d, 1.0))
+    todo = np.flatnonzero(valid)
+    attempt = 0
+    while todo.size:
+        n = _box_muller(*philox_uniforms(index[todo], 2 * attempt + 1, key))
+        u, ub = philox_uniforms(index[todo], 2 * attempt + 2, key)
+        dt, ct = d[todo], c[todo]
+        v = 1.0 + ct * n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            v = v * v * v
+            accept = (v > 0) & (
+                np.log(1.0 - u) < 0.5 * n * n + dt - dt * v + dt * np.log(v)
+            )
+        done = todo[accept]
+        x = dt[accept] * v[accept]
+        small = shape[done] < 1
+        x[small] *= np.power(1.0 - ub[accept][small], 1.0 / shape[done][small])
+        res[done] = x
+        todo = todo[~accept]
+        attempt += 1
+    return res * scale
+
+
+def _bernoulli(index, key, p):
+    u0, _ = philox_uniforms(index, 0, key)
+    return (u0 < p).astype(np.int64)
+
+
+DISTRIBUTIONS = {
+    "uniform": _uniform,
+    "normal": _normal,
+    "halfnormal": _halfnormal,
+    "exponential": _exponential,
+    "cauchy": _cauchy,
+    "halfcauchy": _halfcauchy,
+    "gamma": _gamma,
+    "bernoulli": _bernoulli,
+}
+"""The Python implementation of the distributions, by `RandomVariable` name."""
+
+PHILOX_RVS = {
+    UniformRV: "uniform",
+    NormalRV: "normal",
+    HalfNormalRV: "halfnormal",
+    ExponentialRV: "exponential",
+    CauchyRV: "cauchy",
+    HalfCauchyRV: "halfcauchy",
+    GammaRV: "gamma",
+    BernoulliRV: "bernoulli",
+}
+"""The `RandomVariable`s that `PhiloxRV` can replace."""
+
+
+def philox_key(rng):
+    """Draw the two 32 bits words of a Philox key from `rng`."""
+    return tuple(int(k) for k in np.frombuffer(rng.bytes(8), dtype=np.uint32))
+
+
+def philox_sample(name, key, params, size=None):
+    """Sample the distribution `name` with the key `key`.
+
+    The samples are broadcasted to `size`, or to the shape of `params` when
+    `size` is ``None``.
+
+    """
+    params = [np.asarray(p, dtype=np.float64) for p in params]
+    if size is None:
+        size = np.broadcast(*params).shape
+    size = tuple(size)
+    params = [np.broadcast_to(p, size).ravel() for p in params]
+    index = np.arange(int(np.prod(size)), dtype=np.uint64)
+    return DISTRIBUTIONS[name](index, key, *params).reshape(size)
+
+
+philox_support_code = """
+#define THEANO_PHILOX_PI 3.14159265358979323846
+
+static inline void theano_philox4x32_10(npy_uint64 index, npy_uint32 attempt,
+                                        const npy_uint32* key, double* u)
+{
+    npy_uint32 x0 = (npy_uint32)index, x1 = (npy_uint32)(index >> 32);
+    npy_uint32 x2 = attempt, x3 = 0;
+    npy_uint32 k0 = key[0], k1 = key[1];
+    for (int r = 0; r < 10; r++) {
+        npy_uint64 p0 = (npy_uint64)0xD2511F53u * x0;
+        npy_uint64 p1 = (npy_uint64)0xCD9E8D57u * x2;
+        x0 = (npy_uint32)(p1 >> 32) ^ x1 ^ k0;
+        x1 = (npy_uint32)p1;
+        x2 = (npy_uint32)(p0 >> 32) ^ x3 ^ k1;
+        x3 = (npy_uint32)p0;
+        k0 += 0x9E3779B9u;
+        k1 += 0xBB67AE85u;
+    }
+    u[0] = ((x0 >> 5) * 67108864.0 + (x1 >> 6)) / 9007199254740992.0;
+    u[1] = ((x2 >> 5) * 67108864.0 + (x3 >> 6)) / 9007199254740992.0;
+}
+
+static inline double theano_philox_box_muller(const double* u)
+{
+    return sqrt(-2.0 * log(1.0 - u[0])) * cos(2.0 * THEANO_PHILOX_PI * u[1]);
+}
+
+static double theano_philox_uniform(npy_uint64 i, const npy_uint32* key,
+                                    const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return p[0] + (p[1] - p[0]) * u[0];
+}
+
+static double theano_philox_normal(npy_uint64 i, const npy_uint32* key,
+                                   const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return p[0] + p[1] * theano_philox_box_muller(u);
+}
+
+static double theano_philox_halfnormal(npy_uint64 i, const npy_uint32* key,
+                                       const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return p[0] + p[1] * fabs(theano_philox_box_muller(u));
+}
+
+static double theano_philox_exponential(npy_uint64 i, const npy_uint32* key,
+                                        const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return -p[0] * log(1.0 - u[0]);
+}
+
+static double theano_philox_cauchy(npy_uint64 i, const npy_uint32* key,
+                                   const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return p[0] + p[1] * tan(THEANO_PHILOX_PI * (u[0] - 0.5));
+}
+
+static double theano_philox_halfcauchy(npy_uint64 i, const npy_uint32* key,
+                                       const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return p[0] + p[1] * fabs(tan(THEANO_PHILOX_PI * (u[0] - 0.5)));
+}
+
+static double theano_philox_gamma(npy_uint64 i, const npy_uint32* key,
+                                  const double* p)
+{
+    double shape = p[0];
+    if (!(shape > 0))
+        return NPY_NAN;
+    double boosted = shape < 1 ? shape + 1.0 : shape;
+    double d = boosted - 1.0 / 3.0;
+    double c = 1.0 / sqrt(9.0 * d);
+    for (npy_uint32 attempt = 0;; attempt++) {
+        double un[2], u[2];
+        theano_philox4x32_10(i, 2 * attempt + 1, key, un);
+        theano_philox4x32_10(i, 2 * attempt + 2, key, u);
+        double n = theano_philox_box_muller(un);
+        double v = 1.0 + c * n;
+        v = v * v * v;
+        if (v > 0 && log(1.0 - u[0]) < 0.5 * n * n + d - d * v + d * log(v)) {
+            double x = d * v;
+            if (shape < 1)
+                x *= pow(1.0 - u[1], 1.0 / shape);
+            return x * p[1];
+        }
+    }
+}
+
+static double theano_philox_bernoulli(npy_uint64 i, const npy_uint32* key,
+                                      const double* p)
+{
+    double u[2];
+    theano_philox4x32_10(i, 0, key, u);
+    return u[0] < p[0] ? 1 : 0;
+}
+"""
+
+
+class PhiloxRV(RandomVariable, OpenMPOp):
+    """A univariate `RandomVariable` sampled with Philox4x32-10 in C.
+
+    The distribution is given by the name of the `RandomVariable`, which
+    must be a key of `DISTRIBUTIONS`.  The samples are written directly in
+    the output and computed in parallel with OpenMP for large draws.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.name not in DISTRIBUTIONS:
+            raise ValueError(f"No Philox implementation of {self.name}")
+        if self.ndim_supp != 0:
+            raise ValueError("PhiloxRV only supports univariate distributions")
+
+    def __str__(self):
+        return f"philox_{self.name}_rv"
+
+    def rng_fn(self, rng, *args):
+        *params, size = args
+        return philox_sample(self.name, philox_key(rng), params, size)
+
+    def c_headers(self, **kwargs):
+        return ["<math.h>", "<string.h>", "<numpy/npy_math.h>"] + super().c_headers(
+            **kwargs
+        )
+
+    def c_support_code(self, **kwargs):
+        return philox_support_code
+
+    def c_code(self, node, name, inames, onames, sub):
+        rng, size, _, *params = inames
+        out_rng, out = onames
+        fail = sub["fail"]
+        nd = node.outputs[1].ndim
+        n_params = len(params)
+        out_typenum = node.outputs[1].type.dtype_specs()[2]
+        inplace = int(self.inplace)
+        dist = self.name
+        omp_pragma = ""
+        if self.openmp:
+            omp_pragma = (
+                f"#pragma omp parallel for if (n > {config.openmp_elemwise_minsize})"
+            )
+
+        load_params = "\n".join(
+            f"""
+            params[{j}] = (PyArrayObject*)PyArray_FROMANY(
+                (PyObject*){p}, NPY_DOUBLE, 0, {nd}, NPY_ARRAY_IN_ARRAY);
+            if (!params[{j}]) goto {name}_cleanup;
+            """
+            for j, p in enumerate(params)
+        )
+
+        return (
+            """
+        {
+        int failed = 1;
+        npy_intp shape[%(nd)s + 1];
+        npy_intp strides[%(n_params)s][%(nd)s + 1];
+        PyArrayObject* params[%(n_params)s] = {NULL};
+        const double* param_data[%(n_params)s];
+        PyObject* rng = NULL;
+        PyObject* key_bytes = NULL;
+        npy_uint32 key[2];
+
+        %(load_params)s
+
+        if (PyArray_DIMS(%(size)s)[0] > 0) {
+            if (PyArray_DIMS(%(size)s)[0] != %(nd)s) {
+                PyErr_SetString(PyExc_ValueError,
+                                "PhiloxRV: size has the wrong length");
+                goto %(name)s_cleanup;
+            }
+            for (int d = 0; d < %(nd)s; d++)
+                shape[d] = ((npy_int64*)PyArray_GETPTR1(%(size)s, d))[0];
+        } else {
+            for (int d = 0; d < %(nd)s; d++)
+                shape[d] = 1;
+            for (int j = 0; j < %(n_params)s; j++) {
+                int offset = %(nd)s - PyArray_NDIM(params[j]);
+                for (int k = 0; k < PyArray_NDIM(params[j]); k++) {
+                    if (shape[offset + k] == 1)
+                        shape[offset + k] = PyArray_DIMS(params[j])[k];
+                }
+            }
+        }
+        for (int j = 0; j < %(n_params)s; j++) {
+            int offset = %(nd)s - PyArray_NDIM(params[j]);
+            npy_intp stride = 1;
+            for (int d = %(nd)s - 1; d >= 0; d--) {
+                npy_intp dim = d < offset ? 1 : PyArray_DIMS(params[j])[d - offset];
+                if (dim != 1 && dim != shape[d]) {
+                    PyErr_SetString(PyExc_ValueError,
+                        "PhiloxRV: the parameters can not be broadcasted to the size");
+                    goto %(name)s_cleanup;
+                }
+                strides[j][d] = dim == 1 ? 0 : stride;
+                stride *= dim;
+            }
+            param_data[j] = (const double*)PyArray_DATA(params[j]);
+        }
+
+        if (%(inplace)s) {
+            rng = (PyObject*)%(rng)s;
+            Py_INCREF(rng);
+        } else {
+            PyObject* copy_module = PyImport_ImportModule("copy");
+            if (!copy_module) goto %(name)s_cleanup;
+            rng = PyObject_CallMethod(copy_module, "deepcopy", "O",
+                                      (PyObject*)%(rng)s);
+            Py_DECREF(copy_module);
+            if (!rng) goto %(name)s_cleanup;
+        }
+        key_bytes = PyObject_CallMethod(rng, "bytes", "i", 8);
+        if (!key_bytes) goto %(name)s_cleanup;
+        if (!PyBytes_Check(key_bytes) || PyBytes_GET_SIZE(key_bytes) != 8) {
+            PyErr_SetString(PyExc_TypeError, "PhiloxRV: rng.bytes gave no 8 bytes");
+            goto %(name)s_cleanup;
+        }
+        memcpy(key, PyBytes_AS_STRING(key_bytes), 8);
+
+        if (!%(out)s || !PyArray_IS_C_CONTIGUOUS(%(out)s)
+            || !PyArray_CompareLists(PyArray_DIMS(%(out)s), shape, %(nd)s)) {
+            Py_XDECREF(%(out)s);
+            %(out)s = (PyArrayObject*)PyArray_EMPTY(%(nd)s, shape, %(out_typenum)s, 0);
+            if (!%(out)s) goto %(name)s_cleanup;
+        }
+
+        {
+            npy_intp n = PyArray_SIZE(%(out)s);
+            dtype_%(out)s* out_data = (dtype_%(out)s*)PyArray_DATA(%(out)s);
+            %(omp_pragma)s
+            for (npy_intp i = 0; i < n; i++) {
+                double p[%(n_params)s];
+                npy_intp offsets[%(n_params)s] = {0};
+                npy_intp rem = i;
+                for (int d = %(nd)s - 1; d >= 0; d--) {
+                    npy_intp coord = rem %% shape[d];
+                    rem /= shape[d];
+                    for (int j = 0; j < %(n_params)s; j++)
+                        offsets[j] += coord * strides[j][d];
+                }
+                for (int j = 0; j < %(n_params)s; j++)
+                    p[j] = param_data[j][offsets[j]];
+                out_data[i] = (dtype_%(out)s)theano_philox_%(dist)s(
+                    (npy_uint64)i, key, p);
+            }
+        }
+
+        Py_XDECREF(%(out_rng)s);
+        %(out_rng)s = rng;
+        rng = NULL;
+        failed = 0;
+
+        %(name)s_cleanup:
+        Py_XDECREF(rng);
+        Py_XDECREF(key_bytes);
+        for (int j = 0; j < %(n_params)s; j++)
+            Py_XDECREF(params[j]);
+        if (failed) {
+            %(fail)s
+        }
+        }
+        """
+            % locals()
+        )
+
+    def c_code_cache_version(self):
+        return (3,)
@@ -3,10 +3,44 @@ import sys
 import numpy as np
 
 import theano
-from theano.graph.type import Type
+from theano.graph.type import Generic
 
 
-class RandomStateType(Type):
+def _states_eq(sa, sb):
+    for key in sa:
+        if isinstance(sa[key], dict):
+            if not _states_eq(sa[key], sb[key]):
+                return False
+        elif isinstance(sa[key], np.ndarray):
+            if not np.array_equal(sa[key], sb[key]):
+                return False
+        else:
+            if sa[key] != sb[key]:
+                return False
+
+    return True
+
+
+class RandomType(Generic):
+    """The base `Type` of random number generators.
+
+    In C, the generators are handled as generic ``PyObject*``.
+
+    """
+
+    @classmethod
+    def filter(cls, data, strict=False, allow_downcast=None):
+        if cls.is_valid_value(data):
+            return data
+        else:
+            raise TypeError()
+
+    @staticmethod
+    def get_shape_info(obj):
+        return obj.get_value(borrow=True)
+
+
+class RandomStateType(RandomType):
     """A Type wrapper for `numpy.random.RandomState`.
 
     The reason this exists (and `Generic` doesn't suffice) is that
@@ -19,60 +53,66 @@ class RandomStateType(Type):
     def __repr__(self):
         return "RandomStateType"
 
-    @classmethod
-    def filter(cls, data, strict=False, allow_downcast=None):
-        if cls.is_valid_value(data):
-            return data
-        else:
-            raise TypeError()
-
     @staticmethod
     def is_valid_value(a):
         return isinstance(a, np.random.RandomState)
 
     @staticmethod
     def values_eq(a, b):
-        sa = a.get_state(legacy=False)
-        sb = b.get_state(legacy=False)
+        return _states_eq(a.get_state(legacy=False), b.get_state(legacy=False))
+
+    @staticmethod
+    def get_size(shape_info):
+        return sys.getsizeof(shape_info.get_state(legacy=False))
+
+    @staticmethod
+    def may_share_memory(a, b):
+        return a._bit_generator is b._bit_generator
+
 
-        def _eq(sa, sb):
-            for key in sa:
-                if isinstance(sa[key], dict):
-                    if not _eq(sa[key], sb[key]):
-                        return False
-                elif isinstance(sa[key], np.ndarray):
-                    if not np.array_equal(sa[key], sb[key]):
-                        return False
-                else:
-                    if sa[key] != sb[key]:
-                        return False
+class RandomGeneratorType(RandomType):
+    """A Type wrapper for `numpy.random.Generator`.
 
-            return True
+    Unlike `RandomState`, a `Generator` can use a counter-based bit
+    generator such as `numpy.random.Philox`, whose state is a few words.
+    Copying it is cheap, and `RandomStream.split_rng` derives independent
+    generators in constant time.
 
-        return _eq(sa, sb)
+    """
+
+    def __repr__(self):
+        return "RandomGeneratorType"
 
     @staticmethod
-    def get_shape_info(obj):
-        return obj.get_value(borrow=True)
+    def is_valid_value(a):
+        return isinstance(a, np.random.Generator)
+
+    @staticmethod
+    def values_eq(a, b):
+        sa = a.bit_generator.state
+        sb = b.bit_generator.state
+        return sa["bit_generator"] == sb["bit_generator"] and _states_eq(sa, sb)
 
     @staticmethod
     def get_size(shape_info):
-        return sys.getsizeof(shape_info.get_state(legacy=False))
+        return sys.getsizeof(shape_info.bit_generator.state)
 
     @staticmethod
     def may_share_memory(a, b):
-        return a._bit_generator is b._bit_generator
+        return a.bit_generator is b.bit_generator
 
 
-# Register `RandomStateType`'s C code for `ViewOp`.
-theano.compile.register_view_op_c_code(
-    RandomStateType,
-    """
-    Py_XDECREF(%(oname)s);
-    %(oname)s = %(iname)s;
-    Py_XINCREF(%(oname)s);
-    """,
-    1,
-)
+# Register the C code of the random types for `ViewOp`.
+for rng_type in (RandomStateType, RandomGeneratorType):
+    theano.compile.register_view_op_c_code(
+        rng_type,
+        """
+        Py_XDECREF(%(oname)s);
+        %(oname)s = %(iname)s;
+        Py_XINCREF(%(oname)s);
+        """,
+        1,
+    )
 
 random_state_type = RandomStateType()
+random_generator_type = RandomGeneratorType()
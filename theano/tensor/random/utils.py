@@ -102,6 +102,11 @@ class RandomStream:
     ----------
     seed: None or int
         A default seed to initialize the RandomState instances after build.
+    rng_ctor: type
+        The type of the generators, `numpy.random.RandomState` (the default)
+        or `numpy.random.Generator`.  Each `Generator` uses a Philox bit
+        generator seeded by a child of `seed_seq`, so the streams of the
+        nodes are independent and are cheap to create and copy.
     state_updates: list
         A list of pairs of the form `(input_r, output_r)`.  This will be
         over-ridden by the module instance to contain stream generators.
@@ -110,11 +115,14 @@ class RandomStream:
         random number generator that provides seeds for member streams.
     gen_seedgen: numpy.random.RandomState
         `RandomState` instance that `RandomStream.gen` uses to seed new
+        `RandomState` streams.
+    seed_seq: numpy.random.SeedSequence
+        `SeedSequence` that `RandomStream.gen` spawns to seed new `Generator`
         streams.
 
     """
 
-    def __init__(self, seed=None, namespace=None):
+    def __init__(self, seed=None, namespace=None, rng_ctor=np.random.RandomState):
         if namespace is None:
             from theano.tensor.random import basic  # pylint: disable=import-self
 
@@ -122,9 +130,16 @@ class RandomStream:
         else:
             self.namespaces = [namespace]
 
+        if rng_ctor not in (np.random.RandomState, np.random.Generator):
+            raise TypeError(
+                "rng_ctor must be numpy.random.RandomState or numpy.random.Generator"
+            )
+
+        self.rng_ctor = rng_ctor
         self.default_instance_seed = seed
         self.state_updates = []
         self.gen_seedgen = np.random.RandomState(seed)
+        self.seed_seq = np.random.SeedSequence(seed)
 
     def __getattr__(self, obj):
 
@@ -171,10 +186,41 @@ class RandomStream:
             seed = self.default_instance_seed
 
         self.gen_seedgen.seed(seed)
+        self.seed_seq = np.random.SeedSequence(seed)
 
         for old_r, new_r in self.state_updates:
-            old_r_seed = self.gen_seedgen.randint(2 ** 30)
-            old_r.set_value(np.random.RandomState(int(old_r_seed)), borrow=True)
+            old_r.set_value(self.new_rng(), borrow=True)
+
+    def split_rng(self, n):
+        """Derive `n` independent `numpy.random.Generator`s from the stream.
+
+        The new generators use Philox bit generators seeded with children of
+        `seed_seq`, which takes constant time, and each call gives new
+        children.
+
+        Parameters
+        ----------
+        n: int
+            The number of generators.
+
+        Returns
+        -------
+        list of numpy.random.Generator
+
+        """
+        return [
+            np.random.Generator(np.random.Philox(child))
+            for child in self.seed_seq.spawn(n)
+        ]
+
+    def new_rng(self):
+        """Create the generator of a new random stream."""
+        if self.rng_ctor is np.random.Generator:
+            (rng,) = self.split_rng(1)
+            return rng
+
+        seed = int(self.gen_seedgen.randint(2 ** 30))
+        return np.random.RandomState(seed)
 
     def gen(self, op, *args, **kwargs):
         """Create a new random stream in this container.
@@ -192,7 +238,7 @@ class RandomStream:
         -------
         TensorVariable
             The symbolic random draw part of op()'s return value.
-            This function stores the updated `RandomStateType` variable
+            This function stores the updated `RandomType` variable
             for use at `build` time.
 
         """
@@ -202,8 +248,7 @@ class RandomStream:
             )
 
         # Generate a new random state
-        seed = int(self.gen_seedgen.randint(2 ** 30))
-        random_state_variable = shared(np.random.RandomState(seed))
+        random_state_variable = shared(self.new_rng())
 
         # Distinguish it from other shared variables (why?)
         random_state_variable.tag.is_rng = True
@@ -3,7 +3,7 @@ import copy
 import numpy as np
 
 from theano.compile.sharedvalue import SharedVariable, shared_constructor
-from theano.tensor.random.type import random_state_type
+from theano.tensor.random.type import random_generator_type, random_state_type
 
 
 class RandomStateSharedVariable(SharedVariable):
@@ -30,3 +30,29 @@ def randomstate_constructor(
         strict=strict,
         allow_downcast=allow_downcast,
     )
+
+
+class RandomGeneratorSharedVariable(SharedVariable):
+    def __str__(self):
+        return "RandomGeneratorSharedVariable({})".format(repr(self.container))
+
+
+@shared_constructor
+def randomgenerator_constructor(
+    value, name=None, strict=False, allow_downcast=None, borrow=False
+):
+    """
+    SharedVariable Constructor for Generator.
+
+    """
+    if not isinstance(value, np.random.Generator):
+        raise TypeError
+    if not borrow:
+        value = copy.deepcopy(value)
+    return RandomGeneratorSharedVariable(
+        type=random_generator_type,
+        value=value,
+        name=name,
+        strict=strict,
+        allow_downcast=allow_downcast,
+    )
@@ -0,0 +1,129 @@
+"""
+Batching rules of the tensor `Op`s, used by `theano.graph.vectorize`.
+
+"""
+
+from theano.compile.ops import Shape, Shape_i
+from theano.graph.vectorize import vectorize_node
+from theano.tensor.basic import (
+    Dot,
+    MaxAndArgmax,
+    Reshape,
+    ScalarFromTensor,
+    TensorFromScalar,
+    arange,
+    as_tensor_variable,
+    batched_dot,
+    join,
+    tensordot,
+)
+from theano.tensor.elemwise import CAReduce, CAReduceDtype, DimShuffle, Elemwise, Prod
+from theano.tensor.subtensor import Subtensor, get_idx_list
+
+
+@vectorize_node.register(Elemwise)
+def vectorize_Elemwise(op, node, inputs, batched):
+    if op.inplace_pattern:
+        raise NotImplementedError("Inplace Elemwise can not be vectorized")
+    inputs = [
+        x if b else x.dimshuffle("x", *range(x.ndim)) for x, b in zip(inputs, batched)
+    ]
+    return op(*inputs, return_list=True)
+
+
+@vectorize_node.register(DimShuffle)
+def vectorize_DimShuffle(op, node, inputs, batched):
+    (x,) = inputs
+    new_order = [0] + [o if o == "x" else o + 1 for o in op.new_order]
+    return [x.dimshuffle(*new_order)]
+
+
+@vectorize_node.register(CAReduce)
+def vectorize_CAReduce(op, node, inputs, batched):
+    (x,) = inputs
+    axis = op.axis
+    if axis is None:
+        axis = range(x.ndim - 1)
+    if not axis:
+        raise NotImplementedError("Reductions over no axis can not be vectorized")
+    props = op._props_dict()
+    props["axis"] = tuple(a + 1 for a in axis)
+    if type(op) not in (CAReduce, CAReduceDtype):
+        # The subclasses like Sum or Max set their scalar_op themselves
+        props.pop("scalar_op", None)
+    if isinstance(op, Prod):
+        props["no_zeros_in_input"] = op.no_zeros_in_input
+    return [type(op)(**props)(x)]
+
+
+@vectorize_node.register(MaxAndArgmax)
+def vectorize_MaxAndArgmax(op, node, inputs, batched):
+    (x,) = inputs
+    # The C code only supports one axis or all of them
+    if len(op.axis) != 1:
+        raise NotImplementedError("MaxAndArgmax over several axes")
+    return MaxAndArgmax([op.axis[0] + 1])(x, return_list=True)
+
+
+@vectorize_node.register(Dot)
+def vectorize_Dot(op, node, inputs, batched):
+    x, y = inputs
+    if batched[0] and batched[1]:
+        return [batched_dot(x, y)]
+    elif batched[0]:
+        return [tensordot(x, y, [[x.ndim - 1], [0]])]
+    out = tensordot(x, y, [[x.ndim - 1], [1]])
+    # The batch axis of `y` comes after the remaining axes of `x`
+    pos = x.ndim - 1
+    return [out.dimshuffle(pos, *[i for i in range(out.ndim) if i != pos])]
+
+
+@vectorize_node.register(Reshape)
+def vectorize_Reshape(op, node, inputs, batched):
+    x, shp = inputs
+    if batched[1]:
+        raise NotImplementedError("Reshape to a batched shape")
+    return [x.reshape(join(0, x.shape[:1], shp), ndim=op.ndim + 1)]
+
+
+@vectorize_node.register(ScalarFromTensor)
+@vectorize_node.register(TensorFromScalar)
+def vectorize_scalar_conversion(op, node, inputs, batched):
+    # A batch of scalars is always a vector
+    return [as_tensor_variable(inputs[0])]
+
+
+@vectorize_node.register(Subtensor)
+def vectorize_Subtensor(op, node, inputs, batched):
+    x = inputs[0]
+    if not any(batched[1:]):
+        new_op = Subtensor((slice(None, None, None),) + tuple(op.idx_list))
+        return [new_op(*inputs)]
+
+    # Batched indices become advanced indexing, which gives the same result
+    # only when the integer indices come before the slices
+    indices = get_idx_list(inputs, op.idx_list)
+    n_int = len([idx for idx in indices if not isinstance(idx, slice)])
+    if any(isinstance(idx, slice) for idx in indices[:n_int]):
+        raise NotImplementedError("Integer indices after a slice")
+    batched_bounds = [i for i, b in zip(inputs[1:], batched[1:]) if b]
+    for idx in indices[n_int:]:
+        bounds = (idx.start, idx.stop, idx.step)
+        if any(bound is i for bound in bounds for i in batched_bounds):
+            raise NotImplementedError("Batched slice bounds")
+    indices = [
+        idx if isinstance(idx, slice) else as_tensor_variable(idx) for idx in indices
+    ]
+    if batched[0]:
+        indices = [arange(x.shape[0])] + indices
+    return [x[tuple(indices)]]
+
+
+@vectorize_node.register(Shape_i)
+def vectorize_Shape_i(op, node, inputs, batched):
+    return [Shape_i(op.i + 1)(inputs[0])]
+
+
+@vectorize_node.register(Shape)
+def vectorize_Shape(op, node, inputs, batched):
+    return [inputs[0].shape[1:]]